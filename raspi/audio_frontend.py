@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+
+# 🎚️ AUDIO FRONT-END - INT16 REIN, FEATURES RAUS, OHNE ALLOKATIONEN! 🎚️
+
+import time
+import tracemalloc
+import numpy as np
+from spectral import SpectralEngine
+
+INT16_SCALE = 1.0 / 32768.0
+
+
+def _rfft_supports_out():
+    """rfft(..., out=) only exists from numpy 2.0 on (Pi OS Bookworm ships 1.24)"""
+    try:
+        np.fft.rfft(np.zeros(4), out=np.zeros(3, dtype=np.complex128))
+    except TypeError:
+        return False
+    return True
+
+
+RFFT_OUT = _rfft_supports_out()
+
+
+class AudioFrontEnd:
+    """Turns int16 windows into energy, volume, power spectrum and band energies.
+
+    All work buffers are preallocated and every step writes in place, so in
+    steady state process() allocates nothing per chunk. Buffers are float64
+    because that is what numpy's pocketfft computes in natively - float32
+    input would make rfft allocate a converted copy on every call. On numpy < 2
+    rfft has no out= argument and returns one temporary spectrum per chunk.
+    """
+
+    def __init__(self, spectrum):
+        self.spectrum = spectrum  # SpectralEngine: window + band edges cache
+        self.window_size = None
+        self.band_count = None
+        self.power = None
+        self.bands = None
+        self._edges = None
+        self._configure()
+
+    def _configure(self):
+        """(Re)allocate buffers when window size or band layout changed"""
+        spectrum = self.spectrum
+        if spectrum.chunk_size != self.window_size:
+            size = spectrum.chunk_size
+            bins = size // 2 + 1
+            self.window_size = size
+            self.samples = np.zeros(size, dtype=np.float64)
+            self.windowed = np.zeros(size, dtype=np.float64)
+            self.fft = np.zeros(bins, dtype=np.complex128)
+            self.power = np.zeros(bins, dtype=np.float64)
+            self.magnitude = np.zeros(bins, dtype=np.float64)
+            self.cumulative = np.zeros(bins + 1, dtype=np.float64)
+            self._cumulative_tail = self.cumulative[1:]
+            self._window = spectrum.window.astype(np.float64)
+            self.band_count = None
+
+        if len(spectrum.band_edges) != self.band_count or self._edges is not spectrum.band_edges:
+            self._edges = spectrum.band_edges
+            self.band_count = len(self._edges)
+            self._low = np.ascontiguousarray(self._edges[:, 0])
+            self._high = np.ascontiguousarray(self._edges[:, 1])
+            self._low_sum = np.zeros(self.band_count)
+            self.bands = np.zeros(self.band_count)
+
+    def process(self, samples):
+        """Analyze one int16 window in place; returns (energy, volume, bands array)"""
+        if self.spectrum.chunk_size != len(samples) or self._edges is not self.spectrum.band_edges:
+            self.spectrum.configure(self.spectrum.sample_rate, len(samples))
+            self._configure()
+
+        # int16 -> float in [-1, 1], reusing one buffer
+        np.copyto(self.samples, samples, casting="unsafe")
+        np.multiply(self.samples, INT16_SCALE, out=self.samples)
+
+        # Energy and RMS volume from one squared pass
+        energy = float(np.dot(self.samples, self.samples))
+        volume = (energy / self.window_size) ** 0.5
+
+        # Windowed rFFT straight into the preallocated spectrum buffer
+        np.multiply(self.samples, self._window, out=self.windowed)
+        if RFFT_OUT:
+            np.fft.rfft(self.windowed, out=self.fft)
+        else:
+            self.fft[...] = np.fft.rfft(self.windowed)  # numpy < 2: one temporary per chunk
+        np.abs(self.fft, out=self.magnitude)
+        np.multiply(self.magnitude, self.magnitude, out=self.power)
+
+        # Band energies via the cached bin boundaries
+        np.cumsum(self.power, out=self._cumulative_tail)
+        np.take(self.cumulative, self._high, out=self.bands)
+        np.take(self.cumulative, self._low, out=self._low_sum)
+        np.subtract(self.bands, self._low_sum, out=self.bands)
+
+        # Let the spectral flux detector see the same spectrum
+        self.spectrum.power = self.power
+        return energy, volume, self.bands
+
+
+def benchmark(window_size=2048, chunks=2000, warmup=100):
+    """Time process() and count allocations per chunk in steady state"""
+    engine = SpectralEngine([(60, 250), (250, 500), (500, 2000), (2000, 8000)], 44100, window_size)
+    frontend = AudioFrontEnd(engine)
+    rng = np.random.default_rng(42)
+    blocks = rng.integers(-8000, 8000, size=(16, window_size), dtype=np.int16)
+
+    for i in range(warmup):
+        frontend.process(blocks[i % 16])
+
+    start = time.perf_counter()
+    for i in range(chunks):
+        frontend.process(blocks[i % 16])
+    per_chunk_us = (time.perf_counter() - start) / chunks * 1e6
+
+    tracemalloc.start()
+    for i in range(warmup):
+        frontend.process(blocks[i % 16])
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    base = tracemalloc.get_traced_memory()[0]
+    for i in range(chunks):
+        frontend.process(blocks[i % 16])
+    peak = tracemalloc.get_traced_memory()[1] - base
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    # Only count numpy/front-end allocations, not tracemalloc's own bookkeeping
+    stats = [stat for stat in after.compare_to(before, "filename")
+             if "tracemalloc" not in stat.traceback[0].filename]
+    new_blocks = sum(max(0, stat.count_diff) for stat in stats)
+    return per_chunk_us, new_blocks / chunks, peak
+
+
+if __name__ == "__main__":
+    print("🎚️ Audio Front-End Benchmark")
+    for size in (1024, 2048, 4096):
+        per_chunk_us, blocks_per_chunk, peak = benchmark(size)
+        print(f"   window {size:>5}: {per_chunk_us:7.1f} µs/chunk, "
+              f"{blocks_per_chunk:.3f} new allocations/chunk, transient peak {peak} bytes")
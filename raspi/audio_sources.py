@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+
+# 🎤 AUDIO SOURCES - MIKROFON, DATEI, PIPE ODER UDP HINTER EINEM INTERFACE! 🎤
+
+import socket
+import sys
+import threading
+import time
+import wave
+import numpy as np
+
+try:
+    import pyaudio
+except ImportError:  # Demo mode and CI run without PyAudio
+    pyaudio = None
+
+
+class AudioSource:
+    """Delivers mono int16 sample blocks to a sink (e.g. SampleRingBuffer.write)"""
+
+    name = "base"
+
+    def __init__(self, sample_rate=44100, chunk_size=1024):
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+        self.running = False
+
+    def open(self):
+        """Prepare the source; may adjust sample_rate / chunk_size"""
+        pass
+
+    def start(self, sink):
+        """Start calling sink(samples) for every block; sink returns False when full"""
+        raise NotImplementedError
+
+    def stop(self):
+        self.running = False
+
+    def describe(self):
+        return self.name
+
+
+class PyAudioSource(AudioSource):
+    """Live microphone input via PyAudio (prefers a USB PnP sound device)"""
+
+    name = "pyaudio"
+
+    def __init__(self, sample_rate=44100, chunk_size=1024):
+        super().__init__(sample_rate, chunk_size)
+        if pyaudio is None:
+            raise RuntimeError("PyAudio not installed")
+        self.format = pyaudio.paInt16
+        self.channels = 1
+        self.audio = pyaudio.PyAudio()
+        self.stream = None
+        self.device_name = None
+        self._sink = None
+
+    def open(self):
+        # Find the best audio input device
+        device_index = None
+        device_info = None
+
+        print(f"🎵 Scanning {self.audio.get_device_count()} audio devices...")
+
+        # List all devices for debugging
+        for i in range(self.audio.get_device_count()):
+            try:
+                info = self.audio.get_device_info_by_index(i)
+                device_name = info.get('name', '').lower()
+                max_inputs = info.get('maxInputChannels', 0)
+                print(f"   Device {i}: {info['name']} (inputs: {max_inputs})")
+
+                # Prefer USB PnP Sound Device
+                if 'usb pnp sound device' in device_name and max_inputs > 0:
+                    device_index = i
+                    device_info = info
+                    print(f"🎵 Selected USB audio device: {info['name']}")
+                    break
+                # Fallback to any device with input channels
+                elif max_inputs > 0 and device_index is None:
+                    device_index = i
+                    device_info = info
+                    print(f"🎵 Found potential device: {info['name']}")
+
+            except Exception as e:
+                print(f"   Device {i}: Error reading info - {e}")
+                continue
+
+        if device_index is None:
+            raise Exception("No suitable audio input device found")
+
+        print(f"🎵 Using device {device_index}: {device_info['name']}")
+        self.device_name = device_info['name']
+
+        # Get device info for optimal settings
+        device_info = self.audio.get_device_info_by_index(device_index)
+        optimal_rate = int(device_info.get('defaultSampleRate', 44100))
+
+        # Use device's preferred sample rate if different
+        if optimal_rate != self.sample_rate:
+            print(f"🎵 Adjusting sample rate from {self.sample_rate} to {optimal_rate}")
+            self.sample_rate = optimal_rate
+
+        common = {'format': self.format, 'channels': self.channels, 'input': True,
+                  'stream_callback': self._callback, 'start': False}
+
+        # Try different configurations for better compatibility
+        configs = [
+            # Try with larger buffer and detected device
+            {'rate': self.sample_rate, 'input_device_index': device_index,
+             'frames_per_buffer': self.chunk_size},
+            # Try with even larger buffer
+            {'rate': self.sample_rate, 'input_device_index': device_index,
+             'frames_per_buffer': self.chunk_size * 2},
+            # Try with lower sample rate and larger buffer
+            {'rate': 22050, 'input_device_index': device_index,
+             'frames_per_buffer': self.chunk_size},
+            # Fallback to default device
+            {'rate': 22050, 'frames_per_buffer': self.chunk_size * 2}
+        ]
+
+        for i, config in enumerate(configs):
+            try:
+                self.stream = self.audio.open(**common, **config)
+
+                if config['rate'] != self.sample_rate:
+                    print(f"🎵 Using sample rate: {config['rate']} Hz")
+                    self.sample_rate = config['rate']
+
+                self.chunk_size = config['frames_per_buffer']
+                print(f"🎵 Using buffer size: {self.chunk_size} frames")
+                return
+            except Exception as e:
+                print(f"❌ Audio config {i+1} failed: {e}")
+                continue
+
+        raise Exception("All audio configurations failed")
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        """PortAudio callback: only hand raw int16 samples to the sink"""
+        if not self.running:
+            return (None, pyaudio.paComplete)
+
+        if in_data:
+            self._sink(np.frombuffer(in_data, dtype=np.int16))
+
+        return (None, pyaudio.paContinue)
+
+    def start(self, sink):
+        self._sink = sink
+        self.running = True
+        self.stream.start_stream()
+
+    def stop(self):
+        self.running = False
+
+        if self.stream:
+            try:
+                if self.stream.is_active():
+                    self.stream.stop_stream()
+                self.stream.close()
+                self.stream = None
+            except Exception as e:
+                print(f"Stream cleanup warning: {e}")
+
+        # Terminate audio system
+        try:
+            if self.audio:
+                self.audio.terminate()
+                self.audio = None
+        except Exception as e:
+            print(f"Audio termination warning: {e}")
+
+    def describe(self):
+        return f"{self.device_name} (PyAudio)"
+
+
+class StreamSource(AudioSource):
+    """Reads raw s16le PCM from a binary stream on a reader thread"""
+
+    name = "stream"
+
+    def __init__(self, stream, sample_rate=44100, chunk_size=1024, channels=1, realtime=False):
+        super().__init__(sample_rate, chunk_size)
+        self.stream = stream
+        self.channels = channels
+        self.realtime = realtime  # Pace reads like a live device
+        self._thread = None
+        # One preallocated read buffer, handed out as an int16 view
+        self._buffer = bytearray(chunk_size * channels * 2)
+        self._samples = np.frombuffer(self._buffer, dtype=np.int16)
+        self._mono = np.zeros(chunk_size, dtype=np.int16)
+
+    def start(self, sink):
+        self.running = True
+        self._thread = threading.Thread(target=self._reader, args=(sink,), daemon=True)
+        self._thread.start()
+
+    def _read_block(self):
+        """Fill the read buffer; returns number of samples per channel read"""
+        view = memoryview(self._buffer)
+        filled = 0
+        while filled < len(self._buffer):
+            count = self.stream.readinto(view[filled:])
+            if not count:
+                break
+            filled += count
+        return filled // (2 * self.channels)
+
+    def _reader(self, sink):
+        period = self.chunk_size / self.sample_rate
+        next_time = time.perf_counter()
+
+        while self.running:
+            frames = self._read_block()
+            if frames == 0:
+                break
+
+            if self.channels > 1:
+                # Keep the first channel, copied into the mono buffer
+                np.copyto(self._mono[:frames], self._samples[:frames * self.channels:self.channels])
+                block = self._mono[:frames]
+            else:
+                block = self._samples[:frames]
+
+            if self.realtime:
+                next_time += period
+                delay = next_time - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                sink(block)
+            else:
+                # As fast as the analysis can take it - wait instead of overrunning
+                while self.running and not sink(block):
+                    time.sleep(period / 4)
+
+        self.running = False
+
+    def stop(self):
+        self.running = False
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+
+
+class StdinSource(StreamSource):
+    """Raw s16le PCM piped into stdin, e.g. `arecord -f S16_LE -r 44100 | ...`"""
+
+    name = "stdin"
+
+    def __init__(self, sample_rate=44100, chunk_size=1024, channels=1):
+        super().__init__(sys.stdin.buffer, sample_rate, chunk_size, channels)
+
+
+class FileSource(StreamSource):
+    """WAV or raw s16le PCM file, paced in real time by default"""
+
+    name = "file"
+
+    def __init__(self, path, sample_rate=44100, chunk_size=1024, channels=1, realtime=True):
+        self.path = path
+        self.is_wav = path.lower().endswith(".wav")
+        if self.is_wav:
+            with wave.open(path, "rb") as wav:
+                if wav.getsampwidth() != 2:
+                    raise ValueError("Only 16-bit WAV files are supported")
+                sample_rate = wav.getframerate()
+                channels = wav.getnchannels()
+        super().__init__(open(path, "rb"), sample_rate, chunk_size, channels, realtime)
+
+    def open(self):
+        if self.is_wav:
+            # Skip the RIFF header: start reading at the first sample frame
+            self.stream.seek(self._data_offset())
+
+    def _data_offset(self):
+        """Byte offset of the WAV data chunk"""
+        self.stream.seek(12)
+        while True:
+            header = self.stream.read(8)
+            if len(header) < 8:
+                raise ValueError(f"{self.path}: no data chunk")
+            chunk_id, size = header[:4], int.from_bytes(header[4:], "little")
+            if chunk_id == b"data":
+                return self.stream.tell()
+            self.stream.seek(size + (size & 1), 1)
+
+    def stop(self):
+        super().stop()
+        self.stream.close()
+
+    def describe(self):
+        return f"{self.path} (file)"
+
+
+class UDPSource(AudioSource):
+    """Raw s16le mono PCM datagrams on a local UDP port"""
+
+    name = "udp"
+
+    def __init__(self, port=5005, host="127.0.0.1", sample_rate=44100, chunk_size=1024):
+        super().__init__(sample_rate, chunk_size)
+        self.host = host
+        self.port = port
+        self.socket = None
+        self._thread = None
+        self._buffer = bytearray(65536)
+        self._samples = np.frombuffer(self._buffer, dtype=np.int16)
+
+    def open(self):
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.bind((self.host, self.port))
+        self.socket.settimeout(0.2)
+
+    def start(self, sink):
+        self.running = True
+        self._thread = threading.Thread(target=self._reader, args=(sink,), daemon=True)
+        self._thread.start()
+
+    def _reader(self, sink):
+        while self.running:
+            try:
+                count = self.socket.recv_into(self._buffer)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            if count >= 2:
+                sink(self._samples[:count // 2])
+
+    def stop(self):
+        self.running = False
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        if self.socket:
+            self.socket.close()
+            self.socket = None
+
+    def describe(self):
+        return f"udp://{self.host}:{self.port}"
+
+
+def create_source(spec, sample_rate=44100, chunk_size=1024):
+    """Build a source from a spec: pyaudio, stdin, file:<path>, udp:<port>"""
+    kind, _, arg = spec.partition(":")
+    if kind == PyAudioSource.name:
+        return PyAudioSource(sample_rate, chunk_size)
+    if kind == StdinSource.name:
+        return StdinSource(sample_rate, chunk_size)
+    if kind == FileSource.name:
+        return FileSource(arg, sample_rate, chunk_size)
+    if kind == UDPSource.name:
+        return UDPSource(int(arg or 5005), sample_rate=sample_rate, chunk_size=chunk_size)
+    raise ValueError(f"Unknown audio source '{spec}' (pyaudio, stdin, file:<path>, udp:<port>)")
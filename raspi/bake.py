@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+
+# 🍞 BAKE - PARTY-EFFEKTE VORAB RENDERN, DANN NUR NOCH ABSPIELEN! 🍞
+
+import argparse
+import mmap
+import os
+import struct
+import tempfile
+import time
+import numpy as np
+from effects import (DEFAULT_SEED, RainbowChase, FireSimulation, WaveInterference, LightningStorm,
+                     MatrixRain, Fireworks, Meteor, Confetti)
+
+FILE_MAGIC = b"LZBK"
+FILE_VERSION = 1
+HEADER = struct.Struct("<4sHHIIf")  # magic, version, flags, led_count, frame count, fps
+SPAN = struct.Struct("<II")         # Delta frames: first changed LED, number of LEDs that follow
+FLAG_DELTA = 1
+
+
+def _hold(seconds):
+    """Segment that keeps the current picture up for seconds"""
+    return None, 1 / seconds, 1
+
+
+# Segment generators: yield (step(out), steps per second, steps) or _hold(seconds).
+# They may also draw into out directly between segments, like party_mode does with leds.
+
+def _rainbow_chase(out, led_count, seed):
+    yield RainbowChase(led_count).step, 100, 360 * 3
+
+
+def _lightning_storm(out, led_count, seed):
+    effect = LightningStorm(led_count, seed=seed)
+    for _ in range(15):
+        for _ in range(effect.strikes()):
+            effect.strike(out)
+            flash, dark = effect.timing()
+            yield _hold(flash)
+            out.fill(0)
+            yield _hold(dark)
+        yield _hold(effect.pause())
+
+
+def _fire_simulation(out, led_count, seed):
+    yield FireSimulation(led_count, seed=seed).step, 20, 500
+
+
+def _matrix_rain(out, led_count, seed):
+    yield MatrixRain(led_count, seed=seed).step, 1 / 0.03, 1000
+
+
+def _wave_interference(out, led_count, seed):
+    yield WaveInterference(led_count).step, 20, 600
+
+
+def _fireworks(out, led_count, seed):
+    effect = Fireworks(led_count, seed=seed)
+    for _ in range(20):
+        effect.launch()
+        yield effect.step, 50, Fireworks.ROCKET_FRAMES
+        yield effect.step, 1 / 0.03, Fireworks.EXPLOSION_FRAMES
+        yield _hold(effect.rng.uniform(0.5, 2.0))
+
+
+def _meteor_shower(out, led_count, seed):
+    for color in [(255, 255, 255), (255, 0, 0), (0, 0, 255)]:
+        effect = Meteor(led_count, color, size=10, trail_decay=64, random_decay=True, seed=seed)
+        out.fill(0)
+        yield effect.step, 100, effect.frames
+
+
+def _confetti(out, led_count, seed):
+    yield Confetti(led_count, seed=seed).step, 100, 300
+
+
+# Same order and timing as the party_mode show
+EFFECTS = {
+    "rainbow_chase": _rainbow_chase,
+    "lightning_storm": _lightning_storm,
+    "fire_simulation": _fire_simulation,
+    "matrix_rain": _matrix_rain,
+    "wave_interference": _wave_interference,
+    "fireworks": _fireworks,
+    "meteor_shower": _meteor_shower,
+    "confetti": _confetti,
+}
+
+
+def _resample(segments, out, fps):
+    """Turn an effect's segments into frames at a fixed fps (out is yielded, not copied).
+
+    Every step is applied at its own scene time; an output frame shows the state
+    at its timestamp, so faster effects skip frames and slower ones repeat them.
+    Holds (lightning flashes) are shown at least once even when shorter than a frame.
+    """
+    t = 0.0       # Scene time of the current state
+    emitted = 0
+    for step, rate, steps in segments:
+        for _ in range(steps):
+            if step is not None:
+                step(out)
+            t += 1 / rate
+            shown = False
+            while emitted / fps < t - 1e-9:
+                yield out
+                emitted += 1
+                shown = True
+            if step is None and not shown:
+                yield out
+                emitted += 1
+
+
+def bake_frames(names, led_count, fps=100, seed=DEFAULT_SEED, transition=1.0):
+    """Yield the frames of a playlist; each effect starts on black and fades in over the last one"""
+    out = np.zeros((led_count, 3), dtype=np.uint8)
+    previous = np.zeros((led_count, 3), dtype=np.uint8)
+    mixed = np.zeros((led_count, 3), dtype=np.float32)
+    faded = np.zeros((led_count, 3), dtype=np.uint8)
+
+    for index, name in enumerate(names):
+        out.fill(0)
+        fade_frames = int(round(transition * fps)) if index else 0
+        for frame_index, frame in enumerate(_resample(EFFECTS[name](out, led_count, seed), out, fps)):
+            if frame_index < fade_frames:
+                # previous * (1 - alpha) + frame * alpha
+                alpha = frame_index / fade_frames
+                np.subtract(frame, previous, out=mixed, dtype=np.float32)
+                mixed *= alpha
+                mixed += previous
+                np.copyto(faded, mixed, casting="unsafe")
+                yield faded
+            else:
+                yield frame
+        previous[:] = out
+
+
+class BakeWriter:
+    """Writes frames to a bake file, either whole or as the changed span per frame"""
+
+    def __init__(self, path, led_count, fps, delta=False):
+        self.led_count = led_count
+        self.fps = fps
+        self.flags = FLAG_DELTA if delta else 0
+        self.frame_count = 0
+        self.bytes_written = 0
+        self.file = open(path, "wb")
+        self.file.write(HEADER.pack(FILE_MAGIC, FILE_VERSION, self.flags, led_count, 0, fps))
+        self._previous = np.zeros((led_count, 3), dtype=np.uint8)
+        self._changed = np.zeros(led_count, dtype=bool)
+
+    def write(self, frame):
+        frame = np.ascontiguousarray(frame, dtype=np.uint8).reshape(self.led_count, 3)
+        if self.flags & FLAG_DELTA:
+            if self.frame_count:
+                np.any(frame != self._previous, axis=1, out=self._changed)
+                changed = np.flatnonzero(self._changed)
+                start = int(changed[0]) if len(changed) else 0
+                length = int(changed[-1]) + 1 - start if len(changed) else 0
+            else:
+                # First frame is complete, so playback (and every loop) starts from a known state
+                start, length = 0, self.led_count
+            self.file.write(SPAN.pack(start, length))
+            self.file.write(frame[start:start + length].tobytes())
+            self.bytes_written += SPAN.size + length * 3
+            self._previous[:] = frame
+        else:
+            self.file.write(frame.tobytes())
+            self.bytes_written += frame.nbytes
+        self.frame_count += 1
+
+    def close(self):
+        self.file.seek(0)
+        self.file.write(HEADER.pack(FILE_MAGIC, FILE_VERSION, self.flags, self.led_count,
+                                    self.frame_count, self.fps))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def bake(path, names, led_count, fps=100, seed=DEFAULT_SEED, delta=False, transition=1.0):
+    """Render a playlist into path; returns the BakeWriter (frame count, bytes written)"""
+    unknown = [name for name in names if name not in EFFECTS]
+    if unknown:
+        raise ValueError(f"Unknown effect(s) {', '.join(unknown)} (use {', '.join(EFFECTS)})")
+    with BakeWriter(path, led_count, fps, delta) as writer:
+        for frame in bake_frames(names, led_count, fps, seed, transition):
+            writer.write(frame)
+    return writer
+
+
+class BakedShow:
+    """Memory-mapped bake file; advance() hands out frames without rendering or allocating buffers.
+
+    Whole frames are views straight into the mapping. Delta files are applied
+    span by span into one preallocated frame, so advance() must be called in order.
+    """
+
+    def __init__(self, path, loop=True):
+        self.path = path
+        self.loop = loop
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.flags, self.led_count, self.frame_count, self.fps = \
+            HEADER.unpack_from(self._map)
+        if magic != FILE_MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a bake file")
+        if version != FILE_VERSION:
+            self._map.close()
+            raise ValueError(f"Unsupported bake file version: {version}")
+
+        self.data = np.frombuffer(self._map, dtype=np.uint8, offset=HEADER.size)
+        self.delta = bool(self.flags & FLAG_DELTA)
+        if self.delta:
+            # One pass over the span headers: (start, length, data offset) per frame
+            self.spans = []
+            offset = 0
+            for _ in range(self.frame_count):
+                start, length = SPAN.unpack_from(self._map, HEADER.size + offset)
+                offset += SPAN.size
+                self.spans.append((start * 3, (start + length) * 3, offset))
+                offset += length * 3
+            self.frame = np.zeros((self.led_count, 3), dtype=np.uint8)
+            self._flat = self.frame.reshape(-1)
+        else:
+            self.frames = self.data[:self.frame_count * self.led_count * 3].reshape(-1, self.led_count, 3)
+        self.position = -1
+
+    def __len__(self):
+        return self.frame_count
+
+    @property
+    def duration(self):
+        return self.frame_count / self.fps
+
+    def rewind(self):
+        self.position = -1
+
+    def advance(self, steps=1):
+        """Move steps frames on (skipped frames cost a memcpy at most) and return the current frame"""
+        for _ in range(steps):
+            position = self.position + 1
+            if position >= self.frame_count:
+                if not self.loop:
+                    break
+                position = 0
+            self.position = position
+            if self.delta:
+                start, end, offset = self.spans[position]
+                self._flat[start:end] = self.data[offset:offset + end - start]
+
+        return self.frame if self.delta else self.frames[max(0, self.position)]
+
+    def close(self):
+        # Views must go before the mapping can be closed
+        self.data = self.frames = None
+        try:
+            self._map.close()
+        except BufferError:
+            pass  # A caller still holds a frame view; the mapping is released together with it
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def benchmark(led_count=300, fps=100):
+    """Live rendering of the whole party playlist vs playing it back from raw and delta bake files"""
+    results = {}
+    start = time.perf_counter()
+    frames = sum(1 for _ in bake_frames(list(EFFECTS), led_count, fps))
+    results["render"] = ((time.perf_counter() - start) / frames * 1e6, frames * led_count * 3)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, delta in (("raw", False), ("delta", True)):
+            path = os.path.join(directory, f"{name}.lzbk")
+            bake(path, list(EFFECTS), led_count, fps, delta=delta)
+            with BakedShow(path) as show:
+                start = time.perf_counter()
+                for _ in range(len(show)):
+                    show.advance()
+                results[name] = ((time.perf_counter() - start) / len(show) * 1e6, os.path.getsize(path))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bake party_mode effects into frame files and play them back")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    baking = commands.add_parser("bake", help="Render effects offline into a bake file")
+    baking.add_argument("path")
+    baking.add_argument("effects", nargs="*", help=f"Playlist (default: the whole show): {', '.join(EFFECTS)}")
+    baking.add_argument("--leds", type=int, default=300)
+    baking.add_argument("--fps", type=float, default=100)
+    baking.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    baking.add_argument("--transition", type=float, default=1.0, help="Crossfade seconds between effects")
+    baking.add_argument("--delta", action="store_true", help="Store only the changed span of each frame")
+
+    info = commands.add_parser("info", help="Show what is in a bake file")
+    info.add_argument("path")
+
+    play = commands.add_parser("play", help="Play a bake file through party_mode's output")
+    play.add_argument("path")
+    play.add_argument("--once", action="store_true", help="Stop at the end instead of looping")
+
+    bench = commands.add_parser("bench", help="Live rendering vs baked playback")
+    bench.add_argument("--leds", type=int, default=300)
+
+    args = parser.parse_args()
+
+    if args.command == "bake":
+        names = args.effects or list(EFFECTS)
+        start = time.perf_counter()
+        writer = bake(args.path, names, args.leds, args.fps, args.seed, args.delta, args.transition)
+        print(f"🍞 {writer.frame_count} Frames ({writer.frame_count / args.fps:.1f} s, "
+              f"{writer.bytes_written / 1e6:.1f} MB) in {time.perf_counter() - start:.1f} s nach {args.path} gebacken")
+    elif args.command == "info":
+        with BakedShow(args.path) as show:
+            print(f"🍞 {args.path}: {show.led_count} LEDs, {len(show)} Frames @ {show.fps:g} FPS "
+                  f"({show.duration:.1f} s), {'Delta' if show.delta else 'ganze Frames'}")
+    elif args.command == "play":
+        import party_mode
+        party_mode.play_baked(args.path, loop=not args.once)
+    elif args.command == "bench":
+        print("🍞 Bake Benchmark (ganze Party-Show, µs pro Frame)")
+        for name, (us, size) in benchmark(args.leds).items():
+            print(f"   {name:<7} {us:8.1f} µs  {size / 1e6:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,30 +1,50 @@
 #!/usr/bin/env python3
 
 import numpy as np
-import pyaudio
 import threading
 import time
 import random
 from collections import deque
+from spectral import SpectralEngine
+from ring_buffer import SampleRingBuffer
+from onset import SpectralFluxDetector, TempoTracker, BandOnsetTracker
+from audio_frontend import AudioFrontEnd
+from audio_sources import PyAudioSource
+from scheduler import FrameScheduler
 
 class BeatDetector:
-    def __init__(self, sample_rate=44100, chunk_size=2048):
+    DETECTOR_MODES = ("energy", "flux")
+    
+    def __init__(self, sample_rate=44100, chunk_size=2048, window_size=None, hop_size=None,
+                 detector_mode="energy"):
+        if detector_mode not in self.DETECTOR_MODES:
+            raise ValueError(f"Unknown detector mode: {detector_mode}")
         self.sample_rate = sample_rate
         self.chunk_size = chunk_size  # Larger buffer to reduce underruns
-        self.format = pyaudio.paInt16
-        self.channels = 1
+        
+        # Analysis window and hop are decoupled from the PortAudio buffer.
+        # None = follow chunk_size (one non-overlapping window per chunk).
+        # Low latency example: chunk_size=256, window_size=2048, hop_size=256 (~6 ms @ 44.1 kHz)
+        self.window_size = window_size
+        self.hop_size = hop_size
         
         # Audio processing
-        self.audio = pyaudio.PyAudio()
-        self.stream = None
+        self.source = None  # AudioSource feeding the ring buffer
+        self.frontend = None
         self.running = False
         
         # Beat detection parameters
-        self.energy_history = deque(maxlen=20)  # Energy history for beat detection
+        self.energy_history_chunks = 20  # History length, measured in analysis windows
+        self.energy_history = deque(maxlen=self.energy_history_chunks)  # Energy history for beat detection
         self.beat_threshold = 1.3  # Energy spike threshold
         self.min_beat_interval = 0.15  # Minimum time between beats (150ms)
         self.last_beat_time = 0
         
+        # "energy" = energy spike vs. average, "flux" = spectral flux + tempo tracking
+        self.detector_mode = detector_mode
+        self.flux_detector = None
+        self.tempo = None
+        
         # Audio error tracking
         self.consecutive_errors = 0
         self.max_errors_before_demo = 20  # Switch to demo after 20 consecutive errors
@@ -38,27 +58,31 @@ class BeatDetector:
         
         # Frequency band ranges (bass, low-mid, high-mid, treble)
         self.freq_ranges = [(60, 250), (250, 500), (500, 2000), (2000, 8000)]
+        self.spectrum = SpectralEngine(self.freq_ranges, self.sample_rate, self.chunk_size)
+        
+        # Separate onset streams per band group (kick / snare / hi-hat), indices into freq_ranges
+        self.band_groups = {"low": [0], "mid": [1, 2], "high": [3]}
+        self.band_onsets = BandOnsetTracker(self.band_groups, history=self.energy_history_chunks,
+                                            threshold=self.beat_threshold,
+                                            min_interval=self.min_beat_interval)
+        
+        # Raw sample hand-off from the PortAudio callback to the analysis worker
+        self.ring_chunks = 16  # Ring capacity in (doubled) chunks before overruns
+        self.ring = None
+        self.analysis_thread = None
+        self.chunks_processed = 0
         
         # Callbacks
         self.beat_callbacks = []
         self.audio_callbacks = []
+        self.tempo_callbacks = []
+        self.band_beat_callbacks = {name: [] for name in self.band_groups}
     
-    def _simple_bandpass(self, audio_data, low_freq, high_freq):
-        """Simple frequency band extraction using FFT"""
-        if len(audio_data) < 64:
-            return 0
-        
-        # FFT analysis
-        fft = np.fft.rfft(audio_data)
-        freqs = np.fft.rfftfreq(len(audio_data), 1/self.sample_rate)
-        
-        # Find frequency range indices
-        low_idx = np.searchsorted(freqs, low_freq)
-        high_idx = np.searchsorted(freqs, high_freq)
-        
-        # Extract energy in this band
-        band_energy = np.sum(np.abs(fft[low_idx:high_idx]) ** 2)
-        return band_energy
+    def set_freq_ranges(self, freq_ranges):
+        """Analyze an arbitrary list of (low_hz, high_hz) bands"""
+        self.freq_ranges = list(freq_ranges)
+        self.spectrum.set_bands(self.freq_ranges)
+        self.current_freq_bands = [0] * len(self.freq_ranges)
     
     def add_beat_callback(self, callback):
         """Add callback function to be called when beat is detected"""
@@ -68,8 +92,27 @@ class BeatDetector:
         """Add callback function to be called on every audio frame"""
         self.audio_callbacks.append(callback)
     
-    def start(self, demo_mode=False):
-        """Start audio capture and beat detection"""
+    def add_band_beat_callback(self, band, callback):
+        """Add callback(band_energy, volume, freq_bands) for onsets in one band ("low", "mid", "high")"""
+        if band not in self.band_beat_callbacks:
+            raise ValueError(f"Unknown band '{band}' (choose from {', '.join(self.band_beat_callbacks)})")
+        self.band_beat_callbacks[band].append(callback)
+    
+    def set_band_groups(self, band_groups):
+        """Regroup freq_ranges indices into named beat streams, e.g. {"kick": [0], "hat": [3]}"""
+        self.band_groups = dict(band_groups)
+        self.band_onsets = BandOnsetTracker(self.band_groups, history=self.energy_history.maxlen,
+                                            threshold=self.beat_threshold,
+                                            min_interval=self.min_beat_interval)
+        self.band_beat_callbacks = {name: self.band_beat_callbacks.get(name, [])
+                                    for name in self.band_groups}
+    
+    def add_tempo_callback(self, callback):
+        """Add callback(bpm, confidence, next_beat_time) called on every beat in flux mode"""
+        self.tempo_callbacks.append(callback)
+    
+    def start(self, demo_mode=False, source=None):
+        """Start audio capture and beat detection (source: AudioSource, default microphone)"""
         if self.running:
             return True
         
@@ -79,139 +122,60 @@ class BeatDetector:
             self.demo_mode_active = True
             self.running = True
             # Start demo thread
-            import threading
             demo_thread = threading.Thread(target=self._demo_mode_loop, daemon=True)
             demo_thread.start()
             return True
         
         try:
-            # Find the best audio input device
-            device_index = None
-            device_info = None
-            
-            print(f"🎵 Scanning {self.audio.get_device_count()} audio devices...")
-            
-            # List all devices for debugging
-            for i in range(self.audio.get_device_count()):
-                try:
-                    info = self.audio.get_device_info_by_index(i)
-                    device_name = info.get('name', '').lower()
-                    max_inputs = info.get('maxInputChannels', 0)
-                    print(f"   Device {i}: {info['name']} (inputs: {max_inputs})")
-                    
-                    # Prefer USB PnP Sound Device
-                    if 'usb pnp sound device' in device_name and max_inputs > 0:
-                        device_index = i
-                        device_info = info
-                        print(f"🎵 Selected USB audio device: {info['name']}")
-                        break
-                    # Fallback to any device with input channels
-                    elif max_inputs > 0 and device_index is None:
-                        device_index = i
-                        device_info = info
-                        print(f"🎵 Found potential device: {info['name']}")
-                        
-                except Exception as e:
-                    print(f"   Device {i}: Error reading info - {e}")
-                    continue
-            
-            if device_index is None:
-                raise Exception("No suitable audio input device found")
+            # Microphone by default; any AudioSource (file, stdin, UDP) can be plugged in
+            self.source = source or PyAudioSource(self.sample_rate, self.chunk_size)
+            self.source.open()
             
-            print(f"🎵 Using device {device_index}: {device_info['name']}")
+            # The source may have adjusted rate / buffer size to what the device supports
+            self.sample_rate = self.source.sample_rate
+            self.chunk_size = self.source.chunk_size
             
-            # Get device info for optimal settings
-            device_info = self.audio.get_device_info_by_index(device_index)
-            optimal_rate = int(device_info.get('defaultSampleRate', 44100))
+            # Preallocate the sample ring (big enough for the doubled-buffer configs too)
+            max_window = self.window_size or self.chunk_size * 2
+            self.ring = SampleRingBuffer(max(self.chunk_size * 2, max_window) * self.ring_chunks,
+                                         history=max_window)
             
-            # Use device's preferred sample rate if different
-            if optimal_rate != self.sample_rate:
-                print(f"🎵 Adjusting sample rate from {self.sample_rate} to {optimal_rate}")
-                self.sample_rate = optimal_rate
-            
-            # Try different configurations for better compatibility
-            configs = [
-                # Try with larger buffer and detected device
-                {
-                    'format': self.format,
-                    'channels': self.channels,
-                    'rate': self.sample_rate,
-                    'input': True,
-                    'input_device_index': device_index,
-                    'frames_per_buffer': self.chunk_size,
-                    'stream_callback': self._audio_callback
-                },
-                # Try with even larger buffer
-                {
-                    'format': self.format,
-                    'channels': self.channels,
-                    'rate': self.sample_rate,
-                    'input': True,
-                    'input_device_index': device_index,
-                    'frames_per_buffer': self.chunk_size * 2,
-                    'stream_callback': self._audio_callback
-                },
-                # Try with lower sample rate and larger buffer
-                {
-                    'format': self.format,
-                    'channels': self.channels,
-                    'rate': 22050,
-                    'input': True,
-                    'input_device_index': device_index,
-                    'frames_per_buffer': self.chunk_size,
-                    'stream_callback': self._audio_callback
-                },
-                # Fallback to default device
-                {
-                    'format': self.format,
-                    'channels': self.channels,
-                    'rate': 22050,
-                    'input': True,
-                    'frames_per_buffer': self.chunk_size * 2,
-                    'stream_callback': self._audio_callback
-                }
-            ]
-            
-            stream_opened = False
-            for i, config in enumerate(configs):
-                try:
-                    # Extract callback from config
-                    callback = config.pop('stream_callback')
-                    self.stream = self.audio.open(stream_callback=callback, **config)
-                    
-                    if 'rate' in config and config['rate'] != self.sample_rate:
-                        print(f"🎵 Using sample rate: {config['rate']} Hz")
-                        self.sample_rate = config['rate']
-                    
-                    if 'frames_per_buffer' in config:
-                        self.chunk_size = config['frames_per_buffer']
-                        print(f"🎵 Using buffer size: {self.chunk_size} frames")
-                    
-                    stream_opened = True
-                    break
-                except Exception as e:
-                    print(f"❌ Audio config {i+1} failed: {e}")
-                    continue
-            
-            if not stream_opened:
-                print("❌ All audio configurations failed - falling back to demo mode")
-                return self.start(demo_mode=True)
+            # Rebuild FFT window and band indices for the final rate/buffer size
+            self._configure_analysis()
             
             self.running = True
-            self.stream.start_stream()
+            self.analysis_thread = threading.Thread(target=self._analysis_loop, daemon=True)
+            self.analysis_thread.start()
+            self.source.start(self._write_samples)
             print(f"🎵 Beat detector started successfully!")
-            print(f"   Device: {device_info['name']}")
+            print(f"   Source: {self.source.describe()}")
             print(f"   Sample Rate: {self.sample_rate} Hz")
             print(f"   Buffer Size: {self.chunk_size} frames")
-            print(f"   Channels: {self.channels}")
             
         except Exception as e:
             print(f"❌ Audio setup failed: {e}")
             print("🎵 Falling back to demo mode...")
+            self.running = False
+            self._stop_source()
             return self.start(demo_mode=True)
         
         return True
     
+    def _write_samples(self, samples):
+        """Source sink: live sources drop on overrun, offline ones wait for space"""
+        if not getattr(self.source, 'realtime', True) and len(samples) > self.ring.free():
+            return False
+        return self.ring.write(samples)
+    
+    def _stop_source(self):
+        """Stop and release the audio source"""
+        if self.source:
+            try:
+                self.source.stop()
+            except Exception as e:
+                print(f"Audio source cleanup warning: {e}")
+            self.source = None
+    
     def stop(self):
         """Stop audio capture with proper cleanup"""
         self.running = False
@@ -219,50 +183,77 @@ class BeatDetector:
         # Give time for callbacks to finish
         time.sleep(0.1)
         
-        if self.stream:
-            try:
-                if self.stream.is_active():
-                    self.stream.stop_stream()
-                self.stream.close()
-                self.stream = None
-            except Exception as e:
-                print(f"Stream cleanup warning: {e}")
+        if self.analysis_thread and self.analysis_thread is not threading.current_thread():
+            self.analysis_thread.join(timeout=1.0)
+            self.analysis_thread = None
         
-        # Terminate audio system
-        try:
-            if hasattr(self, 'audio') and self.audio:
-                self.audio.terminate()
-                self.audio = None
-        except Exception as e:
-            print(f"Audio termination warning: {e}")
+        self._stop_source()
         
         print("🔇 Beat detector stopped")
     
-    def _audio_callback(self, in_data, frame_count, time_info, status):
-        """Process audio data in real-time with error handling"""
-        if not self.running:
-            return (None, pyaudio.paComplete)
+    def _configure_analysis(self):
+        """Resolve window/hop sizes and size everything that depends on them"""
+        self.analysis_window = self.window_size or self.chunk_size
+        self.analysis_hop = min(self.hop_size or self.analysis_window, self.analysis_window)
+        self.spectrum.configure(self.sample_rate, self.analysis_window)
+        self.frontend = AudioFrontEnd(self.spectrum)
         
-        try:
-            # Convert to numpy array
-            audio_data = np.frombuffer(in_data, dtype=np.int16).astype(np.float32)
-            audio_data = audio_data / 32768.0  # Normalize to [-1, 1]
+        # Keep the beat history spanning the same time, however small the hop
+        history = self.energy_history_chunks * self.analysis_window // self.analysis_hop
+        self.energy_history = deque(self.energy_history, maxlen=history)
+        self.band_onsets.resize_history(history)
+        
+        if self.detector_mode == "flux":
+            frame_rate = self.sample_rate / self.analysis_hop
+            self.flux_detector = SpectralFluxDetector(self.spectrum, frame_rate,
+                                                      min_interval=self.min_beat_interval)
+            self.tempo = TempoTracker(frame_rate)
+    
+    def _analysis_loop(self):
+        """Worker thread: slide the analysis window hop by hop over the ring buffer"""
+        window_size = self.analysis_window
+        hop_size = self.analysis_hop
+        # Poll at a fraction of a hop so the callback never has to signal us
+        poll_interval = hop_size / self.sample_rate / 4
+        
+        while self.running and not self.demo_mode_active:
+            if not self.ring.advance(hop_size):
+                time.sleep(poll_interval)
+                continue
             
-            # Calculate overall energy and volume
-            energy = np.sum(audio_data ** 2)
-            volume = np.sqrt(np.mean(audio_data ** 2))
+            # Overlapping windows are views into the ring - no re-copying
+            window = self.ring.window(window_size)
+            if window is not None:
+                self._process_chunk(window)
+    
+    def _process_chunk(self, samples):
+        """Analyze one chunk of int16 samples and call all subscribers"""
+        try:
+            # Energy, volume and band energies from preallocated buffers
+            energy, volume, bands = self.frontend.process(samples)
             
             self.current_energy = energy
             self.current_volume = volume
-            
-            # Frequency band analysis
-            self.current_freq_bands = self._analyze_frequency_bands(audio_data)
+            self.current_freq_bands = bands.tolist()
             
             # Beat detection
-            self.beat_detected = self._detect_beat(energy)
+            if self.detector_mode == "flux":
+                self.beat_detected = self._detect_beat_flux()
+            else:
+                self.beat_detected = self._detect_beat(energy)
             
             # Call callbacks safely
             if self.beat_detected and self.running:
+                # Tempo first, so beat subscribers already see this beat's tempo estimate
+                if self.tempo:
+                    next_beat = self.tempo.predict_next_beat(time.time())
+                    for callback in self.tempo_callbacks:
+                        try:
+                            callback(self.tempo.bpm, self.tempo.confidence, next_beat)
+                        except Exception as e:
+                            if self.running:
+                                print(f"Tempo callback error: {e}")
+                
                 for callback in self.beat_callbacks:
                     try:
                         if self.running:  # Check again before each callback
@@ -271,6 +262,8 @@ class BeatDetector:
                         if self.running:
                             print(f"Beat callback error: {e}")
             
+            self._dispatch_band_beats(volume)
+            
             if self.running:
                 for callback in self.audio_callbacks:
                     try:
@@ -279,6 +272,10 @@ class BeatDetector:
                     except Exception as e:
                         if self.running:
                             print(f"Audio callback error: {e}")
+            
+            # Reset error count on successful processing
+            self.consecutive_errors = 0
+            self.chunks_processed += 1
                             
         except Exception as e:
             if self.running:
@@ -297,28 +294,6 @@ class BeatDetector:
                     
                     # Stop current stream and switch to demo
                     self._switch_to_demo_mode()
-                    return (None, pyaudio.paContinue)
-        
-        # Reset error count on successful processing  
-        if self.running and 'audio_data' in locals():
-            self.consecutive_errors = 0
-        
-        return (None, pyaudio.paContinue if self.running else pyaudio.paComplete)
-    
-    def _analyze_frequency_bands(self, audio_data):
-        """Analyze energy in different frequency bands using FFT"""
-        if len(audio_data) < 64:  # Too short for FFT
-            return [0, 0, 0, 0]
-        
-        bands = []
-        for low_freq, high_freq in self.freq_ranges:
-            try:
-                band_energy = self._simple_bandpass(audio_data, low_freq, high_freq)
-                bands.append(band_energy)
-            except:
-                bands.append(0)
-        
-        return bands
     
     def _detect_beat(self, current_energy):
         """Simple beat detection based on energy spikes"""
@@ -327,7 +302,7 @@ class BeatDetector:
         # Add current energy to history
         self.energy_history.append(current_energy)
         
-        if len(self.energy_history) < 10:
+        if len(self.energy_history) < self.energy_history.maxlen // 2:
             return False
         
         # Check minimum interval between beats
@@ -344,15 +319,39 @@ class BeatDetector:
         
         return False
     
+    def _detect_beat_flux(self):
+        """Beat detection from per-band spectral flux with tempo tracking"""
+        power = self.spectrum.power
+        if power is None:
+            return False
+        
+        current_time = time.time()
+        onset = self.flux_detector.process(power, current_time)
+        self.tempo.add_strength(self.flux_detector.strength, current_time)
+        
+        if onset:
+            self.last_beat_time = current_time
+            self.tempo.on_onset(current_time)
+        return onset
+    
+    def _dispatch_band_beats(self, volume):
+        """Run all per-band onset detectors at once and call their subscribers"""
+        fired = self.band_onsets.process(self.current_freq_bands, time.time())
+        for band in fired:
+            band_energy = self.band_onsets.energies[self.band_onsets.names.index(band)]
+            for callback in self.band_beat_callbacks[band]:
+                try:
+                    if self.running:
+                        callback(band_energy, volume, self.current_freq_bands)
+                except Exception as e:
+                    if self.running:
+                        print(f"Band beat callback error ({band}): {e}")
+    
     def _switch_to_demo_mode(self):
         """Switch from real audio to demo mode due to errors"""
         try:
-            # Stop current audio stream
-            if self.stream:
-                if self.stream.is_active():
-                    self.stream.stop_stream()
-                self.stream.close()
-                self.stream = None
+            # Stop current audio source
+            self._stop_source()
             
             # Mark as demo mode
             self.demo_mode_active = True
@@ -371,7 +370,20 @@ class BeatDetector:
             'energy': self.current_energy,
             'volume': self.current_volume,
             'freq_bands': self.current_freq_bands,
-            'beat_detected': self.beat_detected
+            'beat_detected': self.beat_detected,
+            'tempo_bpm': self.tempo.bpm if self.tempo else 0,
+            'tempo_confidence': self.tempo.confidence if self.tempo else 0,
+            'next_beat_time': self.tempo.predict_next_beat(time.time()) if self.tempo else 0
+        }
+    
+    def get_stats(self):
+        """Get ring buffer / analysis worker statistics"""
+        ring = self.ring
+        return {
+            'chunks_processed': self.chunks_processed,
+            'overruns': ring.overruns if ring else 0,
+            'dropped_samples': ring.dropped_samples if ring else 0,
+            'backlog_samples': ring.available() if ring else 0
         }
     
     def _demo_mode_loop(self):
@@ -381,15 +393,13 @@ class BeatDetector:
         print("🎵 This mode doesn't require a microphone - perfect for testing!")
         
         beat_interval = 60.0 / 120.0  # 120 BPM
-        last_beat_time = 0
-        frame_count = 0
+        last_beat_time = -beat_interval
         
-        while self.running:
-            current_time = time.time()
-            frame_count += 1
-            
-            # Simulate more realistic audio data
-            t = current_time
+        # 20 FPS on a fixed grid; the simulated music follows the scheduler's t
+        clock = FrameScheduler(20)
+        for t, dt in clock.ticks():
+            if not self.running:
+                break
             
             # Simulate frequency bands with more variation
             bass = 0.2 + 0.8 * abs(math.sin(t * 1.5 + math.sin(t * 0.3)))
@@ -412,9 +422,9 @@ class BeatDetector:
             
             # Simulate beats at 120 BPM with some variation
             beat_detected = False
-            if current_time - last_beat_time >= beat_interval:
+            if t - last_beat_time >= beat_interval:
                 beat_detected = True
-                last_beat_time = current_time
+                last_beat_time = t
                 # Add some randomness to beat timing
                 beat_interval = (60.0 / 120.0) + (random.random() - 0.5) * 0.1
             
@@ -429,15 +439,14 @@ class BeatDetector:
                         if self.running:
                             print(f"Beat callback error: {e}")
             
+            self._dispatch_band_beats(self.current_volume)
+            
             for callback in self.audio_callbacks:
                 try:
                     callback(self.current_energy, self.current_volume, self.current_freq_bands, beat_detected)
                 except Exception as e:
                     if self.running:
                         print(f"Audio callback error: {e}")
-            
-            # Consistent timing
-            time.sleep(0.05)  # 20 FPS
     
     def __del__(self):
         """Cleanup with error handling"""
@@ -478,5 +487,8 @@ if __name__ == "__main__":
         except KeyboardInterrupt:
             print("\n🛑 Stopping beat detector...")
             detector.stop()
+            stats = detector.get_stats()
+            print(f"   Chunks: {stats['chunks_processed']}, Overruns: {stats['overruns']} "
+                  f"({stats['dropped_samples']} samples dropped)")
     else:
         print("❌ Failed to start beat detector")
\ No newline at end of file
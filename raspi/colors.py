@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+# 🎨 COLORS - HSV, HUE-TABELLEN UND PALETTEN ALS LOOKUP-TABLES! 🎨
+
+import functools
+import numpy as np
+
+# Sector breakpoints and (c, x, 0) component order per sector, same as hsv_to_rgb()
+HUE_SECTORS = np.array([60, 120, 180, 240, 300], dtype=np.float64)
+HUE_COMPONENTS = np.array([
+    [0, 1, 2],  # h <  60: c, x, 0
+    [1, 0, 2],  # h < 120: x, c, 0
+    [2, 0, 1],  # h < 180: 0, c, x
+    [2, 1, 0],  # h < 240: 0, x, c
+    [1, 2, 0],  # h < 300: x, 0, c
+    [0, 2, 1],  # else:    c, 0, x
+])
+
+
+def hsv_to_rgb(h, s, v):
+    """HSV zu RGB - für geile Farben"""
+    h = h % 360
+    c = v * s
+    x = c * (1 - abs((h / 60) % 2 - 1))
+    m = v - c
+
+    if h < 60:
+        r, g, b = c, x, 0
+    elif h < 120:
+        r, g, b = x, c, 0
+    elif h < 180:
+        r, g, b = 0, c, x
+    elif h < 240:
+        r, g, b = 0, x, c
+    elif h < 300:
+        r, g, b = x, 0, c
+    else:
+        r, g, b = c, 0, x
+
+    return int((r + m) * 255), int((g + m) * 255), int((b + m) * 255)
+
+
+def hsv_to_rgb_array(h, s, v, out=None):
+    """Vectorized hsv_to_rgb(): hue array in degrees -> (N, 3) float RGB 0..255 (truncated)"""
+    h = np.mod(h, 360)
+    c = np.multiply(v, s)
+    x = c * (1 - np.abs(np.mod(h / 60, 2) - 1))
+    m = v - c
+
+    # Same comparisons as the scalar version, so sector borders match exactly
+    sector = np.searchsorted(HUE_SECTORS, h, side="right")
+    parts = np.zeros((len(h), 3))
+    parts[:, 0] = c
+    parts[:, 1] = x
+
+    if out is None:
+        out = np.empty((len(h), 3))
+    out[:] = np.take_along_axis(parts, HUE_COMPONENTS[sector], axis=1)
+    out += np.reshape(m, (-1, 1)) if np.ndim(m) else m
+    out *= 255
+    return np.trunc(out, out=out)
+
+
+@functools.lru_cache(maxsize=None)
+def hue_lut(saturation=1.0, value=1.0, size=360):
+    """Read-only (size, 3) uint8 table: entry i = hsv_to_rgb(i * 360 / size, s, v)"""
+    hues = np.arange(size) * (360 / size)
+    lut = hsv_to_rgb_array(hues, saturation, value).astype(np.uint8)
+    lut.flags.writeable = False
+    return lut
+
+
+HUE_WHEEL = hue_lut()              # Hue in whole degrees (0..359)
+HUE_WHEEL_256 = hue_lut(size=256)  # FastLED-style 8-bit hue (0..255)
+
+
+def hue_lookup(hues, lut=HUE_WHEEL, out=None):
+    """Colors for a hue array (degrees for HUE_WHEEL, 0..255 for HUE_WHEEL_256) in one lookup"""
+    index = np.asarray(hues).astype(np.int64) % len(lut)
+    return np.take(lut, index, axis=0, out=out)
+
+
+def _as_rgb(color):
+    """0xRRGGBB or (r, g, b) -> (r, g, b)"""
+    if isinstance(color, (int, np.integer)):
+        return (color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF
+    return tuple(color)
+
+
+def gradient_palette(stops):
+    """FastLED DEFINE_GRADIENT_PALETTE: [(index 0..255, color), ...] -> (256, 3) uint8 LUT"""
+    positions = np.array([index for index, _ in stops], dtype=np.float64)
+    colors = np.array([_as_rgb(color) for _, color in stops], dtype=np.float64)
+    indices = np.arange(256)
+
+    lut = np.empty((256, 3), dtype=np.uint8)
+    for channel in range(3):
+        lut[:, channel] = np.round(np.interp(indices, positions, colors[:, channel]))
+    return lut
+
+
+def palette16(colors):
+    """FastLED CRGBPalette16 with LINEARBLEND -> (256, 3) uint8 LUT (wraps around like FastLED)"""
+    entries = np.array([_as_rgb(color) for color in colors], dtype=np.int32)
+    if len(entries) != 16:
+        raise ValueError(f"A 16-stop palette needs 16 colors, got {len(entries)}")
+
+    indices = np.arange(256)
+    high = indices >> 4           # Palette entry
+    low = (indices & 0x0F)[:, None]  # Blend amount towards the next entry (0..15 of 16)
+    start = entries[high]
+    end = entries[(high + 1) % 16]
+    return (start + (end - start) * low // 16).astype(np.uint8)
+
+
+def palette_lookup(lut, values, low=0.0, high=1.0, out=None):
+    """Map a scalar field (energy, heat, ...) from [low, high] onto a 256-entry LUT"""
+    scaled = (np.asarray(values, dtype=np.float64) - low) * (255 / (high - low))
+    index = np.clip(scaled, 0, 255).astype(np.int64)
+    return np.take(lut, index, axis=0, out=out)
+
+
+# Heat ramp of the fire effect: black -> red -> yellow -> white (index = heat)
+HEAT_PALETTE = gradient_palette([(0, 0x000000), (85, 0xFF0000), (170, 0xFFFF00), (255, 0xFFFFFF)])
+
+# FastLED stock palettes
+RAINBOW_PALETTE = palette16([
+    0xFF0000, 0xD52A00, 0xAB5500, 0xAB7F00, 0xABAB00, 0x56D500, 0x00FF00, 0x00D52A,
+    0x00AB55, 0x0056AA, 0x0000FF, 0x2A00D5, 0x5500AB, 0x7F0081, 0xAB0055, 0xD5002B])
+PARTY_PALETTE = palette16([
+    0x5500AB, 0x84007C, 0xB5004B, 0xE5001B, 0xE81700, 0xB84700, 0xAB7700, 0xABAB00,
+    0xAB5500, 0xDD2200, 0xF2000E, 0xC2003E, 0x8F0071, 0x5F00A1, 0x2F00D0, 0x0007F9])
+LAVA_PALETTE = palette16([
+    0x000000, 0x800000, 0x000000, 0x800000, 0x8B0000, 0x8B0000, 0x800000, 0x8B0000,
+    0x8B0000, 0x8B0000, 0xFF0000, 0xFFA500, 0xFFFFFF, 0xFFA500, 0xFF0000, 0x8B0000])
+OCEAN_PALETTE = palette16([
+    0x191970, 0x00008B, 0x191970, 0x000080, 0x00008B, 0x0000CD, 0x2E8B57, 0x008080,
+    0x5F9EA0, 0x0000FF, 0x008B8B, 0x6495ED, 0x7FFFD4, 0x2E8B57, 0x00FFFF, 0x87CEFA])
+
+PALETTES = {
+    "heat": HEAT_PALETTE,
+    "rainbow": RAINBOW_PALETTE,
+    "party": PARTY_PALETTE,
+    "lava": LAVA_PALETTE,
+    "ocean": OCEAN_PALETTE,
+}
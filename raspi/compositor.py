@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+
+# 🥞 COMPOSITOR - MEHRERE EFFEKTE ÜBEREINANDER IN EINEM FRAME! 🥞
+
+import time
+import numpy as np
+from framebuffer import FrameBuffer
+
+BLEND_MODES = ("alpha", "add", "max", "multiply")
+
+
+class Layer:
+    """One effect layer: own framebuffer, blend mode and (fadeable) opacity"""
+
+    def __init__(self, name, led_count, blend="alpha", opacity=1.0, render=None):
+        if blend not in BLEND_MODES:
+            raise ValueError(f"Unknown blend mode '{blend}' (use {', '.join(BLEND_MODES)})")
+        self.name = name
+        self.buffer = FrameBuffer(led_count)
+        self.blend = blend
+        self.opacity = opacity
+        self.render = render  # render(out, *args) or None if the buffer is written from outside
+        self._fade = None     # (start time, end time, start opacity, target opacity)
+
+    def view(self):
+        return self.buffer.view()
+
+    @property
+    def visible(self):
+        return self.opacity > 0
+
+    def fade_to(self, opacity, duration, now=None, delay=0.0):
+        """Ramp opacity linearly to a target, starting after delay seconds"""
+        now = time.time() if now is None else now
+        start = now + delay
+        self._fade = (start, start + duration, self.opacity, opacity)
+        self.update(now)
+
+    def update(self, now):
+        """Advance a running fade to time now"""
+        if self._fade is None:
+            return
+        start, end, start_opacity, target = self._fade
+        if now >= end:
+            self.opacity = target
+            self._fade = None
+        elif now >= start:
+            self.opacity = start_opacity + (target - start_opacity) * (now - start) / (end - start)
+
+
+class Compositor:
+    """Stack of layers (bottom to top) blended into one frame per compose() call.
+
+    Every layer is blended onto a float32 accumulator with whole-array operations;
+    invisible layers (opacity 0) are neither rendered nor blended.
+    """
+
+    def __init__(self, led_count):
+        self.led_count = led_count
+        self.layers = []
+        # Scratch, reused every frame
+        self._accum = np.zeros((led_count, 3), dtype=np.float32)
+        self._blended = np.zeros((led_count, 3), dtype=np.float32)
+
+    def __getitem__(self, name):
+        for layer in self.layers:
+            if layer.name == name:
+                return layer
+        raise KeyError(name)
+
+    def __contains__(self, name):
+        return any(layer.name == name for layer in self.layers)
+
+    def add_layer(self, name, blend="alpha", opacity=1.0, render=None):
+        """Add a layer on top of the stack"""
+        if name in self:
+            raise ValueError(f"Layer '{name}' exists already")
+        layer = Layer(name, self.led_count, blend, opacity, render)
+        self.layers.append(layer)
+        return layer
+
+    def remove_layer(self, name):
+        self.layers.remove(self[name])
+
+    def visible_layers(self, now=None):
+        """Layers that take part in the next frame (fades advanced to now)"""
+        now = time.time() if now is None else now
+        for layer in self.layers:
+            layer.update(now)
+        return [layer for layer in self.layers if layer.visible]
+
+    def crossfade(self, outgoing, incoming, duration, now=None):
+        """Fade incoming in right above outgoing, then hide outgoing"""
+        now = time.time() if now is None else now
+        outgoing, incoming = self[outgoing], self[incoming]
+        if outgoing is incoming:
+            return
+
+        # Incoming sits directly above outgoing: out * (1 - t) + in * t for alpha layers
+        self.layers.remove(incoming)
+        self.layers.insert(self.layers.index(outgoing) + 1, incoming)
+        incoming.fade_to(1.0, duration, now)
+        outgoing.fade_to(0.0, 0.0, now, delay=duration)
+
+    def compose(self, out, *args, now=None):
+        """Render visible layers (render(out, *args)) and blend them into out (N, 3 uint8)"""
+        accum = self._accum
+        blended = self._blended
+        accum.fill(0)
+
+        for layer in self.visible_layers(now):
+            if layer.render is not None:
+                layer.render(layer.view(), *args)
+            source = layer.view()
+
+            # blended = full-strength result of the blend mode, then mix in by opacity
+            if layer.blend == "alpha":
+                np.copyto(blended, source)
+            elif layer.blend == "add":
+                np.add(accum, source, out=blended)
+                np.minimum(blended, 255, out=blended)
+            elif layer.blend == "max":
+                np.maximum(accum, source, out=blended)
+            else:
+                np.multiply(accum, source, out=blended)
+                blended *= 1 / 255
+
+            if layer.opacity >= 1.0:
+                accum, blended = blended, accum
+            else:
+                blended -= accum
+                blended *= layer.opacity
+                accum += blended
+
+        np.copyto(out, accum, casting="unsafe")
+        return out
+
+
+def benchmark(led_count, layers=3, frames=1000):
+    """Microseconds per compose() call"""
+    rng = np.random.default_rng(5)
+    compositor = Compositor(led_count)
+    for index in range(layers):
+        layer = compositor.add_layer(f"layer{index}", BLEND_MODES[index % len(BLEND_MODES)], 0.8)
+        layer.view()[:] = rng.integers(0, 256, size=(led_count, 3), dtype=np.uint8)
+    out = np.zeros((led_count, 3), dtype=np.uint8)
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        compositor.compose(out, now=0.0)
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+if __name__ == "__main__":
+    print("🥞 Compositor Benchmark (3 Layer)")
+    for count in (300, 1000, 5000):
+        print(f"   {count} LEDs: {benchmark(count):.1f} µs pro Frame")
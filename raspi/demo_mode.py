@@ -2,58 +2,15 @@
 
 # 🎵🔥 DEMO MODE - SMOOTH LED ANIMATIONS WITHOUT AUDIO ISSUES! 🔥🎵
 
-import gpiozero
 import time
-import random
-import math
-import numpy as np
+import music_mode
+from music_mode import on_beat, on_audio_frame, cycle_mode, clear, cleanup_output
 from beat_detector import BeatDetector
-import atexit
 
-# LED Konfiguration
-LED_COUNT = 300
-BRIGHTNESS = 0.9
-LED_PIN = 18
-
-# GPIO cleanup and initialization
-def cleanup_gpio():
-    try:
-        if 'led_output' in globals() and led_output:
-            led_output.close()
-    except:
-        pass
-    try:
-        gpiozero.Device.pin_factory.reset()
-    except:
-        pass
-
-# Register cleanup
-atexit.register(cleanup_gpio)
-
-# Try to cleanup any existing GPIO usage
-cleanup_gpio()
-
-# Initialize GPIO
-led_output = None
-try:
-    led_output = gpiozero.OutputDevice(LED_PIN)
-except Exception as e:
-    print(f"❌ GPIO Error: {e}")
-    print("🔄 Trying alternative GPIO initialization...")
-    time.sleep(1)
-    try:
-        led_output = gpiozero.OutputDevice(LED_PIN)
-    except Exception as e2:
-        print(f"❌ Still can't access GPIO pin {LED_PIN}: {e2}")
-        print("💡 Try running: sudo killall python3 && sudo systemctl restart pigpiod")
-        exit(1)
-
-# Import all the LED functions from music_mode
-exec(open('/home/pi/led/raspi/music_mode.py').read().split('def main()')[0])
+# LED-Backend, Effekte und Modus-Zustand kommen aus music_mode
+# (Backend-Auswahl über LED_BACKEND=gpio|spi|loopback)
 
 def main():
-    global current_mode, shutdown_requested
-    
     print("🎵🔥🔥🔥 DEMO MODE AKTIVIERT! 🔥🔥🔥🎵")
     print("300 LEDs - PERFEKT GLATTE ANIMATIONEN - KEINE AUDIO-PROBLEME!")
     print("📊 SIMULIERT 120 BPM MUSIK FÜR TOLLE LED-EFFEKTE!")
@@ -82,7 +39,7 @@ def main():
         return
     
     try:
-        print(f"🎛️ Aktueller Modus: {current_mode}")
+        print(f"🎛️ Aktueller Modus: {music_mode.current_mode}")
         print("🎵 Genieße die glatten LED-Animationen!")
         
         # Mode switching thread
@@ -91,13 +48,12 @@ def main():
         import sys
         
         def mode_switcher():
-            global shutdown_requested
-            while not shutdown_requested:
+            while not music_mode.shutdown_requested:
                 try:
                     # Non-blocking input check
                     if select.select([sys.stdin], [], [], 0.1) == ([sys.stdin], [], []):
                         input()  # Consume the input
-                        if not shutdown_requested:
+                        if not music_mode.shutdown_requested:
                             cycle_mode()
                 except:
                     break
@@ -108,11 +64,11 @@ def main():
         mode_thread.start()
         
         # Main loop
-        while not shutdown_requested:
+        while not music_mode.shutdown_requested:
             time.sleep(0.1)
             
     except KeyboardInterrupt:
-        shutdown_requested = True
+        music_mode.shutdown_requested = True
         print("\n🎉 DEMO MODE ENDE! 🎉")
         
         # Proper shutdown sequence
@@ -120,7 +76,7 @@ def main():
             detector.stop()
             time.sleep(0.2)  # Allow audio callbacks to finish
             clear()
-            cleanup_gpio()
+            cleanup_output()
             
             # Wait for mode thread to finish
             if 'mode_thread' in locals() and mode_thread.is_alive():
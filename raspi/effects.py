@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+
+# 🎇 EFFECTS - PARTY-EFFEKTE ALS NUMPY-BATCHES, REPRODUZIERBAR PER SEED! 🎇
+
+import time
+import numpy as np
+from colors import hsv_to_rgb, hsv_to_rgb_array, hue_lut, HUE_WHEEL, HEAT_PALETTE
+from particles import ParticleSystem
+
+DEFAULT_SEED = 42
+
+
+MATRIX_COLORS = np.array([(0, 255, 0), (0, 255, 100), (50, 255, 50)])
+MATRIX_TRAIL = np.maximum(0, 255 - np.arange(30) * 15)  # Tail end writes black
+MATRIX_DIM = np.array([10, 5, 10], dtype=np.uint8)
+ROCKET_COLOR = (255, 127, 0)
+ROCKET_TRAIL = 55 + np.arange(5) * 50  # Von der Spitze nach hinten heller, wie party_mode
+
+
+def _dim(out, amount):
+    """Saturating subtract (single value or per channel)"""
+    np.subtract(out, np.minimum(out, amount), out=out)
+
+
+def _fade(out, amount, mask=None):
+    """FastLED fadeToBlackBy on out, optionally only where mask is True"""
+    faded = (out.astype(np.uint16) * (256 - amount)) >> 8
+    if mask is None:
+        np.copyto(out, faded, casting="unsafe")
+    else:
+        np.copyto(out, faded, casting="unsafe", where=mask[:, None])
+
+
+class RainbowChase:
+    """Rainbow scrolling along the strip, one hue step per frame (repeats every 360 frames)"""
+
+    def __init__(self, led_count, hue_step=2, cache=None):
+        self.led_count = led_count
+        self.hue_step = hue_step
+        self.cache = cache  # Optional FrameCache
+        self.offset = 0
+        self._hues = np.arange(led_count) * hue_step
+        self._index = np.zeros(led_count, dtype=np.int64)
+
+    def _render(self, out, offset):
+        np.add(self._hues, offset, out=self._index)
+        np.remainder(self._index, 360, out=self._index)
+        np.take(HUE_WHEEL, self._index, axis=0, out=out)
+
+    def step(self, out):
+        offset = self.offset % 360
+        if self.cache is None:
+            self._render(out, offset)
+        else:
+            self.cache.render(("rainbow_chase", self.hue_step, offset), self._render, out, offset)
+        self.offset += 1
+
+
+class FireSimulation:
+    """Classic heat-diffusion fire: cooling, sparks at the base, heat rising"""
+
+    def __init__(self, led_count, seed=DEFAULT_SEED, base=10, spark_chance=0.7):
+        self.led_count = led_count
+        self.rng = np.random.default_rng(seed)
+        self.base = base  # Number of spark LEDs at the strip end (fire base)
+        self.spark_chance = spark_chance
+        self.heat = np.zeros(led_count, dtype=np.int32)
+        self._scratch = np.zeros(led_count, dtype=np.int32)
+
+    def step(self, out):
+        heat = self.heat
+        rng = self.rng
+
+        # Kühle alle Pixel ab
+        heat -= rng.integers(0, 4, size=self.led_count, dtype=np.int32)
+        np.maximum(heat, 0, out=heat)
+
+        # Heiße Spots am Ende (Feuer-Basis)
+        base = heat[-self.base:]
+        sparks = rng.random(len(base)) < self.spark_chance
+        base += sparks * rng.integers(50, 101, size=len(base), dtype=np.int32)
+        np.minimum(base, 255, out=base)
+
+        # Hitze nach oben verteilen: new[i] = (old[i-1] + 2 * old[i-2]) // 3
+        # (the old loop ran downwards, so every step only ever read unchanged values)
+        scratch = self._scratch[3:]
+        np.multiply(heat[1:-2], 2, out=scratch)
+        scratch += heat[2:-1]
+        np.floor_divide(scratch, 3, out=heat[3:])
+
+        # Hitze zu Farbe konvertieren
+        np.take(HEAT_PALETTE, heat, axis=0, out=out)
+
+
+class WaveInterference:
+    """Two travelling sine waves; their sum drives hue and brightness"""
+
+    def __init__(self, led_count):
+        self.led_count = led_count
+        self.frame = 0
+        positions = np.arange(led_count)
+        self._phase1 = positions * 0.1
+        self._phase2 = positions * 0.05
+        self._wave = np.zeros(led_count)
+        self._other = np.zeros(led_count)
+        self._rgb = np.zeros((led_count, 3))
+
+    def step(self, out):
+        frame = self.frame
+        wave, other = self._wave, self._other
+
+        # Zwei Sinus-Wellen
+        np.add(self._phase1, frame * 0.1, out=wave)
+        np.sin(wave, out=wave)
+        np.add(self._phase2, frame * 0.15, out=other)
+        np.sin(other, out=other)
+
+        # Interferenz: ((sin1 * 127 + 128) + (sin2 * 127 + 128)) / 2
+        wave *= 127
+        wave += 128
+        other *= 127
+        other += 128
+        wave += other
+        wave /= 2
+
+        hsv_to_rgb_array(wave + frame, 1.0, wave / 255, out=self._rgb)
+        np.copyto(out, self._rgb, casting="unsafe")
+        self.frame += 1
+
+
+class LightningStorm:
+    """Random white strikes; every strike is drawn from a handful of batched RNG calls"""
+
+    def __init__(self, led_count, seed=DEFAULT_SEED, max_length=80):
+        self.led_count = led_count
+        self.rng = np.random.default_rng(seed)
+        self.max_length = max_length
+
+    def strikes(self):
+        """Number of strikes in the next storm burst"""
+        return int(self.rng.integers(1, 5))
+
+    def strike(self, out):
+        """Clear out and draw 2-5 bolts of random position, length and brightness"""
+        rng = self.rng
+        count = int(rng.integers(2, 6))
+        starts = rng.integers(0, max(1, self.led_count - self.max_length + 1), size=count)
+        lengths = rng.integers(30, self.max_length + 1, size=count)
+        intensities = rng.integers(150, 256, size=count)
+
+        out.fill(0)
+        for start, length, intensity in zip(starts.tolist(), lengths.tolist(), intensities.tolist()):
+            out[start:start + length] = intensity
+
+    def timing(self):
+        """(flash, dark) durations in seconds for one strike"""
+        return self.rng.uniform(0.01, 0.05), self.rng.uniform(0.02, 0.08)
+
+    def pause(self):
+        """Pause between storm bursts in seconds"""
+        return self.rng.uniform(0.3, 1.0)
+
+
+class MatrixRain:
+    """Green drops with fading tails falling along the strip"""
+
+    def __init__(self, led_count, seed=DEFAULT_SEED, capacity=128, spawn_chance=0.3):
+        self.led_count = led_count
+        self.rng = np.random.default_rng(seed)
+        self.spawn_chance = spawn_chance
+        self.drops = ParticleSystem(capacity)
+
+    def step(self, out):
+        rng = self.rng
+
+        # Neue Tropfen
+        if rng.random() < self.spawn_chance:
+            self.drops.spawn(0, velocity=rng.uniform(0.5, 2.0),
+                             color=MATRIX_COLORS[rng.integers(len(MATRIX_COLORS))],
+                             length=rng.integers(10, 31))
+
+        # Alle LEDs dimmen, Tropfen bewegen und zeichnen
+        _dim(out, MATRIX_DIM)
+        self.drops.step()
+        self.drops.splat(out, MATRIX_TRAIL)
+
+        # Tropfen entfernen wenn unten
+        self.drops.cull(high=self.led_count)
+
+
+class Fireworks:
+    """Rocket rising from a random spot, then an expanding burst with white sparks"""
+
+    ROCKET_FRAMES = 40
+    EXPLOSION_FRAMES = 50
+
+    def __init__(self, led_count, seed=DEFAULT_SEED, embers=64, capacity=256):
+        self.led_count = led_count
+        self.rng = np.random.default_rng(seed)
+        self.embers = embers  # Ember particles per burst side
+        self.particles = ParticleSystem(capacity)
+        self.phase = "done"
+        self.frame = 0
+        self.explosion_pos = 0
+
+    def launch(self):
+        """Start a new rocket"""
+        launch_pos = int(self.rng.integers(50, self.led_count - 50 + 1))
+        self.particles.clear()
+        # Like party_mode's fireworks(): the brightest pixel is at the back and the trail fades
+        # towards the front, so the particle rides on the front pixel
+        self.particles.spawn(launch_pos - 4, velocity=-1.0, color=ROCKET_COLOR, length=5)
+        self.explosion_pos = launch_pos - self.ROCKET_FRAMES
+        self.phase = "rocket"
+        self.frame = 0
+
+    def _explode(self):
+        """Replace the rocket by embers flying apart at evenly spread speeds"""
+        color = hsv_to_rgb(int(self.rng.integers(0, 361)), 1.0, 1.0)
+
+        # Brightness falls by 8 per LED travelled: 255 - 8 * distance
+        speeds = np.linspace(-1.0, 1.0, 2 * self.embers + 1)
+        with np.errstate(divide="ignore"):
+            lifetimes = 255 / (8 * np.abs(speeds))
+        self.particles.clear()
+        self.particles.spawn(np.full(len(speeds), self.explosion_pos), speeds, color, lifetimes)
+        self.phase = "explosion"
+        self.frame = 0
+
+    def step(self, out):
+        if self.phase == "rocket":
+            out.fill(0)
+            self.particles.splat(out, ROCKET_TRAIL)
+            self.particles.step()
+            self.frame += 1
+            if self.frame == self.ROCKET_FRAMES:
+                self._explode()
+
+        elif self.phase == "explosion":
+            radius = self.frame
+            if radius:
+                _dim(out, 8)
+
+            # Funken: live for exactly one frame
+            count = int(self.rng.integers(3, 9))
+            sparks = self.explosion_pos + self.rng.integers(-radius - 10, radius + 11, size=count)
+            self.particles.spawn(sparks, lifetime=1)
+
+            self.particles.splat(out)
+            self.particles.step()
+            self.particles.cull()
+            self.frame += 1
+            if self.frame == self.EXPLOSION_FRAMES:
+                self.phase = "done"
+
+
+class Meteor:
+    """Arduino meteor(): solid head crossing the strip, trail decaying randomly"""
+
+    def __init__(self, led_count, color=(255, 255, 255), size=10, trail_decay=64,
+                 random_decay=True, seed=DEFAULT_SEED):
+        self.led_count = led_count
+        self.rng = np.random.default_rng(seed)
+        self.trail_decay = trail_decay
+        self.random_decay = random_decay
+        self.size = size
+        self.meteor = ParticleSystem(1)
+        self.meteor.spawn(0, velocity=1.0, color=color, length=size)
+        self._head = np.full(size, 255)  # Solid head: size LEDs at full color
+        self.frames = 2 * led_count  # Until the trail has left the strip
+
+    def step(self, out):
+        # Meteor-Schweif ausblenden
+        mask = self.rng.integers(0, 10, size=self.led_count) > 5 if self.random_decay else None
+        _fade(out, self.trail_decay, mask)
+
+        # Meteor zeichnen
+        self.meteor.splat(out, self._head)
+        self.meteor.step()
+
+
+class Confetti:
+    """Arduino confetti(): random colored sparkles slowly fading out"""
+
+    def __init__(self, led_count, seed=DEFAULT_SEED, per_frame=1, fade=10):
+        self.led_count = led_count
+        self.rng = np.random.default_rng(seed)
+        self.per_frame = per_frame
+        self.fade = fade
+        self.sparkles = ParticleSystem(max(1, per_frame))
+        self.wheel = hue_lut(200 / 255, 1.0, 256)
+
+    def step(self, out):
+        _fade(out, self.fade)
+
+        # CHSV(random(256), 200, 255)
+        colors = self.wheel[self.rng.integers(0, 256, size=self.per_frame)]
+        self.sparkles.spawn(self.rng.integers(0, self.led_count, size=self.per_frame),
+                            color=colors, lifetime=1)
+        self.sparkles.splat(out, add=True)
+        self.sparkles.step()
+        self.sparkles.cull()
+
+
+def _endless_fireworks(led_count):
+    """Fireworks step that relaunches whenever a burst is over"""
+    fireworks = Fireworks(led_count)
+
+    def step(out):
+        if fireworks.phase == "done":
+            fireworks.launch()
+        fireworks.step(out)
+    return step
+
+
+def benchmark(led_count, frames=500):
+    """Milliseconds per frame for every effect"""
+    out = np.zeros((led_count, 3), dtype=np.uint8)
+    effects = {
+        "rainbow_chase": RainbowChase(led_count).step,
+        "fire_simulation": FireSimulation(led_count).step,
+        "wave_interference": WaveInterference(led_count).step,
+        "lightning_storm": LightningStorm(led_count).strike,
+        "matrix_rain": MatrixRain(led_count).step,
+        "fireworks": _endless_fireworks(led_count),
+        "meteor": Meteor(led_count).step,
+        "confetti": Confetti(led_count).step,
+    }
+
+    results = {}
+    for name, step in effects.items():
+        start = time.perf_counter()
+        for _ in range(frames):
+            step(out)
+        results[name] = (time.perf_counter() - start) / frames * 1e3
+    return results
+
+
+def check_meteor_head(led_count=300, size=10):
+    """True if the meteor head lights exactly size LEDs once it is fully on the strip"""
+    meteor = Meteor(led_count, size=size, random_decay=False)
+    out = np.zeros((led_count, 3), dtype=np.uint8)
+    for _ in range(size):
+        out.fill(0)
+        meteor.step(out)
+    return int(np.count_nonzero(out.any(axis=1))) == size
+
+
+if __name__ == "__main__":
+    print(f"☄️ Meteor-Kopf {'✅' if check_meteor_head() else '❌'}")
+    print("🎇 Effect Benchmark (ms pro Frame)")
+    for count in (300, 1000, 5000):
+        print(f"   {count} LEDs:")
+        for name, ms in benchmark(count).items():
+            print(f"      {name:<18} {ms:.3f} ms")
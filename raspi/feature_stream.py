@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+
+# 📼 FEATURE STREAM - LIVE-AUDIO AUFNEHMEN UND BELIEBIG SCHNELL ABSPIELEN! 📼
+
+import argparse
+import contextlib
+import io
+import struct
+import threading
+import time
+import numpy as np
+
+FILE_MAGIC = b"LZFS"
+FILE_VERSION = 2
+HEADER = struct.Struct("<4sHHd")  # magic, version, band count, start time (epoch)
+NAMES = struct.Struct("<H")  # length of the comma-separated band beat stream names that follow the header
+
+
+def _record_dtype(band_count, stream_count):
+    return np.dtype([("time", "<f8"), ("energy", "<f4"), ("volume", "<f4"),
+                     ("freq_bands", "<f4", (band_count,)), ("beat", "u1"),
+                     ("tempo", "u1"), ("bpm", "<f4"), ("confidence", "<f4"), ("next_beat", "<f8"),
+                     ("band_beats", "u1"), ("band_energy", "<f4", (stream_count,))])
+
+
+class FeatureRecorder:
+    """Records the audio, beat, tempo and band beat streams of a BeatDetector into a binary file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.frame_count = 0
+        self.band_names = []
+        self._file = None
+        self._record = None
+        self._start_time = None
+        self._lock = threading.Lock()
+
+        # Tempo / band beat events arrive before the audio callback of the same chunk
+        self._tempo = None
+        self._band_beats = 0
+        self._band_energy = []
+
+    def attach(self, detector):
+        """Subscribe to a BeatDetector (or FeatureReplayer)"""
+        self.band_names = list(detector.band_beat_callbacks)
+        self._band_energy = [0.0] * len(self.band_names)
+        detector.add_tempo_callback(self.record_tempo)
+        for index, band in enumerate(self.band_names):
+            detector.add_band_beat_callback(band, self._band_beat(index))
+        detector.add_audio_callback(self.record)
+
+    def record_tempo(self, bpm, confidence, next_beat_time):
+        """Tempo callback: stored with the next frame"""
+        with self._lock:
+            self._tempo = (bpm, confidence, next_beat_time)
+
+    def _band_beat(self, index):
+        def callback(band_energy, volume, freq_bands):
+            with self._lock:
+                self._band_beats |= 1 << index
+                self._band_energy[index] = band_energy
+        return callback
+
+    def record(self, energy, volume, freq_bands, beat_detected):
+        """Audio callback: append one frame"""
+        with self._lock:
+            now = time.time()
+            if self._file is None:
+                # Header is written on the first frame, once the band count is known
+                self._start_time = now
+                self._record = struct.Struct(f"<dff{len(freq_bands)}fBBffdB{len(self.band_names)}f")
+                names = ",".join(self.band_names).encode()
+                self._file = open(self.path, "wb")
+                self._file.write(HEADER.pack(FILE_MAGIC, FILE_VERSION, len(freq_bands), now))
+                self._file.write(NAMES.pack(len(names)) + names)
+
+            # next_beat is stored relative to the recording start (0 = no prediction)
+            bpm, confidence, next_beat = self._tempo or (0.0, 0.0, 0.0)
+            if next_beat:
+                next_beat -= self._start_time
+            self._file.write(self._record.pack(now - self._start_time, energy, volume,
+                                               *freq_bands, 1 if beat_detected else 0,
+                                               1 if self._tempo else 0, bpm, confidence, next_beat,
+                                               self._band_beats, *self._band_energy))
+            self.frame_count += 1
+            self._tempo = None
+            self._band_beats = 0
+
+    def close(self):
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+
+def load_feature_stream(path):
+    """Read a recording as (frames, band_names); frames is a structured array, one record per audio frame"""
+    with open(path, "rb") as f:
+        magic, version, band_count, _start = HEADER.unpack(f.read(HEADER.size))
+        if magic != FILE_MAGIC:
+            raise ValueError(f"{path} is not a feature stream recording")
+        if version != FILE_VERSION:
+            raise ValueError(f"Unsupported feature stream version: {version}")
+        (length,) = NAMES.unpack(f.read(NAMES.size))
+        names = f.read(length).decode()
+        data = f.read()
+
+    band_names = names.split(",") if names else []
+    record = _record_dtype(band_count, len(band_names))
+    return np.frombuffer(data, dtype=record, count=len(data) // record.itemsize), band_names
+
+
+class FeatureReplayer:
+    """Drop-in stand-in for BeatDetector that replays a recorded feature stream"""
+
+    def __init__(self, path, speed=1.0, loop=False):
+        self.frames, band_names = load_feature_stream(path)
+        self.speed = speed  # 1.0 = real time, N = N x faster, 0/None = as fast as possible
+        self.loop = loop
+        self.running = False
+        self.beat_callbacks = []
+        self.audio_callbacks = []
+        self.tempo_callbacks = []
+        self.band_beat_callbacks = {name: [] for name in band_names}
+        self._thread = None
+
+        # Same "current" state as BeatDetector
+        self.current_energy = 0
+        self.current_volume = 0
+        self.current_freq_bands = [0] * self.frames["freq_bands"].shape[1] if len(self.frames) else []
+        self.beat_detected = False
+
+    def add_beat_callback(self, callback):
+        """Add callback function to be called when beat is detected"""
+        self.beat_callbacks.append(callback)
+
+    def add_audio_callback(self, callback):
+        """Add callback function to be called on every audio frame"""
+        self.audio_callbacks.append(callback)
+
+    def add_tempo_callback(self, callback):
+        """Add callback(bpm, confidence, next_beat_time); next_beat_time is moved onto the replay clock"""
+        self.tempo_callbacks.append(callback)
+
+    def add_band_beat_callback(self, band, callback):
+        """Add callback(band_energy, volume, freq_bands) for onsets in one recorded band stream"""
+        if band not in self.band_beat_callbacks:
+            raise ValueError(f"Unknown band '{band}' (recorded: {', '.join(self.band_beat_callbacks)})")
+        self.band_beat_callbacks[band].append(callback)
+
+    def run(self):
+        """Replay the whole stream on the calling thread; returns elapsed seconds"""
+        self.running = True
+        start = time.perf_counter()
+
+        # Convert once, so the replay loop only hands out Python values
+        times = self.frames["time"].tolist()
+        energies = self.frames["energy"].tolist()
+        volumes = self.frames["volume"].tolist()
+        bands = self.frames["freq_bands"].tolist()
+        beats = self.frames["beat"].astype(bool).tolist()
+        tempos = self.frames["tempo"].astype(bool).tolist()
+        bpms = self.frames["bpm"].tolist()
+        confidences = self.frames["confidence"].tolist()
+        next_beats = self.frames["next_beat"].tolist()
+        band_beats = self.frames["band_beats"].tolist()
+        band_energies = self.frames["band_energy"].tolist()
+
+        while self.running:
+            loop_start = time.perf_counter()
+            for i in range(len(times)):
+                if not self.running:
+                    break
+
+                if self.speed:
+                    delay = loop_start + times[i] / self.speed - time.perf_counter()
+                    if delay > 0:
+                        time.sleep(delay)
+
+                tempo = None
+                if tempos[i]:
+                    # Predicted beat keeps its distance to the frame, scaled like the replay
+                    next_beat = next_beats[i]
+                    if next_beat:
+                        next_beat = time.time() + (next_beat - times[i]) / (self.speed or 1.0)
+                    tempo = (bpms[i], confidences[i], next_beat)
+
+                self._dispatch(energies[i], volumes[i], bands[i], beats[i],
+                               tempo, band_beats[i], band_energies[i])
+
+            if not self.loop:
+                break
+
+        self.running = False
+        return time.perf_counter() - start
+
+    def _dispatch(self, energy, volume, freq_bands, beat_detected, tempo=None, band_beats=0, band_energy=()):
+        """Call subscribers in the same order as BeatDetector: tempo, beat, band beats, audio"""
+        self.current_energy = energy
+        self.current_volume = volume
+        self.current_freq_bands = freq_bands
+        self.beat_detected = beat_detected
+
+        if tempo:
+            for callback in self.tempo_callbacks:
+                try:
+                    callback(*tempo)
+                except Exception as e:
+                    print(f"Tempo callback error: {e}")
+
+        if beat_detected:
+            for callback in self.beat_callbacks:
+                try:
+                    callback(energy, volume, freq_bands)
+                except Exception as e:
+                    print(f"Beat callback error: {e}")
+
+        if band_beats:
+            for index, (band, callbacks) in enumerate(self.band_beat_callbacks.items()):
+                if band_beats & (1 << index):
+                    for callback in callbacks:
+                        try:
+                            callback(band_energy[index], volume, freq_bands)
+                        except Exception as e:
+                            print(f"Band beat callback error ({band}): {e}")
+
+        for callback in self.audio_callbacks:
+            try:
+                callback(energy, volume, freq_bands, beat_detected)
+            except Exception as e:
+                print(f"Audio callback error: {e}")
+
+    def start(self, demo_mode=False):
+        """Replay in a background thread (same call as BeatDetector.start)"""
+        if self.running:
+            return True
+        self.running = True
+        self._thread = threading.Thread(target=self.run, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self.running = False
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def get_current_audio_info(self):
+        """Get current audio analysis data"""
+        return {
+            'energy': self.current_energy,
+            'volume': self.current_volume,
+            'freq_bands': self.current_freq_bands,
+            'beat_detected': self.beat_detected
+        }
+
+
+def record_session(path, seconds, demo_mode=False):
+    """Record a live BeatDetector session into path, with the detector settings of music_mode"""
+    from beat_detector import BeatDetector
+    from music_mode import DETECTOR_CONFIG
+
+    detector = BeatDetector(**DETECTOR_CONFIG)
+    recorder = FeatureRecorder(path)
+    recorder.attach(detector)
+
+    if not detector.start(demo_mode=demo_mode):
+        print("❌ Fehler beim Starten des Beat-Detektors!")
+        return
+    try:
+        time.sleep(seconds)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        detector.stop()
+        recorder.close()
+    print(f"📼 {recorder.frame_count} Frames nach {path} aufgenommen")
+
+
+def benchmark_music_mode(path):
+    """Replay as fast as possible through every music_mode visualizer"""
+    import music_mode
+
+    # No frame rate gating - every recorded frame gets rendered
+    music_mode.frame_clock.set_rate(float("inf"))
+    results = {}
+
+    for mode in music_mode.MODES:
+        # Only the mode's own layer is visible, as after a finished crossfade
+        music_mode.current_mode = mode
+        for layer in music_mode.MODES:
+            music_mode.compositor[layer].opacity = 1.0 if layer == mode else 0.0
+        replayer = FeatureReplayer(path, speed=None)
+        replayer.add_beat_callback(music_mode.on_beat)
+        replayer.add_audio_callback(music_mode.on_audio_frame)
+        replayer.add_tempo_callback(music_mode.on_tempo)
+        for band in music_mode.BAND_FLASH_INDEX:
+            if band in replayer.band_beat_callbacks:
+                replayer.add_band_beat_callback(band, music_mode.on_band_beat(band))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            elapsed = replayer.run()
+        results[mode] = elapsed / max(1, len(replayer.frames)) * 1e3
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or replay BeatDetector feature streams")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Record a live session")
+    record.add_argument("path")
+    record.add_argument("--seconds", type=float, default=60)
+    record.add_argument("--demo", action="store_true", help="Record the demo generator")
+
+    replay = commands.add_parser("replay", help="Replay to stdout")
+    replay.add_argument("path")
+    replay.add_argument("--speed", type=float, default=1.0, help="0 = as fast as possible")
+
+    bench = commands.add_parser("bench", help="Benchmark music_mode visualizers on a recording")
+    bench.add_argument("path")
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record_session(args.path, args.seconds, args.demo)
+    elif args.command == "replay":
+        replayer = FeatureReplayer(args.path, speed=args.speed)
+        replayer.add_beat_callback(lambda energy, volume, freq_bands: print(f"🥁 BEAT! Energy: {energy:.3f}"))
+        elapsed = replayer.run()
+        print(f"📼 {len(replayer.frames)} Frames in {elapsed:.2f} s abgespielt")
+    elif args.command == "bench":
+        print("📼 music_mode Benchmark (ms pro Frame inkl. send_to_strip)")
+        for mode, ms in benchmark_music_mode(args.path).items():
+            print(f"   {mode:<17} {ms:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
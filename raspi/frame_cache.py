@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+# 🗃️ FRAME CACHE - PERIODISCHE EFFEKTE NUR EINMAL PRO PHASE RENDERN! 🗃️
+
+import time
+from collections import OrderedDict
+import numpy as np
+
+
+class FrameCache:
+    """LRU cache of rendered (N, 3) uint8 frames under a memory cap.
+
+    Keys are (effect, parameters..., phase) tuples; one cache serves
+    every effect of a strip. A hit is one memcpy into out, a miss renders into
+    out and keeps a copy. When the cap is reached the least recently used frames
+    are evicted and their buffers reused for new entries.
+    """
+
+    def __init__(self, max_bytes=4_000_000):
+        self.max_bytes = max_bytes
+        self.frames = OrderedDict()
+        self.bytes = 0
+        self._spare = None  # Evicted buffer, reused by the next put()
+
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.frames)
+
+    def __contains__(self, key):
+        return key in self.frames
+
+    def get(self, key, out):
+        """Copy the cached frame for key into out; False on a miss"""
+        frame = self.frames.get(key)
+        if frame is None:
+            self.misses += 1
+            return False
+        self.frames.move_to_end(key)
+        np.copyto(out, frame)
+        self.hits += 1
+        return True
+
+    def put(self, key, frame):
+        """Remember a copy of frame under key, evicting least recently used frames to stay under the cap"""
+        if frame.nbytes > self.max_bytes or key in self.frames:
+            return
+        while self.frames and self.bytes + frame.nbytes > self.max_bytes:
+            _, evicted = self.frames.popitem(last=False)
+            self.bytes -= evicted.nbytes
+            self.evictions += 1
+            self._spare = evicted
+
+        stored = self._spare
+        if stored is None or stored.shape != frame.shape:
+            stored = np.empty(frame.shape, dtype=np.uint8)
+        self._spare = None
+        np.copyto(stored, frame, casting="unsafe")
+        self.frames[key] = stored
+        self.bytes += stored.nbytes
+
+    def render(self, key, render, out, *args):
+        """out = cached frame for key, or render(out, *args) and cache the result"""
+        if not self.get(key, out):
+            render(out, *args)
+            self.put(key, out)
+        return out
+
+    def clear(self):
+        self.frames.clear()
+        self.bytes = 0
+        self._spare = None
+
+    def stats(self):
+        lookups = max(1, self.hits + self.misses)
+        return {
+            'entries': len(self.frames),
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups
+        }
+
+    def summary(self):
+        stats = self.stats()
+        return (f"Frame-Cache: {stats['hit_rate']:.0%} Treffer ({stats['hits']} / {stats['misses']} verfehlt), "
+                f"{stats['entries']} Frames, {stats['bytes'] / 1e6:.1f} von {stats['max_bytes'] / 1e6:.1f} MB, "
+                f"{stats['evictions']} verdrängt")
+
+
+def benchmark(led_count, frames=2000, max_bytes=4_000_000):
+    """Microseconds per frame with and without cache, plus the cache hit rate"""
+    from effects import RainbowChase
+    from visualizers import MusicVisualizers
+
+    out = np.zeros((led_count, 3), dtype=np.uint8)
+    rng = np.random.default_rng(7)
+    bands = rng.uniform(0, 0.04, size=(frames, 4)).tolist()
+    volumes = rng.uniform(0, 1, size=frames).tolist()
+
+    def effects(cache):
+        visuals = MusicVisualizers(led_count, cache=cache)
+        return {
+            "rainbow_chase": RainbowChase(led_count, cache=cache).step,
+            "reactive_rainbow": lambda out, i: visuals.reactive_rainbow(out, bands[i], volumes[i], i / 30),
+        }
+
+    results = {}
+    for name, step in effects(None).items():
+        cache = FrameCache(max_bytes)
+        cached = effects(cache)[name]
+        timings = []
+        for run in (step, cached):
+            start = time.perf_counter()
+            for index in range(frames):
+                if name == "reactive_rainbow":
+                    run(out, index)
+                else:
+                    run(out)
+            timings.append((time.perf_counter() - start) / frames * 1e6)
+        results[name] = (*timings, cache.stats()['hit_rate'])
+    return results
+
+
+if __name__ == "__main__":
+    print("🗃️ Frame-Cache Benchmark (µs pro Frame: ohne / mit Cache, Trefferquote)")
+    for count in (300, 1000, 5000):
+        print(f"   {count} LEDs:")
+        for name, (plain, cached, hit_rate) in benchmark(count).items():
+            print(f"      {name:<17} {plain:7.1f} / {cached:7.1f} µs  {hit_rate:.0%}")
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+
+# 🚚 FRAME PIPELINE - RENDERN UND SENDEN IN GETRENNTEN THREADS! 🚚
+
+import threading
+import time
+from collections import deque
+import numpy as np
+
+# latest: the transmitter always sends the newest finished frame, older unsent ones are discarded
+# drop:   bounded FIFO, every queued frame is sent; a frame arriving while the ring is full is dropped
+POLICIES = ("latest", "drop")
+
+
+class FramePipeline:
+    """Double-buffered render -> transmit handoff with a small ring of preallocated frames.
+
+    The renderer fills a free slot (acquire() / submit(), or show() which copies)
+    and returns immediately; a transmitter thread pushes finished frames to the
+    wrapped backend. Renderer and transmitter only meet under a short lock that
+    moves slot numbers around, never while a frame is encoded or sent.
+    """
+
+    def __init__(self, backend, slots=3, policy="latest"):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown frame policy '{policy}' (use {', '.join(POLICIES)})")
+        if slots < 2:
+            raise ValueError("A frame pipeline needs at least 2 slots")
+        self.backend = backend
+        self.led_count = backend.led_count
+        self.name = backend.name
+        self.policy = policy
+        self.slots = np.zeros((slots, backend.led_count, 3), dtype=np.uint8)
+
+        self._free = deque(range(slots))  # Slots the renderer may fill
+        self._ready = deque()             # Finished frames, oldest first
+        self._writing = None              # Slot handed out by acquire()
+        self._correction = None           # Pending set_correction() kwargs, applied by the transmitter
+        self._condition = threading.Condition()
+        self._thread = None
+        self.running = False
+
+        # Stats
+        self.rendered = 0      # Frames the renderer produced (acquire() calls)
+        self.submitted = 0
+        self.sent = 0
+        self.dropped = 0       # Frames never sent (overwritten or rejected, see policy)
+        self.send_time = 0.0
+        self.send_time_max = 0.0
+
+    def start(self):
+        if not self.running:
+            self.running = True
+            self._thread = threading.Thread(target=self._transmit_loop, daemon=True)
+            self._thread.start()
+        return self
+
+    # Renderer side
+
+    def acquire(self):
+        """Free (N, 3) buffer to render the next frame into, or None if it should be skipped"""
+        with self._condition:
+            if self._writing is None:
+                self.rendered += 1
+                if self._free:
+                    self._writing = self._free.popleft()
+                elif self.policy == "latest" and self._ready:
+                    # Overwrite the oldest unsent frame - it would be discarded anyway
+                    self._writing = self._ready.popleft()
+                    self.dropped += 1
+                else:
+                    self.dropped += 1
+                    return None
+            return self.slots[self._writing]
+
+    def submit(self):
+        """Hand the acquired buffer to the transmitter"""
+        with self._condition:
+            if self._writing is None:
+                return
+            self._ready.append(self._writing)
+            self._writing = None
+            self.submitted += 1
+            self._condition.notify()
+
+    def show(self, frame):
+        """Drop-in for OutputBackend.show(): copy the frame into the ring, never block on the strip"""
+        buffer = self.acquire()
+        if buffer is not None:
+            np.copyto(buffer, frame, casting="unsafe")
+            self.submit()
+
+    def set_correction(self, brightness=None, gamma=None, white_balance=None):
+        """Queue a correction change; the transmitter applies it before its next frame"""
+        with self._condition:
+            pending = self._correction or {}
+            for key, value in (("brightness", brightness), ("gamma", gamma), ("white_balance", white_balance)):
+                if value is not None:
+                    pending[key] = value
+            self._correction = pending
+
+    def set_brightness(self, brightness):
+        self.set_correction(brightness=brightness)
+
+    # Transmitter side
+
+    def _next_slot(self):
+        """Wait for a finished frame; returns its slot or None when stopped and drained"""
+        with self._condition:
+            while not self._ready:
+                if not self.running:
+                    return None, None
+                self._condition.wait(0.1)
+
+            if self.policy == "latest":
+                slot = self._ready.pop()
+                self.dropped += len(self._ready)
+                self._free.extend(self._ready)
+                self._ready.clear()
+            else:
+                slot = self._ready.popleft()
+
+            correction, self._correction = self._correction, None
+            return slot, correction
+
+    def _transmit_loop(self):
+        while True:
+            slot, correction = self._next_slot()
+            if slot is None:
+                break
+            try:
+                if correction:
+                    self.backend.set_correction(**correction)
+                start = time.perf_counter()
+                self.backend.show(self.slots[slot])
+                duration = time.perf_counter() - start
+                self.sent += 1
+                self.send_time += duration
+                self.send_time_max = max(self.send_time_max, duration)
+            except Exception as e:
+                print(f"❌ Frame send error: {e}")
+            finally:
+                with self._condition:
+                    self._free.append(slot)
+
+    def stop(self, timeout=1.0):
+        """Send what is still queued, then stop the transmitter"""
+        if not self.running:
+            return
+        with self._condition:
+            self.running = False
+            self._condition.notify()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def close(self):
+        self.stop()
+        self.backend.close()
+
+    def stats(self):
+        sent = max(1, self.sent)
+        stats = {
+            'submitted': self.submitted,
+            'sent': self.sent,
+            'dropped': self.dropped,
+            'avg_send_ms': self.send_time / sent * 1e3,
+            'max_send_ms': self.send_time_max * 1e3
+        }
+        # Backend counters (wire transmits, dedupes), but rendered means frames the renderer made
+        if hasattr(self.backend, "stats"):
+            stats.update(self.backend.stats())
+        stats['frames_rendered'] = self.rendered
+        return stats
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class _SlowBackend:
+    """Stand-in for a bit-banged strip: show() takes a fixed time"""
+
+    name = "slow"
+
+    def __init__(self, led_count, send_seconds):
+        self.led_count = led_count
+        self.send_seconds = send_seconds
+
+    def show(self, frame):
+        time.sleep(self.send_seconds)
+
+    def set_correction(self, **kwargs):
+        pass
+
+    def close(self):
+        pass
+
+
+def benchmark(led_count=300, send_ms=9.0, frames=200):
+    """Render-loop time per frame with a slow strip: direct show() vs pipeline, per policy"""
+    frame = np.zeros((led_count, 3), dtype=np.uint8)
+    results = {}
+
+    backend = _SlowBackend(led_count, send_ms / 1e3)
+    start = time.perf_counter()
+    for _ in range(frames):
+        backend.show(frame)
+    results["direct"] = ((time.perf_counter() - start) / frames * 1e3, frames)
+
+    for policy in POLICIES:
+        with FramePipeline(_SlowBackend(led_count, send_ms / 1e3), policy=policy) as pipeline:
+            blocked = 0.0
+            for _ in range(frames):
+                start = time.perf_counter()
+                pipeline.show(frame)
+                blocked += time.perf_counter() - start
+                time.sleep(send_ms / 3e3)  # Renderer three times faster than the strip
+        results[policy] = (blocked / frames * 1e3, pipeline.sent)
+    return results
+
+
+if __name__ == "__main__":
+    print("🚚 Frame Pipeline Benchmark (Strip braucht 9 ms pro Frame)")
+    for name, (ms, sent) in benchmark().items():
+        print(f"   {name:<7} Render-Thread blockiert {ms:.3f} ms pro Frame, {sent} Frames gesendet")
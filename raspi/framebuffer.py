@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+
+# 🧱 FRAMEBUFFER - ALLE LEDs IN EINEM NUMPY-ARRAY! 🧱
+
+import numpy as np
+
+
+def changed_prefix(frame, shown, scratch=None):
+    """Number of leading LEDs to resend so the strip shows frame instead of shown.
+
+    WS2812 pixels latch what they last received, so everything after the last
+    changed LED can stay as it is. 0 means nothing changed.
+    """
+    frame = np.asarray(frame).reshape(-1, 3)
+    if scratch is None:
+        scratch = np.empty(frame.shape, dtype=bool)
+    np.not_equal(frame, shown, out=scratch)
+    changed = np.flatnonzero(scratch.reshape(-1))
+    return int(changed[-1]) // 3 + 1 if len(changed) else 0
+
+
+class FrameBuffer:
+    """Contiguous (N, 3) uint8 RGB framebuffer with vectorized bulk operations"""
+
+    def __init__(self, led_count):
+        self.led_count = led_count
+        self.pixels = np.zeros((led_count, 3), dtype=np.uint8)
+        # Scratch buffer for saturating math, reused every frame
+        self._scratch = np.zeros((led_count, 3), dtype=np.int32)
+
+    def __len__(self):
+        return self.led_count
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            r, g, b = self.pixels[index].tolist()
+            return r, g, b
+        return self.pixels[index]
+
+    def __setitem__(self, index, color):
+        self.pixels[index] = color
+
+    def __iter__(self):
+        for r, g, b in self.pixels.tolist():
+            yield r, g, b
+
+    def view(self):
+        """Zero-copy view of the pixel data (what the encoder consumes)"""
+        return self.pixels
+
+    def clear(self):
+        self.pixels.fill(0)
+
+    def fill(self, color, start=0, end=None):
+        """Fill a range (default: whole strip) with one color"""
+        self.pixels[start:end] = color
+
+    def set_range(self, start, colors):
+        """Slice-assign an (M, 3) color array (clipped to the strip) starting at start"""
+        colors = np.asarray(colors).reshape(-1, 3)
+        end = min(self.led_count, start + len(colors))
+        if start < 0:
+            colors = colors[-start:]
+            start = 0
+        if start < end:
+            self.pixels[start:end] = colors[:end - start]
+
+    def copy_from(self, other):
+        """Copy another framebuffer or (N, 3) array in place"""
+        source = other.pixels if isinstance(other, FrameBuffer) else other
+        np.copyto(self.pixels, source, casting="unsafe")
+
+    def fade_by(self, amount):
+        """FastLED fadeToBlackBy: scale every channel by (256 - amount) / 256"""
+        scratch = self._scratch
+        np.multiply(self.pixels, 256 - amount, out=scratch, dtype=np.int32, casting="unsafe")
+        np.right_shift(scratch, 8, out=scratch)
+        np.copyto(self.pixels, scratch, casting="unsafe")
+
+    def add_saturate(self, colors, start=0, end=None):
+        """Add colors (single color or array) and clip to 0..255"""
+        target = self.pixels[start:end]
+        scratch = self._scratch[:len(target)]
+        np.add(target, colors, out=scratch, dtype=np.int32, casting="unsafe")
+        np.clip(scratch, 0, 255, out=scratch)
+        np.copyto(target, scratch, casting="unsafe")
+
+    def sub_saturate(self, colors, start=0, end=None):
+        """Subtract colors (single color or array) and clip at 0"""
+        self.add_saturate(-np.asarray(colors, dtype=np.int32), start, end)
+
+    def blend(self, other, amount):
+        """Blend towards another frame: amount 0.0 keeps self, 1.0 takes other"""
+        source = other.pixels if isinstance(other, FrameBuffer) else np.asarray(other)
+        mixed = self.pixels * (1.0 - amount) + source * amount
+        np.copyto(self.pixels, mixed, casting="unsafe")
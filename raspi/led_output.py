@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+
+# 🔌 LED OUTPUT BACKENDS - GPIO, SPI ODER LOOPBACK (OHNE PI)! 🔌
+
+import os
+import struct
+import time
+import zlib
+import numpy as np
+from ws2812 import WS2812Encoder, SPI_HZ, build_correction_lut
+from framebuffer import changed_prefix
+
+# WS2812B Timing
+T1H_NS = 800
+T1L_NS = 400
+T0H_NS = 400
+T0L_NS = 800
+RESET_NS = 50000
+
+DEFAULT_BACKEND = "gpio"
+FULL_REFRESH_FRAMES = 60  # Send the whole strip at least every N frames (0 = always whole frames)
+KEEP_ALIVE_SECONDS = 1.0  # Resend an unchanged frame after this long (0 = never)
+
+
+def precise_delay_ns(nanoseconds):
+    if nanoseconds < 10000:
+        start = time.perf_counter_ns()
+        while (time.perf_counter_ns() - start) < nanoseconds:
+            pass
+    else:
+        time.sleep(nanoseconds / 1_000_000_000)
+
+
+class OutputBackend:
+    """Base class for everything that can put a frame on the strip"""
+
+    name = "base"
+
+    def __init__(self, led_count, color_order="GRB", full_refresh=FULL_REFRESH_FRAMES,
+                 keep_alive=KEEP_ALIVE_SECONDS):
+        self.led_count = led_count
+        self.encoder = WS2812Encoder(led_count, color_order)
+        self.brightness = 1.0
+        self.gamma = 1.0
+        self.white_balance = (255, 255, 255)
+
+        # Prefix updates: only LEDs up to the last changed one go on the wire
+        self.full_refresh = full_refresh
+        self._shown = np.zeros((led_count, 3), dtype=np.uint8)  # What the strip latched last
+        self._changed = np.empty((led_count, 3), dtype=bool)
+        self._since_full = None  # Frames since the last full send (None = next one is full)
+
+        # Dedupe: crc32 of the last frame sent, identical frames stay off the wire until keep_alive
+        self.keep_alive = keep_alive
+        self._fingerprint = None
+        self._last_send = 0.0
+
+        self.frames_rendered = 0  # show() calls
+        self.frames_sent = 0      # Frames that actually went on the wire
+        self.frames_deduped = 0   # Skipped because nothing changed
+        self.leds_sent = 0
+
+    def set_correction(self, brightness=None, gamma=None, white_balance=None):
+        """Brightness / gamma / white balance, applied in the encode tables.
+
+        Cheap to call every frame: the tables are only rebuilt when a value changed.
+        """
+        settings = (self.brightness if brightness is None else brightness,
+                    self.gamma if gamma is None else gamma,
+                    tuple(self.white_balance if white_balance is None else white_balance))
+        if settings == (self.brightness, self.gamma, self.white_balance) and \
+                self.encoder.correction is not None:
+            return
+
+        self.brightness, self.gamma, self.white_balance = settings
+        self.encoder.set_correction(build_correction_lut(*settings))
+        self._since_full = None  # Every LED looks different now
+        self._fingerprint = None
+
+    def set_brightness(self, brightness):
+        """Change global brightness (0.0-1.0) at runtime"""
+        self.set_correction(brightness=brightness)
+
+    def show(self, frame):
+        """Send an (N, 3) uint8 RGB frame to the strip - only the prefix that changed, nothing if identical"""
+        frame = np.ascontiguousarray(frame, dtype=np.uint8).reshape(-1, 3)
+        self.frames_rendered += 1
+        now = time.monotonic()
+
+        # Same frame as last time (correction changes reset the fingerprint): skip unless keep-alive is due
+        fingerprint = zlib.crc32(frame)
+        keep_alive = self.keep_alive and now - self._last_send >= self.keep_alive
+        if fingerprint == self._fingerprint and not keep_alive:
+            self.frames_deduped += 1
+            return
+
+        full = (keep_alive or not self.full_refresh or self._since_full is None
+                or self._since_full + 1 >= self.full_refresh)
+        length = self.led_count if full else changed_prefix(frame, self._shown, self._changed)
+        self._since_full = 0 if full else self._since_full + 1
+        self._fingerprint = fingerprint
+        if length == 0:
+            self.frames_deduped += 1
+            return
+
+        self._send(frame, length)
+        self._shown[:length] = frame[:length]
+        self._last_send = now
+        self.frames_sent += 1
+        self.leds_sent += length
+
+    def _send(self, frame, length):
+        """Put the first length LEDs of frame on the wire"""
+        raise NotImplementedError
+
+    def stats(self):
+        sent = max(1, self.frames_sent)
+        return {
+            'frames_rendered': self.frames_rendered,
+            'frames_sent': self.frames_sent,
+            'frames_deduped': self.frames_deduped,
+            'avg_leds_sent': self.leds_sent / sent
+        }
+
+    def close(self):
+        """Release hardware resources"""
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class GPIOBackend(OutputBackend):
+    """Bit-bangs the encoded frame on a GPIO pin via gpiozero"""
+
+    name = "gpio"
+
+    def __init__(self, led_count, pin=18, color_order="GRB", **options):
+        super().__init__(led_count, color_order, **options)
+        import gpiozero
+        self._gpiozero = gpiozero
+        self.pin = pin
+        self.device = None
+
+        # Try to cleanup any existing GPIO usage
+        self._reset_pin_factory()
+        try:
+            self.device = gpiozero.OutputDevice(pin)
+        except Exception as e:
+            print(f"❌ GPIO Error: {e}")
+            print("🔄 Trying alternative GPIO initialization...")
+            time.sleep(1)
+            self.device = gpiozero.OutputDevice(pin)
+
+    def _reset_pin_factory(self):
+        try:
+            self._gpiozero.Device.pin_factory.reset()
+        except:
+            pass
+
+    def _send_bit(self, bit):
+        if bit:
+            self.device.on()
+            precise_delay_ns(T1H_NS)
+            self.device.off()
+            precise_delay_ns(T1L_NS)
+        else:
+            self.device.on()
+            precise_delay_ns(T0H_NS)
+            self.device.off()
+            precise_delay_ns(T0L_NS)
+
+    def _send(self, frame, length):
+        bits = self.encoder.encode_bits(frame)[:length * 24]
+
+        self.device.off()
+        precise_delay_ns(RESET_NS)
+
+        for bit in bits:
+            self._send_bit(bit)
+
+        self.device.off()
+        precise_delay_ns(RESET_NS)
+
+    def close(self):
+        try:
+            if self.device:
+                self.device.close()
+                self.device = None
+        except:
+            pass
+        self._reset_pin_factory()
+
+
+class SPIBackend(OutputBackend):
+    """Streams the encoded frame over SPI MOSI in one bulk transfer"""
+
+    name = "spi"
+
+    def __init__(self, led_count, bus=0, device=0, speed_hz=SPI_HZ, color_order="GRB", **options):
+        super().__init__(led_count, color_order, **options)
+        import spidev
+        self.spi = spidev.SpiDev()
+        self.spi.open(bus, device)
+        self.spi.max_speed_hz = speed_hz
+        self.spi.mode = 0
+
+        # Low-Pegel vor und nach dem Frame als Reset (>50 µs)
+        reset_bytes = int(np.ceil(RESET_NS * 1e-9 * speed_hz / 8))
+        payload = led_count * 9
+        self._reset_bytes = reset_bytes
+        self._buffer = np.zeros(reset_bytes + payload + reset_bytes, dtype=np.uint8)
+        self._payload = self._buffer[reset_bytes:reset_bytes + payload]
+
+    def _send(self, frame, length):
+        np.copyto(self._payload, self.encoder.encode(frame))
+        # Reset (low) right after the prefix; the rest of the strip keeps its colors
+        end = self._reset_bytes + length * 9
+        self._buffer[end:end + self._reset_bytes] = 0
+        self.spi.writebytes2(self._buffer[:end + self._reset_bytes])
+
+    def close(self):
+        try:
+            self.spi.close()
+        except:
+            pass
+
+
+class LoopbackBackend(OutputBackend):
+    """Records frames and timing in memory and optionally to a file - no hardware needed"""
+
+    name = "loopback"
+
+    # Datei-Format: Header, dann pro Frame (timestamp, show duration) + RGB-Bytes
+    FILE_MAGIC = b"LZLB"
+    HEADER = struct.Struct("<4sHI")
+    RECORD = struct.Struct("<dd")
+
+    def __init__(self, led_count, path=None, max_frames=1000, color_order="GRB", **options):
+        super().__init__(led_count, color_order, **options)
+        self.max_frames = max_frames
+        self.frames = []
+        self.timestamps = []
+        self.frame_count = 0
+        self.path = path
+        self._file = None
+
+        if path:
+            self._file = open(path, "wb")
+            self._file.write(self.HEADER.pack(self.FILE_MAGIC, 1, led_count))
+
+    def _send(self, frame, length):
+        start = time.perf_counter()
+        # Encode like a real backend so the whole pipeline runs
+        self.encoder.encode(frame)
+        duration = time.perf_counter() - start
+        
+        # Record what the strip would show (after brightness / gamma); LEDs past the prefix keep their color
+        if length < self.led_count:
+            latched = frame.copy()
+            latched[length:] = self._shown[length:]
+            frame = latched
+        frame = self.encoder.correct(frame)
+
+        self.frame_count += 1
+        if self.max_frames:
+            self.frames.append(frame)
+            self.timestamps.append(time.time())
+            if len(self.frames) > self.max_frames:
+                self.frames.pop(0)
+                self.timestamps.pop(0)
+
+        if self._file:
+            self._file.write(self.RECORD.pack(time.time(), duration))
+            self._file.write(frame.tobytes())
+
+    def close(self):
+        if self._file:
+            self._file.close()
+            self._file = None
+
+    @classmethod
+    def read_file(cls, path):
+        """Load a recorded loopback file: returns (timestamps, durations, frames)"""
+        with open(path, "rb") as f:
+            magic, _version, led_count = cls.HEADER.unpack(f.read(cls.HEADER.size))
+            if magic != cls.FILE_MAGIC:
+                raise ValueError(f"{path} is not a loopback recording")
+            data = f.read()
+
+        record = np.dtype([("timestamp", "<f8"), ("duration", "<f8"),
+                           ("frame", np.uint8, (led_count, 3))])
+        records = np.frombuffer(data, dtype=record, count=len(data) // record.itemsize)
+        return records["timestamp"], records["duration"], records["frame"]
+
+
+BACKENDS = {
+    GPIOBackend.name: GPIOBackend,
+    SPIBackend.name: SPIBackend,
+    LoopbackBackend.name: LoopbackBackend,
+}
+
+
+def create_backend(led_count, name=None, pin=18, **kwargs):
+    """Create an output backend by name; defaults to $LED_BACKEND or gpio"""
+    name = name or os.environ.get("LED_BACKEND", DEFAULT_BACKEND)
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown LED backend '{name}' (choose from {', '.join(BACKENDS)})")
+
+    if name == GPIOBackend.name:
+        kwargs["pin"] = pin
+    elif name == LoopbackBackend.name and "path" not in kwargs:
+        kwargs["path"] = os.environ.get("LED_LOOPBACK_FILE")
+
+    return BACKENDS[name](led_count, **kwargs)
@@ -2,203 +2,158 @@
 
 # 🎵🔥 MUSIC MODE - BEAT-REACTIVE LED STRIP! 🔥🎵
 
-import gpiozero
+import os
 import time
-import random
-import math
 import numpy as np
 from beat_detector import BeatDetector
+from audio_sources import create_source
+from led_output import create_backend
+from frame_pipeline import FramePipeline
+from shm_transmitter import ShmTransmitter
+from framebuffer import FrameBuffer
+from visualizers import MusicVisualizers
+from frame_cache import FrameCache
+from smoothing import TemporalSmoother
+from compositor import Compositor
+from scheduler import FrameScheduler
 import atexit
 
 # LED Konfiguration (gleich wie party_mode.py)
 LED_COUNT = 300
 BRIGHTNESS = 0.9
+GAMMA = 2.2  # Gamma-Korrektur: leise Passagen bleiben satt statt ausgewaschen (1.0 = aus)
+WHITE_BALANCE = (255, 255, 255)  # Weißabgleich pro Kanal, z.B. (255, 176, 240) für typische Strips
 LED_PIN = 18
+LED_BACKEND = os.environ.get("LED_BACKEND", "gpio")  # gpio, spi oder loopback
+FRAME_POLICY = os.environ.get("LED_FRAME_POLICY", "latest")  # Senden: latest, drop (Thread), process (eigener Prozess) oder off
+TRANSMITTER_CPU = os.environ.get("LED_TRANSMITTER_CPU")  # CPU-Kern für den Sende-Prozess, z.B. "3" (None = beliebig)
+FULL_REFRESH = 60  # Alle N Frames den ganzen Strip senden, sonst nur bis zur letzten geänderten LED (0 = immer ganz)
+KEEP_ALIVE = 1.0  # Identische Frames werden nicht gesendet, nur alle N Sekunden zur Sicherheit (0 = nie)
+AUDIO_SOURCE = os.environ.get("AUDIO_SOURCE")  # pyaudio, stdin, file:<pfad>, udp:<port> (None = fragen)
+MODE_CROSSFADE = 0.5  # Sekunden Überblendung beim Moduswechsel (0 = harter Schnitt)
+BEAT_OVERLAY = 0.0  # Beat-Blitz über jedem Modus, additiv (0.0 = aus, 1.0 = volle Stärke)
+BEAT_OVERLAY_FADE = 60  # Ausblenden des Overlays pro Frame (fadeToBlackBy, 0..255)
+FRAME_CACHE_MB = 2  # Speicher für wiederkehrende Frames (reactive_rainbow), 0 = aus
 
-# GPIO cleanup and initialization
-def cleanup_gpio():
+# Output cleanup and initialization
+def cleanup_output():
     try:
         if 'led_output' in globals() and led_output:
             led_output.close()
     except:
         pass
-    try:
-        gpiozero.Device.pin_factory.reset()
-    except:
-        pass
 
 # Register cleanup
-atexit.register(cleanup_gpio)
-
-# Try to cleanup any existing GPIO usage
-cleanup_gpio()
+atexit.register(cleanup_output)
 
-# Initialize GPIO
+# Initialize output backend
 led_output = None
 try:
-    led_output = gpiozero.OutputDevice(LED_PIN)
+    if FRAME_POLICY == "process":
+        # Eigener Prozess (optional auf eigenem CPU-Kern): Bit-Banging blockiert nicht mehr den GIL
+        led_output = ShmTransmitter(LED_COUNT, LED_BACKEND, cpu=int(TRANSMITTER_CPU) if TRANSMITTER_CPU else None,
+                                    pin=LED_PIN, full_refresh=FULL_REFRESH, keep_alive=KEEP_ALIVE).start()
+    else:
+        led_output = create_backend(LED_COUNT, LED_BACKEND, pin=LED_PIN,
+                                    full_refresh=FULL_REFRESH, keep_alive=KEEP_ALIVE)
 except Exception as e:
-    print(f"❌ GPIO Error: {e}")
-    print("🔄 Trying alternative GPIO initialization...")
-    time.sleep(1)
-    try:
-        led_output = gpiozero.OutputDevice(LED_PIN)
-    except Exception as e2:
-        print(f"❌ Still can't access GPIO pin {LED_PIN}: {e2}")
+    print(f"❌ Can't open LED backend '{LED_BACKEND}': {e}")
+    if LED_BACKEND == "gpio":
         print("💡 Try running: sudo killall python3 && sudo systemctl restart pigpiod")
-        exit(1)
-leds = [(0, 0, 0)] * LED_COUNT
-previous_leds = [(0, 0, 0)] * LED_COUNT  # For smooth transitions
+    exit(1)
+led_output.set_correction(BRIGHTNESS, GAMMA, WHITE_BALANCE)
+if FRAME_POLICY not in ("off", "process"):
+    # Senden im eigenen Thread: langsames Bit-Banging bremst weder Audio noch Rendern
+    led_output = FramePipeline(led_output, policy=FRAME_POLICY).start()
+leds = FrameBuffer(LED_COUNT)
+previous_leds = FrameBuffer(LED_COUNT)  # Smoothed frame last sent to the strip
+frame_cache = FrameCache(FRAME_CACHE_MB * 1_000_000) if FRAME_CACHE_MB else None  # reactive_rainbow frames per (phase, brightness)
+visuals = MusicVisualizers(LED_COUNT, cache=frame_cache)  # Whole-strip renderers (keep their own scratch + history)
+smoother = TemporalSmoother(LED_COUNT)  # Per-pixel attack / decay, one pass per frame
+smoothing_mode = None  # Mode the smoother factors were last configured for
 
-# Timing für WS2812B (gleich wie party_mode.py)
-T1H_NS = 800
-T1L_NS = 400
-T0H_NS = 400
-T0L_NS = 800
-RESET_NS = 50000
+# One layer per mode (only the current one is visible, two while crossfading) + beat overlay on top
+MODES = ["spectrum", "energy_wave", "bass_pulse", "reactive_rainbow", "beat_flash", "strobe"]
+compositor = Compositor(LED_COUNT)
+for mode in MODES:
+    compositor.add_layer(mode, opacity=1.0 if mode == "spectrum" else 0.0)
+compositor.add_layer("beat_overlay", blend="add", opacity=BEAT_OVERLAY)
 
 # Music visualization state
 current_mode = "spectrum"
 beat_intensity = 0
 bass_level = 0
-energy_history = []
 beat_flash_time = 0
 led_update_rate = 30  # Target FPS for smooth animations
-last_led_update = 0
+frame_clock = FrameScheduler(led_update_rate)  # Frame deadlines on the monotonic clock; t drives the animations
 shutdown_requested = False
 
-def precise_delay_ns(nanoseconds):
-    if nanoseconds < 10000:
-        start = time.perf_counter_ns()
-        while (time.perf_counter_ns() - start) < nanoseconds:
-            pass
-    else:
-        time.sleep(nanoseconds / 1_000_000_000)
+# Beat prediction (flux detector): flash this early to cancel audio + render + transmit latency
+BEAT_DETECTOR_MODE = "flux"  # "energy" oder "flux"
+# 2048-sample window, new beat decision every 256 samples (~6 ms)
+DETECTOR_CONFIG = dict(sample_rate=44100, chunk_size=256, window_size=2048, hop_size=256,
+                       detector_mode=BEAT_DETECTOR_MODE)
+BEAT_LEAD_TIME = 0.04
+MIN_TEMPO_CONFIDENCE = 0.3
+BEAT_MATCH_WINDOW = 0.15  # Sekunden: erkannter Beat so kurz nach dem vorhergesagten Blitz = derselbe Beat
+predicted_beat_time = 0
+predicted_flash_time = 0  # When the last predicted flash fired
+tempo_confidence = 0.0
 
-def send_bit(bit):
-    if bit:
-        led_output.on()
-        precise_delay_ns(T1H_NS)
-        led_output.off()
-        precise_delay_ns(T1L_NS)
-    else:
-        led_output.on()
-        precise_delay_ns(T0H_NS)
-        led_output.off()
-        precise_delay_ns(T0L_NS)
-
-def send_byte(byte):
-    for bit in range(7, -1, -1):
-        send_bit(byte & (1 << bit))
+# Per-band beat streams: last band that fired picks the flash color
+BAND_FLASH_INDEX = {"low": 0, "mid": 1, "high": 3}  # Index into beat_flash colors
+last_band_beat = None
+last_band_beat_time = 0
 
 def send_to_strip():
-    global shutdown_requested, previous_leds
+    global shutdown_requested, smoothing_mode
     if shutdown_requested or not led_output:
         return
     
     try:
-        # Store current state for next smoothing
-        previous_leds = leds.copy()
-        
-        led_output.off()
-        precise_delay_ns(RESET_NS)
+        # Attack / decay per mode, switched together with the mode
+        if smoothing_mode != current_mode:
+            visuals.configure_smoothing(smoother, current_mode)
+            smoothing_mode = current_mode
         
-        for r, g, b in leds:
-            if shutdown_requested:
-                return
-            r = int(r * BRIGHTNESS)
-            g = int(g * BRIGHTNESS)
-            b = int(b * BRIGHTNESS)
-            send_byte(g)
-            send_byte(r)
-            send_byte(b)
+        # Raw target in leds -> smoothed frame in previous_leds
+        smoother.apply(leds.view(), previous_leds.view())
         
-        led_output.off()
-        precise_delay_ns(RESET_NS)
+        # Helligkeit + Gamma stecken in den Encoder-Tabellen (neu gebaut nur wenn BRIGHTNESS sich ändert)
+        led_output.set_brightness(BRIGHTNESS)
+        led_output.show(previous_leds.view())
     except Exception as e:
         if not shutdown_requested:
             print(f"Strip send error: {e}")
 
+def print_output_stats():
+    """Frames rendered vs. actually sent (identical frames are skipped by the output)"""
+    stats = led_output.stats()
+    print(f"📊 {stats['frames_rendered']} Frames gerendert, {stats['frames_sent']} gesendet, "
+          f"{stats['frames_deduped']} unverändert übersprungen")
+    if frame_cache is not None:
+        print(f"🗃️ {frame_cache.summary()}")
+
 def clear():
-    global leds
-    leds = [(0, 0, 0)] * LED_COUNT
+    leds.clear()
+    smoother.reset()  # Straight to black, no fade
     send_to_strip()
 
-def set_pixel(index, r, g, b, smooth_factor=0.7):
-    """Set pixel with optional smoothing"""
+def set_pixel(index, r, g, b, smooth_factor=None):
+    """Set a pixel's target color; smooth_factor overrides its attack / decay in the smoother"""
     if 0 <= index < LED_COUNT:
-        # Apply smoothing by blending with previous value
-        if smooth_factor < 1.0:
-            old_r, old_g, old_b = previous_leds[index]
-            r = int(old_r * (1 - smooth_factor) + r * smooth_factor)
-            g = int(old_g * (1 - smooth_factor) + g * smooth_factor)
-            b = int(old_b * (1 - smooth_factor) + b * smooth_factor)
+        # Blending with the previous frame happens for the whole strip in send_to_strip()
+        if smooth_factor is not None:
+            smoother.set_factors(smooth_factor, start=index, end=index + 1)
         
         leds[index] = (max(0, min(255, r)), max(0, min(255, g)), max(0, min(255, b)))
 
-def hsv_to_rgb(h, s, v):
-    """HSV zu RGB - für geile Farben"""
-    h = h % 360
-    c = v * s
-    x = c * (1 - abs((h / 60) % 2 - 1))
-    m = v - c
-    
-    if h < 60:
-        r, g, b = c, x, 0
-    elif h < 120:
-        r, g, b = x, c, 0
-    elif h < 180:
-        r, g, b = 0, c, x
-    elif h < 240:
-        r, g, b = 0, x, c
-    elif h < 300:
-        r, g, b = x, 0, c
-    else:
-        r, g, b = c, 0, x
-    
-    return int((r + m) * 255), int((g + m) * 255), int((b + m) * 255)
-
 # 🎵 MUSIC REACTIVE EFFECTS
 
-def spectrum_analyzer(freq_bands, volume):
+def spectrum_analyzer(out, freq_bands, volume):
     """Frequency spectrum analyzer visualization with smooth transitions"""
-    # Don't clear - let smoothing handle the fade
-    
-    # Map frequency bands to LED sections
-    band_size = LED_COUNT // 4
-    
-    # Clear all pixels with fade
-    for i in range(LED_COUNT):
-        set_pixel(i, 0, 0, 0, smooth_factor=0.3)  # Slower fade out
-    
-    for band_idx, energy in enumerate(freq_bands):
-        start_led = band_idx * band_size
-        end_led = min((band_idx + 1) * band_size, LED_COUNT)
-        
-        # Scale energy to LED height with better sensitivity
-        energy_scaled = min(1.0, energy * 30)  # Reduced sensitivity for smoother motion
-        leds_to_light = int(energy_scaled * band_size)
-        
-        # Enhanced colors for each band
-        colors = [
-            (255, 50, 50),   # Bass - Bright Red
-            (255, 150, 0),   # Low-mid - Orange
-            (50, 255, 50),   # High-mid - Bright Green
-            (100, 100, 255)  # Treble - Bright Blue
-        ]
-        
-        # Light up LEDs for this band with smooth transitions
-        for i in range(band_size):
-            led_pos = start_led + i
-            
-            if i < leds_to_light:
-                # Intensity decreases from bottom to top
-                intensity = 1.0 - (i / band_size) * 0.7  # Less dramatic fade
-                r, g, b = colors[band_idx]
-                set_pixel(led_pos, int(r * intensity), int(g * intensity), int(b * intensity), smooth_factor=0.6)
-            else:
-                # Fade out unused LEDs
-                set_pixel(led_pos, 0, 0, 0, smooth_factor=0.2)
+    # Four bands side by side, lit bars rise fast and unlit LEDs fade slowly
+    visuals.spectrum_analyzer(out, freq_bands, volume)
 
 def beat_flash(energy, volume, freq_bands):
     """Flash effect on beat detection"""
@@ -207,8 +162,11 @@ def beat_flash(energy, volume, freq_bands):
     beat_flash_time = time.time()
     beat_intensity = min(1.0, energy * 20)  # Scale beat intensity
     
-    # Random flash color based on dominant frequency
-    max_band = np.argmax(freq_bands)
+    # Flash color from the band whose beat stream just fired, else dominant frequency
+    if last_band_beat and beat_flash_time - last_band_beat_time < 0.15:
+        max_band = BAND_FLASH_INDEX[last_band_beat]
+    else:
+        max_band = np.argmax(freq_bands)
     flash_colors = [
         (255, 0, 0),    # Bass - Red
         (255, 255, 0),  # Low-mid - Yellow
@@ -216,42 +174,19 @@ def beat_flash(energy, volume, freq_bands):
         (255, 0, 255)   # Treble - Magenta
     ]
     
-    # Flash entire strip with beat color
+    # Flash entire strip with beat color (flash mode layer and/or overlay)
     flash_color = flash_colors[max_band]
-    flash_brightness = beat_intensity
-    
-    for i in range(LED_COUNT):
-        r, g, b = flash_color
-        set_pixel(i, int(r * flash_brightness), int(g * flash_brightness), int(b * flash_brightness))
+    if current_mode in ("beat_flash", "strobe"):
+        visuals.beat_flash(compositor[current_mode].view(), flash_color, beat_intensity)
+    if BEAT_OVERLAY > 0:
+        visuals.beat_flash(compositor["beat_overlay"].view(), flash_color, beat_intensity)
 
-def energy_wave(freq_bands, volume):
+def energy_wave(out, freq_bands, volume):
     """Moving wave based on energy levels with smooth motion"""
-    global energy_history
-    
-    # Add current energy to history
-    total_energy = sum(freq_bands)
-    energy_history.append(total_energy)
-    if len(energy_history) > LED_COUNT:
-        energy_history.pop(0)
-    
-    # Clear with fade
-    for i in range(LED_COUNT):
-        set_pixel(i, 0, 0, 0, smooth_factor=0.1)
-    
-    # Create wave effect with smoother motion
-    for i in range(min(len(energy_history), LED_COUNT)):
-        energy_val = energy_history[i] if i < len(energy_history) else 0
-        
-        # Scale energy to color intensity
-        intensity = min(1.0, energy_val * 80)  # Adjusted sensitivity
-        
-        # Create color based on position and energy with slower movement
-        hue = (i * 3 + time.time() * 30) % 360  # Slower color cycling
-        r, g, b = hsv_to_rgb(hue, 0.9, intensity)
-        
-        set_pixel(LED_COUNT - 1 - i, r, g, b, smooth_factor=0.7)
+    # History of total energy scrolls along the strip, hue cycles slowly over time
+    visuals.energy_wave(out, freq_bands, volume, frame_clock.t)
 
-def bass_pulse(freq_bands, volume):
+def bass_pulse(out, freq_bands, volume):
     """Pulse effect focused on bass frequencies"""
     global bass_level
     
@@ -259,54 +194,38 @@ def bass_pulse(freq_bands, volume):
     bass_energy = freq_bands[0] if freq_bands else 0
     bass_level = bass_energy * 50  # Scale sensitivity
     
-    # Create expanding circle from center
-    center = LED_COUNT // 2
-    max_radius = min(center, int(bass_level * center))
-    
-    for i in range(LED_COUNT):
-        distance_from_center = abs(i - center)
-        
-        if distance_from_center <= max_radius:
-            # Intensity decreases with distance
-            intensity = 1.0 - (distance_from_center / max_radius)
-            
-            # Color based on bass intensity
-            r = int(255 * intensity)
-            g = int(50 * intensity)
-            b = int(150 * intensity)
-            
-            set_pixel(i, r, g, b)
-        else:
-            set_pixel(i, 0, 0, 0)
+    # Expanding circle from center, intensity decreases with distance
+    visuals.bass_pulse(out, freq_bands, volume)
 
-def reactive_rainbow(freq_bands, volume):
+def reactive_rainbow(out, freq_bands, volume):
     """Rainbow effect that reacts to music with smooth motion"""
-    # Rainbow speed based on volume but more controlled
-    speed = 50 + (volume * 100)  # Base speed + volume boost
-    
-    for i in range(LED_COUNT):
-        # Hue based on position and time, speed influenced by volume
-        hue = (i * 2 + time.time() * speed) % 360
-        
-        # Saturation and brightness based on frequency bands
-        total_energy = sum(freq_bands) if freq_bands else 0
-        brightness = 0.4 + (total_energy * 15)  # Minimum brightness + energy boost
-        brightness = min(1.0, brightness)
-        
-        r, g, b = hsv_to_rgb(hue, 0.9, brightness)
-        set_pixel(i, r, g, b, smooth_factor=0.8)  # Very smooth transitions
+    # Speed follows volume, brightness follows total band energy
+    visuals.reactive_rainbow(out, freq_bands, volume, frame_clock.t)
 
-def strobe_beat(freq_bands, volume):
+def strobe_beat(out, freq_bands, volume):
     """Strobe effect synchronized with beats"""
     # Only light up on recent beat
     current_time = time.time()
     if current_time - beat_flash_time < 0.1:  # 100ms strobe duration
         # White strobe with intensity based on beat
         intensity = int(255 * beat_intensity)
-        for i in range(LED_COUNT):
-            set_pixel(i, intensity, intensity, intensity)
+        visuals.strobe(out, intensity)
     else:
-        clear()
+        out.fill(0)
+
+def beat_overlay(out, freq_bands, volume):
+    """Beat flash on top of every mode, fading out between beats"""
+    compositor["beat_overlay"].buffer.fade_by(BEAT_OVERLAY_FADE)
+
+# Renderer per layer; beat_flash is only drawn on beats (see beat_flash())
+LAYER_RENDERERS = {
+    "spectrum": spectrum_analyzer,
+    "energy_wave": energy_wave,
+    "bass_pulse": bass_pulse,
+    "reactive_rainbow": reactive_rainbow,
+    "strobe": strobe_beat,
+    "beat_overlay": beat_overlay,
+}
 
 # Audio callback functions
 def on_beat(energy, volume, freq_bands):
@@ -315,25 +234,42 @@ def on_beat(energy, volume, freq_bands):
     
     print(f"🥁 BEAT! Mode: {current_mode}, Energy: {energy:.3f}")
     
-    if current_mode == "beat_flash":
-        beat_flash(energy, volume, freq_bands)
-    elif current_mode == "strobe":
+    # With a confident tempo the predicted flash covers the beat; flash reactively only without one
+    if tempo_confidence >= MIN_TEMPO_CONFIDENCE:
+        return
+    if time.time() - predicted_flash_time < BEAT_MATCH_WINDOW:
+        return
+    if current_mode in ("beat_flash", "strobe") or BEAT_OVERLAY > 0:
         beat_flash(energy, volume, freq_bands)
 
+def on_band_beat(band):
+    """Create a callback that remembers which band (low / mid / high) just hit"""
+    def callback(band_energy, volume, freq_bands):
+        global last_band_beat, last_band_beat_time
+        last_band_beat = band
+        last_band_beat_time = time.time()
+    return callback
+
+def on_tempo(bpm, confidence, next_beat_time):
+    """Called with the tempo estimate and predicted next beat on every beat"""
+    global predicted_beat_time, tempo_confidence
+    
+    tempo_confidence = confidence
+    if confidence >= MIN_TEMPO_CONFIDENCE:
+        predicted_beat_time = next_beat_time
+
 def on_audio_frame(energy, volume, freq_bands, beat_detected):
     """Called for every audio frame with frame rate limiting"""
-    global current_mode, last_led_update, shutdown_requested
+    global current_mode, shutdown_requested, predicted_beat_time, predicted_flash_time
     
     if shutdown_requested:
         return
     
-    current_time = time.time()
-    
-    # Frame rate limiting for smoother LED updates
-    if current_time - last_led_update < (1.0 / led_update_rate):
+    # Frame rate limiting: only render once the next frame deadline has passed
+    if not frame_clock.due():
         return
     
-    last_led_update = current_time
+    current_time = time.time()
     
     # Live volume display (update every ~100ms for more responsive feedback)
     if hasattr(on_audio_frame, 'last_display_time'):
@@ -344,17 +280,21 @@ def on_audio_frame(energy, volume, freq_bands, beat_detected):
         on_audio_frame.last_display_time = current_time
     
     try:
-        if current_mode == "spectrum":
-            spectrum_analyzer(freq_bands, volume)
-        elif current_mode == "energy_wave":
-            energy_wave(freq_bands, volume)
-        elif current_mode == "bass_pulse":
-            bass_pulse(freq_bands, volume)
-        elif current_mode == "reactive_rainbow":
-            reactive_rainbow(freq_bands, volume)
-        elif current_mode == "strobe" and not beat_detected:
-            # Keep strobe dark between beats
-            strobe_beat(freq_bands, volume)
+        # Fire the flash ahead of the predicted beat so it lands on the kick
+        if predicted_beat_time and current_time >= predicted_beat_time - BEAT_LEAD_TIME:
+            predicted_beat_time = 0
+            predicted_flash_time = current_time
+            if current_mode in ("beat_flash", "strobe") or BEAT_OVERLAY > 0:
+                beat_flash(energy, volume, freq_bands)
+        
+        # Render every visible layer (two while crossfading), then blend them into leds
+        for layer in compositor.visible_layers(current_time):
+            render = LAYER_RENDERERS.get(layer.name)
+            if layer.name == "strobe" and beat_detected:
+                continue  # Beat frame keeps the colored flash
+            if render:
+                render(layer.view(), freq_bands, volume)
+        compositor.compose(leds.view(), now=current_time)
         
         # Update LEDs safely
         if led_output and not shutdown_requested:
@@ -429,9 +369,13 @@ def cycle_mode():
     """Cycle through different visualization modes"""
     global current_mode
     
-    modes = ["spectrum", "energy_wave", "bass_pulse", "reactive_rainbow", "beat_flash", "strobe"]
-    current_index = modes.index(current_mode)
-    current_mode = modes[(current_index + 1) % len(modes)]
+    previous_mode = current_mode
+    current_index = MODES.index(current_mode)
+    current_mode = MODES[(current_index + 1) % len(MODES)]
+    
+    # Crossfade instead of a hard cut; beat_flash starts dark until the next beat
+    compositor[current_mode].buffer.clear()
+    compositor.crossfade(previous_mode, current_mode, MODE_CROSSFADE)
     
     print(f"🎛️ Switched to mode: {current_mode}")
 
@@ -456,9 +400,12 @@ def main():
     print("Drücke Enter zum Wechseln der Modi\n")
     
     # Initialize beat detector
-    detector = BeatDetector(sample_rate=44100, chunk_size=1024)
+    detector = BeatDetector(**DETECTOR_CONFIG)
     detector.add_beat_callback(on_beat)
     detector.add_audio_callback(on_audio_frame)
+    detector.add_tempo_callback(on_tempo)
+    for band in BAND_FLASH_INDEX:
+        detector.add_band_beat_callback(band, on_band_beat(band))
     
     # Ask user for audio mode preference
     print("\n🎵 Audio Modus wählen:")
@@ -470,7 +417,9 @@ def main():
     import select
     
     # Check if we're running interactively
-    if sys.stdin.isatty():
+    if AUDIO_SOURCE:
+        choice = "1"  # Explicit source from the environment - no prompt
+    elif sys.stdin.isatty():
         print("\nWähle (1/2/3) oder drücke Enter für Demo-Modus: ", end="", flush=True)
         # Non-blocking input with timeout
         if select.select([sys.stdin], [], [], 3.0) == ([sys.stdin], [], []):
@@ -483,7 +432,8 @@ def main():
     # Start appropriate mode
     if choice == "1":
         print("🎤 Starte Mikrofon-Modus...")
-        if not detector.start():
+        source = create_source(AUDIO_SOURCE, 44100, 256) if AUDIO_SOURCE else None
+        if not detector.start(source=source):
             print("❌ Mikrofon fehlgeschlagen - wechsle zu Demo-Modus")
             if not detector.start(demo_mode=True):
                 print("❌ Fehler beim Starten des Audio-Detektors!")
@@ -534,7 +484,8 @@ def main():
             detector.stop()
             time.sleep(0.2)  # Allow audio callbacks to finish
             clear()
-            cleanup_gpio()
+            print_output_stats()
+            cleanup_output()
             
             # Wait for mode thread to finish
             if 'mode_thread' in locals() and mode_thread.is_alive():
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+
+# 🎼 OFFLINE ANALYSE - WAV/PCM SCHNELLER ALS ECHTZEIT ZUR BEAT-MAP! 🎼
+
+import argparse
+import time
+import wave
+import numpy as np
+from spectral import SpectralEngine
+from onset import TempoTracker, FLUX_COMPRESSION, FLUX_THRESHOLD_K, FLUX_THRESHOLD_SECONDS
+
+# Same defaults as BeatDetector
+FREQ_RANGES = [(60, 250), (250, 500), (500, 2000), (2000, 8000)]
+BEAT_THRESHOLD = 1.3
+MIN_BEAT_INTERVAL = 0.15
+ENERGY_HISTORY_CHUNKS = 20
+BLOCK_FRAMES = 1024  # Frames per batched FFT (keeps memory bounded)
+
+
+def load_wav(path):
+    """Read a WAV file as mono float32 in [-1, 1]; returns (samples, sample_rate)"""
+    with wave.open(path, "rb") as wav:
+        sample_rate = wav.getframerate()
+        channels = wav.getnchannels()
+        width = wav.getsampwidth()
+        raw = wav.readframes(wav.getnframes())
+
+    if width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128.0
+    elif width == 2:
+        samples = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    elif width == 4:
+        samples = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {width * 8} bit")
+
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    return samples, sample_rate
+
+
+def load_pcm(path, channels=1):
+    """Read raw signed 16-bit little-endian PCM as mono float32"""
+    data = np.fromfile(path, dtype="<i2").astype(np.float32) / 32768.0
+    if channels > 1:
+        data = data[:len(data) - len(data) % channels].reshape(-1, channels).mean(axis=1)
+    return data
+
+
+def _rolling_previous_mean(values, history):
+    """Mean of up to history-1 previous values per frame (like the live deque check)"""
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    index = np.arange(len(values))
+    start = np.maximum(0, index - (history - 1))
+    count = np.maximum(index - start, 1)
+    return (cumulative[index] - cumulative[start]) / count
+
+
+def _rolling_mean_std(values, history):
+    """Mean and std over the last history values including the current one"""
+    cumulative = np.concatenate(([0.0], np.cumsum(values)))
+    squares = np.concatenate(([0.0], np.cumsum(values * values)))
+    index = np.arange(1, len(values) + 1)
+    start = np.maximum(0, index - history)
+    count = index - start
+    mean = (cumulative[index] - cumulative[start]) / count
+    variance = (squares[index] - squares[start]) / count - mean * mean
+    return mean, np.sqrt(np.maximum(variance, 0))
+
+
+def _apply_refractory(candidates, times, min_interval):
+    """Keep candidate frames that are at least min_interval after the previous beat"""
+    beats = np.zeros(len(candidates), dtype=bool)
+    last_time = -np.inf
+    for frame in np.flatnonzero(candidates):
+        if times[frame] - last_time >= min_interval:
+            beats[frame] = True
+            last_time = times[frame]
+    return beats
+
+
+def analyze(samples, sample_rate, window_size=2048, hop_size=None, mode="energy",
+            freq_ranges=FREQ_RANGES):
+    """Run the BeatDetector feature pipeline over a whole track in batched form"""
+    hop_size = hop_size or window_size
+    if len(samples) < window_size:
+        raise ValueError("Track is shorter than one analysis window")
+
+    frames = np.lib.stride_tricks.sliding_window_view(samples, window_size)[::hop_size]
+    frame_count = len(frames)
+    frame_rate = sample_rate / hop_size
+    times = (np.arange(frame_count) * hop_size + window_size) / sample_rate
+
+    engine = SpectralEngine(freq_ranges, sample_rate, window_size)
+    edges = engine.band_edges
+    band_widths = np.maximum(edges[:, 1] - edges[:, 0], 1)
+
+    energy = np.empty(frame_count)
+    bands = np.empty((frame_count, len(freq_ranges)))
+    flux_strength = np.zeros(frame_count)
+    previous_log = None
+
+    for start in range(0, frame_count, BLOCK_FRAMES):
+        block = frames[start:start + BLOCK_FRAMES]
+        energy[start:start + len(block)] = np.einsum("ij,ij->i", block, block)
+
+        power = engine.power_spectrum(block)
+        bands[start:start + len(block)] = engine.bands_from_power(power)
+
+        # Spectral flux across frame boundaries, carried between blocks
+        log_power = np.log1p(FLUX_COMPRESSION * power)
+        if previous_log is None:
+            previous_log = log_power[:1]
+        flux = np.diff(np.concatenate((previous_log, log_power)), axis=0)
+        np.maximum(flux, 0, out=flux)
+        flux_strength[start:start + len(block)] = (engine.bands_from_power(flux) / band_widths).sum(axis=1)
+        previous_log = log_power[-1:]
+
+    volume = np.sqrt(energy / window_size)
+
+    if mode == "flux":
+        # Frame 0 has no previous spectrum: the live detector never adds it to its history
+        history = max(8, int(FLUX_THRESHOLD_SECONDS * frame_rate))
+        strength = flux_strength[1:]
+        mean, std = _rolling_mean_std(strength, history)
+        warm = np.arange(1, frame_count) >= history // 2
+        candidates = np.zeros(frame_count, dtype=bool)
+        candidates[1:] = warm & (strength > mean + FLUX_THRESHOLD_K * std)
+    else:
+        history = ENERGY_HISTORY_CHUNKS * window_size // hop_size
+        average = _rolling_previous_mean(energy, history)
+        warm = np.arange(1, frame_count + 1) >= history // 2
+        candidates = warm & (energy > average * BEAT_THRESHOLD) & (average > 0.001)
+
+    beats = _apply_refractory(candidates, times, MIN_BEAT_INTERVAL)
+
+    # Tempo curve from the onset-strength envelope (same tracker as live)
+    tracker = TempoTracker(frame_rate)
+    tempo_bpm = np.empty(frame_count)
+    tempo_confidence = np.empty(frame_count)
+    for frame in range(frame_count):
+        tracker.add_strength(flux_strength[frame], times[frame])
+        tempo_bpm[frame] = tracker.bpm
+        tempo_confidence[frame] = tracker.confidence
+
+    return {
+        "sample_rate": np.int32(sample_rate),
+        "window_size": np.int32(window_size),
+        "hop_size": np.int32(hop_size),
+        "mode": np.array(mode),
+        "freq_ranges": np.asarray(freq_ranges, dtype=np.float32),
+        "times": times.astype(np.float32),
+        "energy": energy.astype(np.float32),
+        "volume": volume.astype(np.float32),
+        "freq_bands": bands.astype(np.float32),
+        "onset_strength": flux_strength.astype(np.float32),
+        "beat": beats,
+        "tempo_bpm": tempo_bpm.astype(np.float32),
+        "tempo_confidence": tempo_confidence.astype(np.float32),
+    }
+
+
+def save_beat_map(path, beat_map):
+    """Write a compact compressed beat map (.npz)"""
+    np.savez_compressed(path, **beat_map)
+
+
+def load_beat_map(path):
+    """Load a beat map written by save_beat_map as a dict of arrays"""
+    with np.load(path) as data:
+        return {key: data[key] for key in data.files}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyze a WAV/PCM file into a beat map")
+    parser.add_argument("input", help="WAV file, or raw s16le PCM with --raw")
+    parser.add_argument("-o", "--output", help="Beat map output (.npz)")
+    parser.add_argument("--raw", action="store_true", help="Input is raw signed 16-bit PCM")
+    parser.add_argument("--rate", type=int, default=44100, help="Sample rate for --raw input")
+    parser.add_argument("--channels", type=int, default=1, help="Channels for --raw input")
+    parser.add_argument("--window", type=int, default=2048, help="Analysis window in samples")
+    parser.add_argument("--hop", type=int, default=None, help="Hop size in samples (default: window)")
+    parser.add_argument("--mode", choices=("energy", "flux"), default="energy", help="Beat detector")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.raw:
+        samples, sample_rate = load_pcm(args.input, args.channels), args.rate
+    else:
+        samples, sample_rate = load_wav(args.input)
+    beat_map = analyze(samples, sample_rate, args.window, args.hop, args.mode)
+    elapsed = time.perf_counter() - start
+
+    duration = len(samples) / sample_rate
+    beats = int(beat_map["beat"].sum())
+    print(f"🎼 {args.input}: {duration:.1f} s audio in {elapsed:.2f} s ({duration / elapsed:.0f}x realtime)")
+    print(f"   Frames: {len(beat_map['times'])}, Beats: {beats}, Tempo: {beat_map['tempo_bpm'][-1]:.1f} BPM "
+          f"(confidence {beat_map['tempo_confidence'][-1]:.2f})")
+
+    if args.output:
+        save_beat_map(args.output, beat_map)
+        print(f"💾 Beat map written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+
+# 🥁 ONSET DETECTION - SPECTRAL FLUX, TEMPO UND BEAT-VORHERSAGE! 🥁
+
+from collections import deque
+import numpy as np
+
+# Defaults shared by the live detector and the offline analysis
+FLUX_COMPRESSION = 1000.0
+FLUX_THRESHOLD_K = 1.5
+FLUX_THRESHOLD_SECONDS = 1.0
+
+
+class SpectralFluxDetector:
+    """Per-band spectral flux onsets with an adaptive threshold"""
+
+    def __init__(self, spectrum, frame_rate, threshold_seconds=FLUX_THRESHOLD_SECONDS,
+                 threshold_k=FLUX_THRESHOLD_K, min_interval=0.15, compression=FLUX_COMPRESSION):
+        self.spectrum = spectrum        # SpectralEngine providing power spectrum + band edges
+        self.frame_rate = frame_rate    # Analysis frames (hops) per second
+        self.threshold_k = threshold_k  # Std deviations above the local mean
+        self.min_interval = min_interval
+        self.compression = compression  # Log compression, makes flux work on quiet/compressed mixes
+
+        self.history = deque(maxlen=max(8, int(threshold_seconds * frame_rate)))
+        self.previous = None
+        self.band_flux = np.zeros(len(spectrum.freq_ranges))
+        self.strength = 0.0
+        self.last_onset_time = 0
+
+    def process(self, power, timestamp):
+        """Feed one power spectrum; returns True on an onset"""
+        log_power = np.log1p(self.compression * power)
+        if self.previous is None or len(self.previous) != len(log_power):
+            self.previous = log_power
+            return False
+
+        # Only rising energy counts (half-wave rectified difference)
+        flux = log_power - self.previous
+        np.maximum(flux, 0, out=flux)
+        self.previous = log_power
+
+        # Mean flux per band, so wide treble bands don't drown out the bass
+        edges = self.spectrum.band_edges
+        self.band_flux = self.spectrum.bands_from_power(flux) / np.maximum(edges[:, 1] - edges[:, 0], 1)
+        self.strength = float(np.sum(self.band_flux))
+        self.history.append(self.strength)
+
+        if len(self.history) < self.history.maxlen // 2:
+            return False
+
+        recent = np.fromiter(self.history, dtype=np.float64, count=len(self.history))
+        threshold = recent.mean() + self.threshold_k * recent.std()
+
+        if self.strength > threshold and timestamp - self.last_onset_time >= self.min_interval:
+            self.last_onset_time = timestamp
+            return True
+        return False
+
+
+class TempoTracker:
+    """Online tempo (BPM + confidence) from onset strength, with next-beat prediction"""
+
+    def __init__(self, frame_rate, window_seconds=6.0, min_bpm=60, max_bpm=200,
+                 prior_bpm=120, update_interval=0.5):
+        self.frame_rate = frame_rate
+        self.min_bpm = min_bpm
+        self.max_bpm = max_bpm
+        self.prior_bpm = prior_bpm
+        self.update_interval = update_interval
+
+        self.envelope = deque(maxlen=int(window_seconds * frame_rate))
+        self.bpm = 0.0
+        self.confidence = 0.0
+        self.period = 0.0
+        self.last_beat_time = 0.0
+        self.next_beat_time = 0.0
+        self._last_update = 0.0
+
+    def add_strength(self, strength, timestamp):
+        """Add one onset-strength sample; re-estimate tempo now and then"""
+        self.envelope.append(strength)
+        if timestamp - self._last_update >= self.update_interval and \
+                len(self.envelope) == self.envelope.maxlen:
+            self._last_update = timestamp
+            self._estimate_tempo()
+
+    def _estimate_tempo(self):
+        envelope = np.fromiter(self.envelope, dtype=np.float64, count=len(self.envelope))
+        envelope -= envelope.mean()
+
+        # Autocorrelation via FFT (zero padded to avoid wrap-around)
+        size = 1 << (2 * len(envelope) - 1).bit_length()
+        spectrum = np.fft.rfft(envelope, size)
+        autocorr = np.fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, size)[:len(envelope)]
+        if autocorr[0] <= 0:
+            return
+
+        min_lag = max(1, int(self.frame_rate * 60 / self.max_bpm))
+        max_lag = min(len(autocorr) - 1, int(self.frame_rate * 60 / self.min_bpm))
+        lags = np.arange(min_lag, max_lag + 1)
+
+        # Log-Gaussian preference around prior_bpm keeps us off double/half tempo
+        bpms = 60 * self.frame_rate / lags
+        weights = np.exp(-0.5 * (np.log2(bpms / self.prior_bpm) / 0.9) ** 2)
+        scores = autocorr[lags] * weights
+
+        best = int(np.argmax(scores))
+        self.period = lags[best] / self.frame_rate
+        self.bpm = 60.0 / self.period
+        self.confidence = float(max(0.0, autocorr[lags[best]] / autocorr[0]))
+
+    def on_onset(self, timestamp):
+        """Align beat phase to an onset that lands near the predicted beat"""
+        if self.period <= 0:
+            self.last_beat_time = timestamp
+            return
+
+        expected = self.next_beat_time
+        if not expected or abs(timestamp - expected) < 0.25 * self.period or \
+                timestamp - self.last_beat_time > 1.5 * self.period:
+            self.last_beat_time = timestamp
+            self.next_beat_time = timestamp + self.period
+
+    def predict_next_beat(self, now):
+        """Time of the next expected beat (0 if no tempo yet)"""
+        if self.period <= 0 or not self.last_beat_time:
+            return 0.0
+        if self.next_beat_time <= now:
+            missed = int((now - self.last_beat_time) / self.period)
+            self.next_beat_time = self.last_beat_time + (missed + 1) * self.period
+        return self.next_beat_time
+
+
+class BandOnsetTracker:
+    """Independent beat streams per band group (e.g. kick / snare / hi-hat), one vectorized pass"""
+
+    def __init__(self, band_groups, history=20, threshold=1.3, min_interval=0.15, min_energy=0.001):
+        # band_groups: {"low": [0], "mid": [1, 2], "high": [3]} - indices into freq_bands
+        self.names = list(band_groups)
+        self.group_count = len(self.names)
+        band_count = max(max(indices) for indices in band_groups.values()) + 1
+
+        # Grouping matrix: group energies = matrix @ freq_bands
+        self.matrix = np.zeros((self.group_count, band_count))
+        for row, name in enumerate(self.names):
+            self.matrix[row, band_groups[name]] = 1.0
+
+        self.threshold = np.full(self.group_count, threshold, dtype=np.float64)
+        self.min_interval = np.full(self.group_count, min_interval, dtype=np.float64)
+        self.min_energy = min_energy
+        self.last_onset_time = np.zeros(self.group_count)
+        self.energies = np.zeros(self.group_count)
+        self.resize_history(history)
+
+    def resize_history(self, history):
+        """Change how many frames the adaptive average spans"""
+        self.history = np.zeros((self.group_count, history))
+        self.filled = 0
+        self.position = 0
+
+    def set_threshold(self, name, threshold=None, min_interval=None):
+        """Tune one band's spike threshold and refractory time"""
+        row = self.names.index(name)
+        if threshold is not None:
+            self.threshold[row] = threshold
+        if min_interval is not None:
+            self.min_interval[row] = min_interval
+
+    def process(self, freq_bands, timestamp):
+        """Feed one frame of band energies; returns the names of bands with an onset"""
+        self.energies = self.matrix @ np.asarray(freq_bands, dtype=np.float64)[:self.matrix.shape[1]]
+        history_length = self.history.shape[1]
+
+        fired = np.zeros(self.group_count, dtype=bool)
+        if self.filled >= history_length // 2:
+            # Average of previous frames only (current one not yet stored)
+            average = self.history[:, :self.filled].mean(axis=1)
+            fired = (self.energies > average * self.threshold) & (average > self.min_energy) & \
+                    (timestamp - self.last_onset_time >= self.min_interval)
+            self.last_onset_time[fired] = timestamp
+
+        self.history[:, self.position] = self.energies
+        self.position = (self.position + 1) % history_length
+        self.filled = min(self.filled + 1, history_length)
+
+        return [self.names[row] for row in np.flatnonzero(fired)]
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+
+# ✨ PARTICLES - TROPFEN, RAKETEN UND FUNKEN ALS STRUCT-OF-ARRAYS! ✨
+
+import numpy as np
+
+
+class ParticleSystem:
+    """1D particles on a LED strip, stored as parallel arrays with a fixed cap.
+
+    Alive particles always occupy the first `count` slots, so spawn, step, cull
+    and splat are plain slice operations - the cost per frame depends on the cap,
+    never on Python objects being created or removed.
+    """
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.count = 0
+        self.dropped = 0  # Spawns rejected because the system was full
+
+        self.position = np.zeros(capacity)                  # LED index of the head (float)
+        self.velocity = np.zeros(capacity)                  # LEDs per step
+        self.color = np.zeros((capacity, 3), dtype=np.int32)
+        self.age = np.zeros(capacity)                       # Steps since spawn
+        self.lifetime = np.full(capacity, np.inf)           # Steps until fully faded
+        self.length = np.ones(capacity, dtype=np.int64)     # Trail length in LEDs (head included)
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def spawn(self, position, velocity=0.0, color=(255, 255, 255), lifetime=np.inf, length=1):
+        """Add one or many particles (arguments broadcast); returns how many were added"""
+        position = np.atleast_1d(np.asarray(position, dtype=np.float64))
+        requested = len(position)
+        added = min(requested, self.capacity - self.count)
+        self.dropped += requested - added
+        if added <= 0:
+            return 0
+
+        slots = slice(self.count, self.count + added)
+        self.position[slots] = position[:added]
+        self.velocity[slots] = np.broadcast_to(velocity, requested)[:added]
+        self.color[slots] = np.broadcast_to(color, (requested, 3))[:added]
+        self.lifetime[slots] = np.broadcast_to(lifetime, requested)[:added]
+        self.length[slots] = np.broadcast_to(length, requested)[:added]
+        self.age[slots] = 0
+        self.count += added
+        return added
+
+    def step(self, dt=1.0):
+        """Move all particles and age them"""
+        count = self.count
+        self.position[:count] += self.velocity[:count] * dt
+        self.age[:count] += dt
+
+    def cull(self, low=None, high=None):
+        """Drop faded particles and those whose whole trail left [low, high)"""
+        count = self.count
+        alive = self.age[:count] < self.lifetime[:count]
+
+        if low is not None or high is not None:
+            head = np.trunc(self.position[:count])
+            tail = head - self._trail_direction(count) * (self.length[:count] - 1)
+            first = np.minimum(head, tail)
+            last = np.maximum(head, tail)
+            if low is not None:
+                alive &= last >= low
+            if high is not None:
+                alive &= first < high
+
+        keep = np.flatnonzero(alive)
+        kept = len(keep)
+        if kept == count:
+            return 0
+
+        # Compact survivors to the front, keeping their order (= draw order)
+        for field in (self.position, self.velocity, self.color, self.age, self.lifetime, self.length):
+            field[:kept] = field[keep]
+        self.count = kept
+        return count - kept
+
+    def _trail_direction(self, count):
+        """+1 / -1 per particle: trails extend opposite to the direction of motion"""
+        return np.where(self.velocity[:count] < 0, -1, 1)
+
+    def splat(self, out, profile=(255,), add=False):
+        """Draw every particle with its trail into out (N, 3 uint8).
+
+        profile[i] is the 0..255 intensity of the i-th trail pixel behind the head;
+        particles also fade linearly over their lifetime. Later particles win on
+        overlap, or add (saturating) with add=True.
+        """
+        count = self.count
+        if count == 0:
+            return
+
+        profile = np.asarray(profile, dtype=np.float64)
+        offsets = np.arange(len(profile))
+        head = np.trunc(self.position[:count]).astype(np.int64)
+        pixels = head[:, None] - self._trail_direction(count)[:, None] * offsets
+
+        brightness = 1.0 - self.age[:count] / self.lifetime[:count]
+        intensity = np.trunc(profile * brightness[:, None]).astype(np.int32)
+        np.maximum(intensity, 0, out=intensity)
+
+        visible = (offsets < self.length[:count, None]) & (pixels >= 0) & (pixels < len(out))
+        colors = (self.color[:count, None, :] * intensity[:, :, None]) // 255
+
+        if add:
+            total = out.astype(np.int32)
+            np.add.at(total, pixels[visible], colors[visible])
+            np.clip(total, 0, 255, out=total)
+            np.copyto(out, total, casting="unsafe")
+        else:
+            out[pixels[visible]] = colors[visible]
@@ -2,317 +2,229 @@
 
 # 🔥🔥🔥 PARTY MODE - GEILE EFFEKTE FÜR 300 LEDs! 🔥🔥🔥
 
-import gpiozero
-import time
-import random
-import math
+import os
+import atexit
+from led_output import create_backend
+from frame_pipeline import FramePipeline
+from shm_transmitter import ShmTransmitter
+from framebuffer import FrameBuffer
+from compositor import Compositor
+from scheduler import FrameScheduler
+from bake import BakedShow
+from frame_cache import FrameCache
+from effects import (RainbowChase, FireSimulation, WaveInterference, LightningStorm,
+                     MatrixRain, Fireworks, Meteor, Confetti)
 
 # LED Konfiguration
 LED_COUNT = 300
 BRIGHTNESS = 0.9  # VOLLE POWER!
+GAMMA = 2.2  # Gamma-Korrektur: dunkle Töne bleiben satt statt ausgewaschen (1.0 = aus)
+WHITE_BALANCE = (255, 255, 255)  # Weißabgleich pro Kanal, z.B. (255, 176, 240) für typische Strips
 LED_PIN = 18
-
-led_output = gpiozero.OutputDevice(LED_PIN)
-leds = [(0, 0, 0)] * LED_COUNT
-
-# Timing optimiert
-T1H_NS = 800
-T1L_NS = 400
-T0H_NS = 400
-T0L_NS = 800
-RESET_NS = 50000
-
-def precise_delay_ns(nanoseconds):
-    if nanoseconds < 10000:
-        start = time.perf_counter_ns()
-        while (time.perf_counter_ns() - start) < nanoseconds:
-            pass
-    else:
-        time.sleep(nanoseconds / 1_000_000_000)
-
-def send_bit(bit):
-    if bit:
-        led_output.on()
-        precise_delay_ns(T1H_NS)
-        led_output.off()
-        precise_delay_ns(T1L_NS)
-    else:
-        led_output.on()
-        precise_delay_ns(T0H_NS)
-        led_output.off()
-        precise_delay_ns(T0L_NS)
-
-def send_byte(byte):
-    for bit in range(7, -1, -1):
-        send_bit(byte & (1 << bit))
+LED_BACKEND = os.environ.get("LED_BACKEND", "gpio")  # gpio, spi oder loopback
+FRAME_POLICY = os.environ.get("LED_FRAME_POLICY", "latest")  # Senden: latest, drop (Thread), process (eigener Prozess) oder off
+TRANSMITTER_CPU = os.environ.get("LED_TRANSMITTER_CPU")  # CPU-Kern für den Sende-Prozess, z.B. "3" (None = beliebig)
+FULL_REFRESH = 60  # Alle N Frames den ganzen Strip senden, sonst nur bis zur letzten geänderten LED (0 = immer ganz)
+KEEP_ALIVE = 1.0  # Identische Frames werden nicht gesendet, nur alle N Sekunden zur Sicherheit (0 = nie)
+RANDOM_SEED = 42  # Fester Seed = jede Show sieht gleich aus (None = jedes Mal anders)
+TRANSITION_TIME = 1.0  # Sekunden Überblendung zwischen zwei Effekten
+FRAME_CACHE_MB = 4  # Speicher für wiederkehrende Frames periodischer Effekte (0 = aus)
+BAKED_SHOW = os.environ.get("LED_BAKED_SHOW")  # Mit bake.py gebackene Show abspielen statt live rendern, z.B. "party.lzbk"
+
+if FRAME_POLICY == "process":
+    # Eigener Prozess (optional auf eigenem CPU-Kern): Bit-Banging blockiert nicht mehr den GIL
+    led_output = ShmTransmitter(LED_COUNT, LED_BACKEND, cpu=int(TRANSMITTER_CPU) if TRANSMITTER_CPU else None,
+                                pin=LED_PIN, full_refresh=FULL_REFRESH, keep_alive=KEEP_ALIVE).start()
+else:
+    led_output = create_backend(LED_COUNT, LED_BACKEND, pin=LED_PIN,
+                                full_refresh=FULL_REFRESH, keep_alive=KEEP_ALIVE)
+led_output.set_correction(BRIGHTNESS, GAMMA, WHITE_BALANCE)
+if FRAME_POLICY not in ("off", "process"):
+    # Senden im eigenen Thread: langsames Bit-Banging bremst das Rendern nicht
+    led_output = FramePipeline(led_output, policy=FRAME_POLICY).start()
+atexit.register(led_output.close)
+
+# Effekte malen in leds (Layer "effect"), beim Wechsel blendet das letzte Bild darunter aus
+compositor = Compositor(LED_COUNT)
+outgoing = compositor.add_layer("outgoing", opacity=0.0)
+leds = compositor.add_layer("effect").buffer
+frame = FrameBuffer(LED_COUNT)  # Fertig gemischtes Bild für den Strip
+# Periodische Effekte (Rainbow) rendern jede Phase nur einmal
+frame_cache = FrameCache(FRAME_CACHE_MB * 1_000_000) if FRAME_CACHE_MB else None
 
 def send_to_strip():
-    led_output.off()
-    precise_delay_ns(RESET_NS)
-    
-    for r, g, b in leds:
-        r = int(r * BRIGHTNESS)
-        g = int(g * BRIGHTNESS)
-        b = int(b * BRIGHTNESS)
-        send_byte(g)
-        send_byte(r)
-        send_byte(b)
-    
-    led_output.off()
-    precise_delay_ns(RESET_NS)
+    compositor.compose(frame.view())
+    # Helligkeit + Gamma stecken in den Encoder-Tabellen (neu gebaut nur wenn BRIGHTNESS sich ändert)
+    led_output.set_brightness(BRIGHTNESS)
+    led_output.show(frame.view())
+
+def print_output_stats():
+    """Frames gerendert vs. wirklich gesendet (identische Frames überspringt die Ausgabe)"""
+    stats = led_output.stats()
+    print(f"📊 {stats['frames_rendered']} Frames gerendert, {stats['frames_sent']} gesendet, "
+          f"{stats['frames_deduped']} unverändert übersprungen")
+    if frame_cache is not None:
+        print(f"🗃️ {frame_cache.summary()}")
 
 def clear():
-    global leds
-    leds = [(0, 0, 0)] * LED_COUNT
+    leds.clear()
     send_to_strip()
 
 def set_pixel(index, r, g, b):
     if 0 <= index < LED_COUNT:
         leds[index] = (r, g, b)
 
-def hsv_to_rgb(h, s, v):
-    """HSV zu RGB - für geile Farben"""
-    h = h % 360
-    c = v * s
-    x = c * (1 - abs((h / 60) % 2 - 1))
-    m = v - c
-    
-    if h < 60:
-        r, g, b = c, x, 0
-    elif h < 120:
-        r, g, b = x, c, 0
-    elif h < 180:
-        r, g, b = 0, c, x
-    elif h < 240:
-        r, g, b = 0, x, c
-    elif h < 300:
-        r, g, b = x, 0, c
-    else:
-        r, g, b = c, 0, x
-    
-    return int((r + m) * 255), int((g + m) * 255), int((b + m) * 255)
+def run_effect(step, fps, frames):
+    """step(out) im festen Takt: verpasste Ticks werden simuliert, aber nicht gesendet"""
+    clock = FrameScheduler(fps)
+    for t, dt in clock.ticks(frames=frames):
+        for _ in range(clock.steps):
+            step(leds.view())
+        send_to_strip()
+    print(f"   ⏱️ {clock.summary()}")
+
+def transition():
+    """Letztes Bild ausblenden während der nächste Effekt auf Schwarz startet"""
+    outgoing.buffer.copy_from(leds)
+    outgoing.opacity = 1.0
+    compositor["effect"].opacity = 0.0
+    leds.clear()
+    compositor.crossfade("outgoing", "effect", TRANSITION_TIME)
 
 # 🌈 EFFEKT 1: RAINBOW CHASE
 def rainbow_chase(speed=0.01):
     """Regenbogen läuft durch den Strip"""
     print("🌈 RAINBOW CHASE!")
     
-    for offset in range(360 * 3):  # 3 komplette Zyklen
-        for i in range(LED_COUNT):
-            hue = (offset + i * 2) % 360
-            r, g, b = hsv_to_rgb(hue, 1.0, 1.0)
-            set_pixel(i, r, g, b)
-        
-        send_to_strip()
-        time.sleep(speed)
+    effect = RainbowChase(LED_COUNT, cache=frame_cache)
+    run_effect(effect.step, 1 / speed, 360 * 3)  # 3 komplette Zyklen
 
 # ⚡ EFFEKT 2: LIGHTNING STORM
 def lightning_storm():
     """Heftiges Gewitter mit mehreren Blitzen"""
     print("⚡ LIGHTNING STORM!")
     
+    effect = LightningStorm(LED_COUNT, seed=RANDOM_SEED)
+    clock = FrameScheduler()
     for _ in range(15):  # 15 Blitze
-        # Zufällige Blitz-Parameter
-        num_strikes = random.randint(1, 4)
-        
-        for strike in range(num_strikes):
-            clear()
-            
-            # Mehrere Blitz-Bereiche
-            for _ in range(random.randint(2, 5)):
-                start = random.randint(0, LED_COUNT - 80)
-                length = random.randint(30, 80)
-                intensity = random.randint(150, 255)
-                
-                for i in range(start, min(start + length, LED_COUNT)):
-                    set_pixel(i, intensity, intensity, intensity)
+        for strike in range(effect.strikes()):
+            # Mehrere Blitz-Bereiche auf einmal
+            effect.strike(leds.view())
+            flash, dark = effect.timing()
             
+            # Hold-Zeiten zählen ab Frame-Beginn, die Sendezeit ist schon drin
             send_to_strip()
-            time.sleep(random.uniform(0.01, 0.05))
+            clock.pause(flash)
             
             clear()
-            time.sleep(random.uniform(0.02, 0.08))
+            clock.pause(dark)
         
         # Pause zwischen Gewittern
-        time.sleep(random.uniform(0.3, 1.0))
+        clock.pause(effect.pause())
 
 # 🔥 EFFEKT 3: FIRE SIMULATION
 def fire_simulation():
     """Realistisches Feuer"""
     print("🔥 FIRE SIMULATION!")
     
-    heat = [0] * LED_COUNT
-    
-    for _ in range(500):  # 50 Sekunden Feuer
-        # Kühle alle Pixel ab
-        for i in range(LED_COUNT):
-            heat[i] = max(0, heat[i] - random.randint(0, 3))
-        
-        # Heiße Spots am Ende (Feuer-Basis)
-        for i in range(LED_COUNT - 10, LED_COUNT):
-            if random.random() < 0.7:
-                heat[i] = min(255, heat[i] + random.randint(50, 100))
-        
-        # Hitze nach oben verteilen
-        for i in range(LED_COUNT - 1, 2, -1):
-            heat[i] = (heat[i - 1] + heat[i - 2] + heat[i - 2]) // 3
-        
-        # Hitze zu Farbe konvertieren
-        for i in range(LED_COUNT):
-            h = heat[i]
-            if h < 85:
-                # Schwarz zu Rot
-                r = h * 3
-                g = 0
-                b = 0
-            elif h < 170:
-                # Rot zu Gelb
-                r = 255
-                g = (h - 85) * 3
-                b = 0
-            else:
-                # Gelb zu Weiß
-                r = 255
-                g = 255
-                b = (h - 170) * 3
-            
-            set_pixel(i, r, g, b)
-        
-        send_to_strip()
-        time.sleep(0.05)
+    effect = FireSimulation(LED_COUNT, seed=RANDOM_SEED)
+    run_effect(effect.step, 20, 500)  # 25 Sekunden Feuer bei 20 FPS
 
 # 💥 EFFEKT 4: MATRIX RAIN
 def matrix_rain():
     """Matrix-Regen Effekt"""
     print("💥 MATRIX RAIN!")
     
-    drops = []
-    
-    for _ in range(1000):  # Lange Matrix-Session
-        # Neue Tropfen
-        if random.random() < 0.3:
-            drops.append({
-                'pos': 0,
-                'speed': random.uniform(0.5, 2.0),
-                'length': random.randint(10, 30),
-                'color': random.choice([(0, 255, 0), (0, 255, 100), (50, 255, 50)])
-            })
-        
-        # Alle LEDs dimmen
-        for i in range(LED_COUNT):
-            r, g, b = leds[i]
-            leds[i] = (max(0, r - 10), max(0, g - 5), max(0, b - 10))
-        
-        # Tropfen bewegen und zeichnen
-        for drop in drops[:]:
-            drop['pos'] += drop['speed']
-            
-            # Tropfen zeichnen
-            for i in range(int(drop['length'])):
-                pos = int(drop['pos']) - i
-                if 0 <= pos < LED_COUNT:
-                    intensity = max(0, 255 - i * 15)
-                    r = (drop['color'][0] * intensity) // 255
-                    g = (drop['color'][1] * intensity) // 255
-                    b = (drop['color'][2] * intensity) // 255
-                    set_pixel(pos, r, g, b)
-            
-            # Tropfen entfernen wenn unten
-            if drop['pos'] > LED_COUNT + drop['length']:
-                drops.remove(drop)
-        
-        send_to_strip()
-        time.sleep(0.03)
+    effect = MatrixRain(LED_COUNT, seed=RANDOM_SEED)
+    run_effect(effect.step, 1 / 0.03, 1000)  # Lange Matrix-Session
 
 # 🌊 EFFEKT 5: WAVE INTERFERENCE
 def wave_interference():
     """Zwei interferierende Wellen"""
     print("🌊 WAVE INTERFERENCE!")
     
-    for frame in range(600):  # 60 Sekunden
-        for i in range(LED_COUNT):
-            # Zwei Sinus-Wellen
-            wave1 = math.sin((i * 0.1) + (frame * 0.1)) * 127 + 128
-            wave2 = math.sin((i * 0.05) + (frame * 0.15)) * 127 + 128
-            
-            # Interferenz
-            interference = (wave1 + wave2) / 2
-            
-            # Zu Farbe konvertieren
-            hue = (interference + frame) % 360
-            r, g, b = hsv_to_rgb(hue, 1.0, interference / 255)
-            
-            set_pixel(i, r, g, b)
-        
-        send_to_strip()
-        time.sleep(0.05)
+    effect = WaveInterference(LED_COUNT)
+    run_effect(effect.step, 20, 600)  # 30 Sekunden bei 20 FPS
 
 # 🎆 EFFEKT 6: FIREWORKS
 def fireworks():
     """Feuerwerk-Show"""
     print("🎆 FIREWORKS SHOW!")
     
+    effect = Fireworks(LED_COUNT, seed=RANDOM_SEED)
+    clock = FrameScheduler()
     for _ in range(20):  # 20 Feuerwerke
-        # Rakete steigt auf
-        launch_pos = random.randint(50, LED_COUNT - 50)
-        
-        for i in range(40):
-            clear()
-            # Raketen-Trail
-            for j in range(5):
-                pos = launch_pos - i - j
-                if pos >= 0:
-                    intensity = 255 - j * 50
-                    set_pixel(pos, intensity, intensity // 2, 0)
-            
+        # Rakete steigt auf (50 FPS), dann Explosion mit Funken (33 FPS)
+        effect.launch()
+        clock.set_rate(50)
+        for t, dt in clock.ticks():
+            for _ in range(clock.steps):
+                effect.step(leds.view())
             send_to_strip()
-            time.sleep(0.02)
-        
-        # Explosion
-        explosion_pos = launch_pos - 40
-        explosion_color = hsv_to_rgb(random.randint(0, 360), 1.0, 1.0)
+            if effect.phase == "done":
+                break
+            if effect.phase == "explosion" and clock.fps == 50:
+                clock.set_rate(1 / 0.03)
         
-        for radius in range(50):
-            # Explosion ausbreiten
-            for i in range(-radius, radius + 1):
-                pos = explosion_pos + i
-                if 0 <= pos < LED_COUNT:
-                    distance = abs(i)
-                    if distance <= radius:
-                        intensity = max(0, 255 - distance * 8)
-                        r = (explosion_color[0] * intensity) // 255
-                        g = (explosion_color[1] * intensity) // 255
-                        b = (explosion_color[2] * intensity) // 255
-                        set_pixel(pos, r, g, b)
-            
-            # Funken
-            for _ in range(random.randint(3, 8)):
-                spark_pos = explosion_pos + random.randint(-radius - 10, radius + 10)
-                if 0 <= spark_pos < LED_COUNT:
-                    set_pixel(spark_pos, 255, 255, 255)
-            
-            send_to_strip()
-            time.sleep(0.03)
-            
-            # Dimmen
-            for i in range(LED_COUNT):
-                r, g, b = leds[i]
-                leds[i] = (max(0, r - 8), max(0, g - 8), max(0, b - 8))
+        clock.pause(effect.rng.uniform(0.5, 2.0))
+
+# ☄️ EFFEKT 7: METEOR SHOWER
+def meteor_shower():
+    """Meteore in Weiß, Rot und Blau (wie auf dem Arduino)"""
+    print("☄️ METEOR SHOWER!")
+    
+    for color in [(255, 255, 255), (255, 0, 0), (0, 0, 255)]:
+        effect = Meteor(LED_COUNT, color, size=10, trail_decay=64, random_decay=True, seed=RANDOM_SEED)
+        leds.clear()
+        run_effect(effect.step, 100, effect.frames)
+
+# 🎊 EFFEKT 8: CONFETTI
+def confetti():
+    """Bunte Konfetti-Funken"""
+    print("🎊 CONFETTI!")
+    
+    effect = Confetti(LED_COUNT, seed=RANDOM_SEED)
+    run_effect(effect.step, 100, 300)
+
+# 🍞 GEBACKENE SHOW
+def play_baked(path, loop=True):
+    """Vorab gerenderte Frames aus der Datei direkt an den Strip - kein Rendern, kein Mischen"""
+    with BakedShow(path, loop=loop) as show:
+        if show.led_count != LED_COUNT:
+            print(f"❌ {path} ist für {show.led_count} LEDs gebacken, der Strip hat {LED_COUNT}!")
+            return
+        print(f"🍞 BAKED SHOW: {len(show)} Frames @ {show.fps:g} FPS ({show.duration:.1f} s)")
         
-        time.sleep(random.uniform(0.5, 2.0))
+        led_output.set_brightness(BRIGHTNESS)
+        clock = FrameScheduler(show.fps)
+        for t, dt in clock.ticks(frames=None if loop else len(show)):
+            # Zu spät? Übersprungene Frames werden nur weitergespult, nicht gesendet
+            led_output.show(show.advance(clock.steps))
+        print(f"   ⏱️ {clock.summary()}")
 
 def main():
     print("🎉🎉🎉 PARTY MODE AKTIVIERT! 🎉🎉🎉")
     print("5 METER - 300 LEDs - VOLLE POWER!")
     print("Strg+C zum Beenden\n")
     
+    if BAKED_SHOW:
+        try:
+            play_baked(BAKED_SHOW)
+        except KeyboardInterrupt:
+            print("\n🎉 PARTY ENDE! 🎉")
+            clear()
+            print_output_stats()
+        return
+    
     effects = [
         ("🌈 RAINBOW CHASE", rainbow_chase),
         ("⚡ LIGHTNING STORM", lightning_storm),
         ("🔥 FIRE SIMULATION", fire_simulation),
         ("💥 MATRIX RAIN", matrix_rain),
         ("🌊 WAVE INTERFERENCE", wave_interference),
-        ("🎆 FIREWORKS SHOW", fireworks)
+        ("🎆 FIREWORKS SHOW", fireworks),
+        ("☄️ METEOR SHOWER", meteor_shower),
+        ("🎊 CONFETTI", confetti)
     ]
     
     try:
@@ -320,12 +232,13 @@ def main():
             for name, effect in effects:
                 print(f"\n{name}")
                 effect()
-                clear()
-                time.sleep(1)
+                transition()
                 
     except KeyboardInterrupt:
         print("\n🎉 PARTY ENDE! 🎉")
+        outgoing.fade_to(0.0, 0.0)
         clear()
+        print_output_stats()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
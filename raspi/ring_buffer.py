@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+# 🔁 RING BUFFER - AUDIO-CALLBACK KOPIERT NUR NOCH SAMPLES! 🔁
+
+import numpy as np
+
+
+class SampleRingBuffer:
+    """Preallocated single-producer / single-consumer sample ring buffer.
+
+    The producer (PortAudio callback) only ever advances write_pos and the
+    consumer (analysis worker) only ever advances read_pos, so no lock is
+    needed. If the consumer falls behind, incoming blocks are dropped and
+    counted as overruns instead of overwriting unread samples.
+
+    Samples are stored twice (mirrored), so the last `history` consumed
+    samples can be read back as one contiguous zero-copy window - this is
+    what lets the analysis slide an overlapping STFT window hop by hop.
+    """
+
+    def __init__(self, capacity, dtype=np.int16, history=0):
+        if history > capacity:
+            raise ValueError("history must not exceed capacity")
+        self.capacity = capacity
+        self.history = history
+        self._data = np.zeros(capacity * 2, dtype=dtype)
+        self.write_pos = 0  # Total samples ever written
+        self.read_pos = 0   # Total samples ever consumed
+        self.overruns = 0
+        self.dropped_samples = 0
+
+    def available(self):
+        """Number of samples written but not yet consumed"""
+        return self.write_pos - self.read_pos
+
+    def free(self):
+        """Samples the producer may write without touching unread or retained history"""
+        retained = min(self.history, self.read_pos)
+        return self.capacity - self.available() - retained
+
+    def write(self, samples):
+        """Producer side: copy a block in, or drop it and count an overrun"""
+        count = len(samples)
+        if count > self.free():
+            self.overruns += 1
+            self.dropped_samples += count
+            return False
+
+        start = self.write_pos % self.capacity
+        first = min(count, self.capacity - start)
+        # Primary copy plus mirror, so any window up to capacity is contiguous
+        self._data[start:start + first] = samples[:first]
+        self._data[start + self.capacity:start + self.capacity + first] = samples[:first]
+        if first < count:
+            rest = count - first
+            self._data[:rest] = samples[first:]
+            self._data[self.capacity:self.capacity + rest] = samples[first:]
+
+        # Publish only after the samples are in place
+        self.write_pos += count
+        return True
+
+    def read_into(self, out):
+        """Consumer side: copy len(out) samples into out; False if not enough data"""
+        count = len(out)
+        if count > self.available():
+            return False
+
+        start = self.read_pos % self.capacity
+        out[:] = self._data[start:start + count]
+        self.read_pos += count
+        return True
+
+    def advance(self, count):
+        """Consumer side: mark count samples as consumed without copying"""
+        if count > self.available():
+            return False
+        self.read_pos += count
+        return True
+
+    def window(self, length):
+        """Zero-copy view of the last `length` consumed samples (None until filled)"""
+        if length > self.read_pos or length > self.history:
+            return None
+        start = (self.read_pos - length) % self.capacity
+        return self._data[start:start + length]
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+# ⏱️ SCHEDULER - FESTER FRAME-TAKT OHNE DRIFT, MIT FRAME-SKIPPING! ⏱️
+
+import time
+
+
+class FrameScheduler:
+    """Fixed-timestep frame clock on time.monotonic().
+
+    Frame k is due at start + k * period, so render and transmit time never add
+    up to drift. When a frame is late by whole periods those ticks are skipped
+    (steps > 1, dt grows) so effects keep wall-clock speed; beyond max_skip the
+    grid is moved to now instead of trying to catch up.
+    """
+
+    def __init__(self, fps=30, max_skip=5, clock=time.monotonic, sleep=time.sleep):
+        self.clock = clock
+        self.sleep = sleep
+        self.max_skip = max_skip
+        self.t = 0.0         # Scene time in seconds (advances in whole ticks)
+        self.set_rate(fps)
+        self.reset_stats()
+
+    def set_rate(self, fps):
+        """Change the frame rate (float("inf") = unlimited); the grid restarts at the current tick"""
+        self.fps = fps
+        self.period = 1.0 / fps
+        self.start = self.clock()
+        self.tick = 0        # Ticks on the current grid
+        self.dt = self.period
+        self.steps = 1       # Ticks covered by the last frame (1 + skipped)
+        self._wake = self.start
+
+    def reset_stats(self):
+        self.frames = 0
+        self.skipped = 0     # Ticks dropped because a frame ran late
+        self.resyncs = 0     # Grid moved because we were more than max_skip ticks behind
+        self.work_total = 0.0
+        self.work_max = 0.0
+
+    def deadline(self, tick=None):
+        return self.start + (self.tick if tick is None else tick) * self.period
+
+    def _advance(self, now):
+        """Move to the next due tick at time now; returns the number of ticks covered"""
+        if not self.period:
+            # Unlimited rate: every call is a frame, dt is the real time since the last one
+            self.tick += 1
+            self.steps = 1
+            self.dt = now - self.start
+            self.start = now
+            self.t += self.dt
+            return 1
+
+        behind = int((now - self.deadline(self.tick + 1)) / self.period)
+        steps = 1
+        if behind > self.max_skip:
+            # Too far behind: drop the backlog and restart the grid here
+            self.resyncs += 1
+            steps += self.max_skip
+            self.start = now - (self.tick + steps) * self.period
+        elif behind > 0:
+            self.skipped += behind
+            steps += behind
+
+        self.tick += steps
+        self.steps = steps
+        self.dt = steps * self.period
+        self.t += self.dt
+        return steps
+
+    def wait(self):
+        """Sleep until the next frame is due and advance t / dt"""
+        now = self.clock()
+        work = now - self._wake
+        self.work_total += work
+        self.work_max = max(self.work_max, work)
+        self.frames += 1
+
+        remaining = self.deadline(self.tick + 1) - now
+        if remaining > 0:
+            self.sleep(remaining)
+            now = self.clock()
+        self._advance(now)
+        self._wake = self.clock()
+
+    def due(self, now=None):
+        """Non-blocking variant for callback-driven loops: True (and advance) once a frame is due"""
+        now = self.clock() if now is None else now
+        if now < self.deadline(self.tick + 1):
+            return False
+        self._advance(now)
+        self.frames += 1
+        return True
+
+    def pause(self, seconds):
+        """Hold until seconds after the current frame began, then restart the grid there"""
+        target = self._wake + max(0.0, seconds)
+        remaining = target - self.clock()
+        if remaining > 0:
+            self.sleep(remaining)
+        self.t += seconds
+        self.start = max(target, self.clock())
+        self.tick = 0
+        self._wake = self.start
+
+    def ticks(self, frames=None, duration=None):
+        """Yield (t, dt) once per frame until frames ticks or duration seconds have passed"""
+        self.start = self.clock()
+        self.tick = 0
+        self._wake = self.start
+        first = self.t
+        elapsed = 0
+        while True:
+            yield self.t, self.dt
+            self.wait()
+            elapsed += self.steps
+            if frames is not None and elapsed >= frames:
+                break
+            if duration is not None and self.t - first >= duration:
+                break
+
+    def stats(self):
+        frames = max(1, self.frames)
+        return {
+            'frames': self.frames,
+            'skipped': self.skipped,
+            'resyncs': self.resyncs,
+            'avg_work_ms': self.work_total / frames * 1e3,
+            'max_work_ms': self.work_max * 1e3,
+            'budget_ms': self.period * 1e3
+        }
+
+    def summary(self):
+        stats = self.stats()
+        return (f"{stats['frames']} Frames, {stats['skipped']} übersprungen, "
+                f"Renderzeit Ø {stats['avg_work_ms']:.2f} ms / max {stats['max_work_ms']:.2f} ms "
+                f"(Budget {stats['budget_ms']:.1f} ms)")
+
+
+if __name__ == "__main__":
+    print("⏱️ Scheduler Test: 30 FPS, jeder 10. Frame dauert 3 Perioden")
+    scheduler = FrameScheduler(30)
+    started = time.monotonic()
+    for index, (t, dt) in enumerate(scheduler.ticks(frames=90)):
+        if index % 10 == 9:
+            time.sleep(3 * scheduler.period)
+    elapsed = time.monotonic() - started
+    print(f"   Szenenzeit {scheduler.t:.3f} s, Wandzeit {elapsed:.3f} s")
+    print(f"   {scheduler.summary()}")
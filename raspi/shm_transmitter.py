@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+
+# 🧵 SHM TRANSMITTER - STRIP-AUSGABE IM EIGENEN PROZESS ÜBER SHARED MEMORY! 🧵
+
+import multiprocessing
+import os
+import time
+from multiprocessing import shared_memory
+import numpy as np
+
+# Header words (int64)
+SEQ = 0          # Frames published by the renderer; frame n lives in slot n % 2
+SENT = 1         # Frames the backend actually put on the wire
+STOP = 2         # Set by the renderer to end the transmitter
+STATUS = 3       # 0 = starting, 1 = running, -1 = backend failed
+CORRECTION = 4   # Bumped whenever the correction values change
+TORN = 5         # Reads retried because the renderer lapped the transmitter
+DEDUPED = 6      # Frames the backend skipped as identical to the last one sent
+SLOT_WRITES = 8  # Seqlock counter per slot (8, 9): odd while the renderer is writing that slot
+HEADER_WORDS = 10
+CORRECTION_VALUES = 5  # brightness, gamma, white balance r / g / b (float64)
+
+
+class SharedFrameBuffer:
+    """Two (N, 3) uint8 frames plus a small header in one shared memory block.
+
+    Frame n goes to slot n % 2. Every slot has a seqlock counter: the writer
+    makes it odd before copying and even again afterwards, then publishes n.
+    The reader copies slot seq % 2 and keeps the copy only if the slot counter
+    was even and unchanged across it; otherwise the writer was in that slot and
+    it retries. No pickling, no pipes - one memcpy per frame on each side.
+    """
+
+    def __init__(self, led_count, name=None):
+        self.led_count = led_count
+        frame_bytes = led_count * 3
+        size = HEADER_WORDS * 8 + CORRECTION_VALUES * 8 + 2 * frame_bytes
+        self.owner = name is None
+        self.shm = shared_memory.SharedMemory(name=name, create=self.owner, size=size if self.owner else 0)
+        self.name = self.shm.name
+
+        buf = self.shm.buf
+        self.header = np.ndarray((HEADER_WORDS,), dtype=np.int64, buffer=buf)
+        self.correction = np.ndarray((CORRECTION_VALUES,), dtype=np.float64, buffer=buf,
+                                     offset=HEADER_WORDS * 8)
+        self.frames = np.ndarray((2, led_count, 3), dtype=np.uint8, buffer=buf,
+                                 offset=HEADER_WORDS * 8 + CORRECTION_VALUES * 8)
+        if self.owner:
+            self.header[:] = 0
+            self.correction[:] = (1.0, 1.0, 255, 255, 255)
+
+    def write(self, frame):
+        """Renderer side: publish a frame"""
+        header = self.header
+        seq = int(header[SEQ]) + 1
+        lock = SLOT_WRITES + seq % 2
+        header[lock] += 1  # Odd: slot is being written
+        np.copyto(self.frames[seq % 2], frame, casting="unsafe")
+        header[lock] += 1
+        header[SEQ] = seq
+        return seq
+
+    def read(self, out, last_seq):
+        """Transmitter side: copy the newest frame into out; returns its seq or None if nothing new"""
+        header = self.header
+        while True:
+            seq = int(header[SEQ])
+            if seq == last_seq:
+                return None
+            lock = SLOT_WRITES + seq % 2
+            before = int(header[lock])
+            if not before % 2:
+                np.copyto(out, self.frames[seq % 2])
+                if int(header[lock]) == before:
+                    return seq
+            # The renderer was (or still is) rewriting this slot
+            header[TORN] += 1
+
+    def close(self):
+        # Views must go before the mapping can be closed
+        self.header = self.correction = self.frames = None
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _set_realtime(cpu, priority):
+    """Pin to one core and raise scheduling priority; best effort without root"""
+    if cpu is not None:
+        try:
+            os.sched_setaffinity(0, {cpu})
+        except (AttributeError, OSError) as e:
+            print(f"⚠️ Transmitter: CPU {cpu} nicht verfügbar ({e})")
+    if priority:
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+        except (AttributeError, PermissionError, OSError):
+            try:
+                os.nice(-10)
+            except OSError:
+                print("⚠️ Transmitter: keine erhöhte Priorität (sudo für SCHED_FIFO)")
+
+
+def _transmitter_main(shared, backend_name, backend_kwargs, ready, cpu, priority):
+    """Transmitter process: wait for frames, send the newest one"""
+    from led_output import create_backend
+
+    # The shared mapping is inherited through fork; the parent owns (and unlinks) it
+    led_count = shared.led_count
+    _set_realtime(cpu, priority)
+    try:
+        backend = create_backend(led_count, backend_name, **backend_kwargs)
+    except Exception as e:
+        print(f"❌ Transmitter: can't open LED backend '{backend_name}': {e}")
+        shared.header[STATUS] = -1
+        return
+    shared.header[STATUS] = 1
+
+    frame = np.zeros((led_count, 3), dtype=np.uint8)
+    last_seq = 0
+    correction_seq = -1
+    try:
+        while True:
+            # Event wait/clear go through a semaphore, so the frame bytes are visible before SEQ
+            ready.wait(0.1)
+            ready.clear()
+            if shared.header[CORRECTION] != correction_seq:
+                correction_seq = int(shared.header[CORRECTION])
+                brightness, gamma, *white_balance = shared.correction.tolist()
+                backend.set_correction(brightness, gamma, tuple(int(c) for c in white_balance))
+
+            seq = shared.read(frame, last_seq)
+            if seq is not None:
+                last_seq = seq
+                backend.show(frame)
+                shared.header[SENT] = backend.frames_sent
+                shared.header[DEDUPED] = backend.frames_deduped
+            elif shared.header[STOP]:
+                break
+    finally:
+        backend.close()
+
+
+class ShmTransmitter:
+    """OutputBackend stand-in that hands frames to a transmitter process.
+
+    The process owns the hardware, so its busy-wait bit-banging never holds the
+    renderer's GIL. Latest frame wins: frames published while one is on the wire
+    are replaced by newer ones.
+    """
+
+    def __init__(self, led_count, backend=None, cpu=None, priority=50, **backend_kwargs):
+        self.led_count = led_count
+        self.backend_name = backend or os.environ.get("LED_BACKEND", "gpio")
+        self.name = f"process:{self.backend_name}"
+        self.backend_kwargs = backend_kwargs
+        self.cpu = cpu
+        self.priority = priority
+
+        self.shared = SharedFrameBuffer(led_count)
+        # fork: the child only needs numpy + led_output, and the modes start it before any thread
+        self._context = multiprocessing.get_context("fork")
+        self._ready = self._context.Event()
+        self.process = None
+
+        self.brightness = 1.0
+        self.gamma = 1.0
+        self.white_balance = (255, 255, 255)
+
+    def start(self, timeout=5.0):
+        """Start the transmitter process and wait until its backend is open"""
+        self.process = self._context.Process(
+            target=_transmitter_main, name="led-transmitter", daemon=True,
+            args=(self.shared, self.backend_name, self.backend_kwargs, self._ready, self.cpu, self.priority))
+        self.process.start()
+
+        deadline = time.monotonic() + timeout
+        while self.shared.header[STATUS] == 0 and self.process.is_alive() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        if self.shared.header[STATUS] != 1:
+            self.close()
+            raise RuntimeError(f"LED transmitter process for '{self.backend_name}' did not start")
+        return self
+
+    def set_correction(self, brightness=None, gamma=None, white_balance=None):
+        """Brightness / gamma / white balance; the transmitter rebuilds its tables only on change"""
+        settings = (self.brightness if brightness is None else brightness,
+                    self.gamma if gamma is None else gamma,
+                    tuple(self.white_balance if white_balance is None else white_balance))
+        if settings == (self.brightness, self.gamma, self.white_balance) and self.shared.header[CORRECTION]:
+            return
+
+        self.brightness, self.gamma, self.white_balance = settings
+        self.shared.correction[:] = (self.brightness, self.gamma, *self.white_balance)
+        self.shared.header[CORRECTION] += 1
+        self._ready.set()
+
+    def set_brightness(self, brightness):
+        self.set_correction(brightness=brightness)
+
+    def show(self, frame):
+        """Publish a frame - returns immediately, the transmitter sends it when the strip is free"""
+        self.shared.write(frame)
+        self._ready.set()
+
+    def stats(self):
+        header = self.shared.header
+        return {
+            'frames_rendered': int(header[SEQ]),
+            'frames_sent': int(header[SENT]),
+            'frames_deduped': int(header[DEDUPED]),
+            'torn_reads': int(header[TORN])
+        }
+
+    def close(self):
+        if self.shared is None:
+            return
+        if self.process is not None:
+            # Let the transmitter put the last frame on the strip, then stop it
+            self.shared.header[STOP] = 1
+            self._ready.set()
+            self.process.join(2.0)
+            if self.process.is_alive():
+                self.process.terminate()
+            self.process = None
+        self.shared.close()
+        self.shared = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _spin(seconds):
+    """Busy-wait like GPIOBackend does for the bits of a frame"""
+    from led_output import precise_delay_ns
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        precise_delay_ns(9000)
+
+
+def _render_rate(led_count, seconds):
+    """Render steps per second (stand-in: one sin() over the frame)"""
+    work = np.zeros((led_count, 3))
+    steps = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        np.sin(work, out=work)
+        steps += 1
+    return steps / (time.perf_counter() - start)
+
+
+def benchmark(led_count=300, seconds=2.0, frames=2000):
+    """Render throughput while a transmit spins in a thread vs in its own process, and show() cost"""
+    import threading
+    context = multiprocessing.get_context("fork")
+    results = {"alone": _render_rate(led_count, seconds)}
+
+    thread = threading.Thread(target=_spin, args=(seconds + 0.5,), daemon=True)
+    thread.start()
+    results["thread"] = _render_rate(led_count, seconds)
+    thread.join()
+
+    process = context.Process(target=_spin, args=(seconds + 0.5,), daemon=True)
+    process.start()
+    results["process"] = _render_rate(led_count, seconds)
+    process.join()
+
+    # Publishing a frame to the transmitter process (loopback stands in for the strip)
+    frame = np.zeros((led_count, 3), dtype=np.uint8)
+    with ShmTransmitter(led_count, "loopback", priority=0, max_frames=0) as transmitter:
+        start = time.perf_counter()
+        for _ in range(frames):
+            transmitter.show(frame)
+        results["show_us"] = (time.perf_counter() - start) / frames * 1e6
+        time.sleep(0.1)
+        results["stats"] = transmitter.stats()
+    return results
+
+
+if __name__ == "__main__":
+    print("🧵 Transmitter Benchmark (Render-Schritte pro Sekunde)")
+    results = benchmark()
+    print(f"   ohne Senden:        {results['alone']:,.0f}")
+    print(f"   Senden im Thread:   {results['thread']:,.0f}")
+    print(f"   Senden im Prozess:  {results['process']:,.0f}")
+    stats = results["stats"]
+    print(f"   show(): {results['show_us']:.1f} µs pro Frame, {stats['frames_rendered']} veröffentlicht, "
+          f"{stats['frames_sent']} gesendet, {stats['torn_reads']} Lesevorgänge wiederholt")
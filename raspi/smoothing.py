@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+# 🌫️ SMOOTHING - WEICHE ÜBERGÄNGE FÜR DEN GANZEN STRIP IN EINEM SCHRITT! 🌫️
+
+import time
+import numpy as np
+
+
+class TemporalSmoother:
+    """Exponential smoothing of whole frames with per-pixel attack / decay.
+
+    Effects render raw target colors; apply() moves a float32 accumulator towards
+    the target by `attack` where a channel gets brighter and by `decay` where it
+    gets darker (1.0 = jump immediately, 0.1 = slow fade) and returns the result.
+    """
+
+    def __init__(self, led_count, attack=1.0, decay=1.0):
+        self.led_count = led_count
+        self.state = np.zeros((led_count, 3), dtype=np.float32)
+        self.attack = np.zeros((led_count, 1), dtype=np.float32)
+        self.decay = np.zeros((led_count, 1), dtype=np.float32)
+        self.set_factors(attack, decay)
+
+        # Scratch, reused every frame
+        self._delta = np.zeros((led_count, 3), dtype=np.float32)
+        self._factor = np.zeros((led_count, 3), dtype=np.float32)
+        self._rising = np.zeros((led_count, 3), dtype=bool)
+
+    def set_factors(self, attack, decay=None, start=0, end=None):
+        """Set attack / decay for a region (default: whole strip); arrays give per-pixel values"""
+        decay = attack if decay is None else decay
+        self.attack[start:end, 0] = attack
+        self.decay[start:end, 0] = decay
+
+    def reset(self, frame=None):
+        """Jump to a frame (default: black) without fading"""
+        if frame is None:
+            self.state.fill(0)
+        else:
+            np.copyto(self.state, frame, casting="unsafe")
+
+    def apply(self, target, out):
+        """Move the accumulator towards target (N, 3) and write it to out (N, 3 uint8)"""
+        delta = self._delta
+        factor = self._factor
+        np.subtract(target, self.state, out=delta)
+        np.greater(delta, 0, out=self._rising)
+
+        # Attack where a channel rises, decay where it falls
+        np.copyto(factor, self.decay)
+        np.copyto(factor, self.attack, where=self._rising)
+
+        delta *= factor
+        self.state += delta
+        np.copyto(out, self.state, casting="unsafe")
+        return out
+
+
+def benchmark(led_count, frames=1000):
+    """Microseconds per apply() call"""
+    rng = np.random.default_rng(3)
+    smoother = TemporalSmoother(led_count, attack=0.6, decay=0.2)
+    targets = rng.integers(0, 256, size=(8, led_count, 3), dtype=np.uint8)
+    out = np.zeros((led_count, 3), dtype=np.uint8)
+
+    start = time.perf_counter()
+    for i in range(frames):
+        smoother.apply(targets[i % 8], out)
+    return (time.perf_counter() - start) / frames * 1e6
+
+
+if __name__ == "__main__":
+    print("🌫️ Smoothing Benchmark")
+    for count in (300, 1000, 5000):
+        print(f"   {count} LEDs: {benchmark(count):.1f} µs pro Frame")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+# 📊 SPECTRAL ENGINE - EINE FFT PRO CHUNK FÜR ALLE FREQUENZBÄNDER! 📊
+
+import numpy as np
+
+MIN_FFT_SIZE = 64
+
+
+class SpectralEngine:
+    """One windowed rFFT per chunk, band energies from cached bin boundaries"""
+
+    def __init__(self, freq_ranges, sample_rate=44100, chunk_size=2048):
+        self.freq_ranges = list(freq_ranges)
+        self.sample_rate = None
+        self.chunk_size = None
+        self.window = None
+        self.freqs = None
+        self.band_edges = None
+        self.power = None  # Power spectrum of the last analyzed chunk
+        self.configure(sample_rate, chunk_size)
+
+    def configure(self, sample_rate, chunk_size):
+        """Rebuild window and band-index cache if rate or chunk size changed"""
+        if sample_rate == self.sample_rate and chunk_size == self.chunk_size:
+            return
+
+        self.sample_rate = sample_rate
+        self.chunk_size = chunk_size
+
+        # Hann window, scaled so band energies match the unwindowed FFT on average
+        window = np.hanning(chunk_size).astype(np.float32)
+        self.window = window / np.sqrt(np.mean(window ** 2))
+        self.freqs = np.fft.rfftfreq(chunk_size, 1 / sample_rate)
+        self._rebuild_band_edges()
+
+    def set_bands(self, freq_ranges):
+        """Use a new list of (low_hz, high_hz) bands - any number of bands"""
+        self.freq_ranges = list(freq_ranges)
+        self._rebuild_band_edges()
+
+    def _rebuild_band_edges(self):
+        ranges = np.asarray(self.freq_ranges, dtype=np.float64).reshape(-1, 2)
+        # Same bin selection as the old per-band searchsorted on rfftfreq
+        self.band_edges = np.searchsorted(self.freqs, ranges)
+
+    def power_spectrum(self, audio_data):
+        """|rFFT|^2 of one windowed chunk"""
+        spectrum = np.fft.rfft(audio_data * self.window)
+        return spectrum.real ** 2 + spectrum.imag ** 2
+
+    def band_energies(self, audio_data, sample_rate=None):
+        """Energy per configured band from a single FFT of the chunk"""
+        if len(audio_data) < MIN_FFT_SIZE:
+            return np.zeros(len(self.freq_ranges))
+
+        self.configure(sample_rate or self.sample_rate, len(audio_data))
+        self.power = self.power_spectrum(audio_data)
+        return self.bands_from_power(self.power)
+
+    def bands_from_power(self, power):
+        """Sum a power spectrum (or a stack of them) into bands via a cumulative sum lookup"""
+        cumulative = np.zeros(power.shape[:-1] + (power.shape[-1] + 1,))
+        np.cumsum(power, axis=-1, out=cumulative[..., 1:])
+        low, high = self.band_edges[:, 0], self.band_edges[:, 1]
+        return cumulative[..., high] - cumulative[..., low]
@@ -0,0 +1,7 @@
+import os
+import sys
+
+# The scripts in raspi/ import each other by bare module name
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("LED_BACKEND", "loopback")
+os.environ.setdefault("LED_FRAME_POLICY", "off")
@@ -0,0 +1,23 @@
+import numpy as np
+
+from beat_detector import BeatDetector
+
+
+def test_tempo_callbacks_run_before_beat_callbacks():
+    detector = BeatDetector(sample_rate=44100, chunk_size=256, window_size=2048, hop_size=256,
+                            detector_mode="flux")
+    detector._configure_analysis()
+    detector.running = True
+
+    events = []
+    detector.add_tempo_callback(lambda bpm, confidence, next_beat: events.append("tempo"))
+    detector.add_beat_callback(lambda energy, volume, freq_bands: events.append("beat"))
+
+    # Quiet noise until the flux threshold has its history, then a loud burst
+    rng = np.random.default_rng(3)
+    quiet = (rng.standard_normal((100, 2048)) * 50).astype(np.int16)
+    for window in quiet:
+        detector._process_chunk(window)
+    detector._process_chunk((rng.standard_normal(2048) * 12000).astype(np.int16))
+
+    assert events == ["tempo", "beat"]
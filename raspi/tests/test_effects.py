@@ -0,0 +1,22 @@
+import numpy as np
+
+from effects import Fireworks
+
+
+def test_fireworks_rocket_matches_party_mode_trail():
+    fireworks = Fireworks(300, seed=5)
+    fireworks.launch()
+    launch_pos = fireworks.explosion_pos + Fireworks.ROCKET_FRAMES
+    out = np.zeros((300, 3), dtype=np.uint8)
+
+    for i in range(Fireworks.ROCKET_FRAMES):
+        fireworks.step(out)
+
+        # party_mode.fireworks(): head at launch_pos - i, dimmer pixels further down the strip
+        expected = np.zeros_like(out)
+        for j in range(5):
+            pos = launch_pos - i - j
+            if pos >= 0:
+                intensity = 255 - j * 50
+                expected[pos] = (intensity, intensity // 2, 0)
+        assert np.array_equal(out, expected), f"rocket frame {i}"
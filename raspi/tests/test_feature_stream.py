@@ -0,0 +1,62 @@
+import time
+
+import pytest
+
+from beat_detector import BeatDetector
+from feature_stream import FeatureRecorder, FeatureReplayer
+
+BANDS = [0.02, 0.01, 0.005, 0.001]
+
+
+def emit(detector, beat=False, tempo=None, band_beats=()):
+    """Call the detector's subscribers in the order _process_chunk does"""
+    if tempo:
+        for callback in detector.tempo_callbacks:
+            callback(*tempo)
+    if beat:
+        for callback in detector.beat_callbacks:
+            callback(0.05, 0.3, BANDS)
+    for band, energy in band_beats:
+        for callback in detector.band_beat_callbacks[band]:
+            callback(energy, 0.3, BANDS)
+    for callback in detector.audio_callbacks:
+        callback(0.05, 0.3, BANDS, beat)
+
+
+@pytest.fixture
+def recording(tmp_path):
+    path = tmp_path / "session.lzfs"
+    detector = BeatDetector(sample_rate=44100, chunk_size=256)
+    recorder = FeatureRecorder(path)
+    recorder.attach(detector)
+
+    emit(detector)
+    emit(detector, beat=True, tempo=(120.0, 0.8, time.time() + 0.5), band_beats=[("low", 0.04)])
+    emit(detector, band_beats=[("mid", 0.02), ("high", 0.01)])
+    recorder.close()
+    return path
+
+
+def test_replay_fires_tempo_and_band_beat_streams(recording):
+    replayer = FeatureReplayer(recording, speed=None)
+    events = []
+    replayer.add_beat_callback(lambda energy, volume, freq_bands: events.append("beat"))
+    replayer.add_tempo_callback(lambda bpm, confidence, next_beat: events.append(("tempo", bpm, confidence, next_beat)))
+    for band in ("low", "mid", "high"):
+        replayer.add_band_beat_callback(
+            band, lambda energy, volume, freq_bands, band=band: events.append((band, round(energy, 3))))
+    replayer.add_audio_callback(lambda energy, volume, freq_bands, beat: events.append("frame"))
+
+    replayer.run()
+
+    assert events[0] == "frame"
+    _, bpm, confidence, next_beat = events[1]
+    assert (bpm, round(confidence, 3)) == (120.0, 0.8)
+    # The predicted beat is moved onto the replay clock, still ~0.5 s ahead
+    assert 0.4 < next_beat - time.time() <= 0.5
+    assert events[2:] == ["beat", ("low", 0.04), "frame", ("mid", 0.02), ("high", 0.01), "frame"]
+
+
+def test_replay_rejects_unrecorded_band(recording):
+    with pytest.raises(ValueError):
+        FeatureReplayer(recording).add_band_beat_callback("kick", print)
@@ -0,0 +1,51 @@
+import numpy as np
+
+from framebuffer import FrameBuffer
+
+
+def test_fade_by_matches_fastled_fade_to_black_by():
+    frame = FrameBuffer(3)
+    frame[:] = [(255, 128, 1), (100, 0, 255), (0, 0, 0)]
+    frame.fade_by(64)
+    expected = (np.array([(255, 128, 1), (100, 0, 255), (0, 0, 0)]) * 192) >> 8
+    assert np.array_equal(frame.view(), expected)
+
+
+def test_add_saturate_clips_at_255_and_respects_range():
+    frame = FrameBuffer(4)
+    frame.fill((200, 10, 0))
+    frame.add_saturate((100, 20, 5), start=1, end=3)
+    assert frame[0] == (200, 10, 0)
+    assert frame[1] == (255, 30, 5)
+    assert frame[2] == (255, 30, 5)
+    assert frame[3] == (200, 10, 0)
+
+
+def test_sub_saturate_clips_at_zero():
+    frame = FrameBuffer(2)
+    frame.fill((10, 100, 255))
+    frame.sub_saturate((20, 50, 5))
+    assert frame[0] == (0, 50, 250)
+    assert frame[1] == (0, 50, 250)
+
+
+def test_blend_mixes_towards_other_frame():
+    frame = FrameBuffer(2)
+    other = FrameBuffer(2)
+    frame.fill((0, 100, 200))
+    other.fill((200, 100, 0))
+    frame.blend(other, 0.25)
+    assert frame[0] == (50, 100, 150)
+
+    frame.blend(other.view(), 1.0)
+    assert frame[1] == (200, 100, 0)
+
+
+def test_set_range_clips_to_strip():
+    frame = FrameBuffer(5)
+    frame.set_range(3, [(1, 1, 1), (2, 2, 2), (3, 3, 3)])
+    assert frame[3] == (1, 1, 1)
+    assert frame[4] == (2, 2, 2)
+
+    frame.set_range(-1, [(7, 7, 7), (8, 8, 8)])
+    assert frame[0] == (8, 8, 8)
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+import music_mode
+
+BANDS = [0.02, 0.01, 0.005, 0.001]
+
+
+@pytest.fixture
+def overlay(monkeypatch):
+    """Beat overlay visible on top of the spectrum layer, no frame rate gating"""
+    monkeypatch.setattr(music_mode, "BEAT_OVERLAY", 1.0)
+    monkeypatch.setattr(music_mode, "current_mode", "spectrum")
+    layer = music_mode.compositor["beat_overlay"]
+    monkeypatch.setattr(layer, "opacity", 1.0)
+    music_mode.frame_clock.set_rate(float("inf"))
+    yield layer
+    layer.buffer.clear()
+    music_mode.frame_clock.set_rate(music_mode.led_update_rate)
+
+
+def test_on_audio_frame_fades_visible_beat_overlay(overlay, capsys):
+    music_mode.beat_flash(0.05, 0.3, BANDS)
+    flash = overlay.view().copy()
+    assert flash.any()
+
+    music_mode.on_audio_frame(0.05, 0.3, BANDS, False)
+    music_mode.on_audio_frame(0.05, 0.3, BANDS, False)
+
+    assert "error" not in capsys.readouterr().out
+    faded = (flash.astype(np.int32) * (256 - music_mode.BEAT_OVERLAY_FADE)) >> 8
+    faded = (faded * (256 - music_mode.BEAT_OVERLAY_FADE)) >> 8
+    assert np.array_equal(overlay.view(), faded)
+    # The overlay is added on top of the strip frame
+    assert (music_mode.leds.view().astype(np.int32) >= faded).all()
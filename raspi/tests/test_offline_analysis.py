@@ -0,0 +1,48 @@
+import types
+
+import numpy as np
+
+import beat_detector
+from beat_detector import BeatDetector
+from offline_analysis import analyze
+
+SAMPLE_RATE = 44100
+WINDOW = 2048
+HOP = 256
+
+
+def click_track(seconds=4.0, interval=0.5, first=85):
+    """Quiet noise with a loud noise burst every interval seconds, as int16
+
+    The first burst enters the analysis window in frame first, right where the
+    flux threshold history becomes warm.
+    """
+    rng = np.random.default_rng(11)
+    samples = rng.standard_normal(int(seconds * SAMPLE_RATE)) * 60
+    burst = int(0.02 * SAMPLE_RATE)
+    for start in range(first * HOP + WINDOW - 200, len(samples) - burst, int(interval * SAMPLE_RATE)):
+        samples[start:start + burst] += rng.standard_normal(burst) * 8000
+    return samples.astype(np.int16)
+
+
+def test_offline_flux_beats_match_live_detector(monkeypatch):
+    samples = click_track()
+    offline = analyze(samples.astype(np.float32) / 32768.0, SAMPLE_RATE, WINDOW, HOP, mode="flux")
+
+    detector = BeatDetector(sample_rate=SAMPLE_RATE, chunk_size=HOP, window_size=WINDOW, hop_size=HOP,
+                            detector_mode="flux")
+    detector._configure_analysis()
+    detector.running = True
+
+    # Run the live detector on the offline frame clock, so the refractory period matches
+    clock = types.SimpleNamespace(now=0.0)
+    monkeypatch.setattr(beat_detector, "time", types.SimpleNamespace(time=lambda: clock.now))
+    live = []
+    for frame, start in enumerate(range(0, len(samples) - WINDOW + 1, HOP)):
+        clock.now = (start + WINDOW) / SAMPLE_RATE
+        detector._process_chunk(samples[start:start + WINDOW])
+        if detector.beat_detected:
+            live.append(frame)
+
+    assert len(live) >= 6
+    assert np.flatnonzero(offline["beat"]).tolist() == live
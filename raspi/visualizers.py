@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+
+# 🎛️ VISUALIZERS - MUSIK-EFFEKTE ALS GANZE ARRAYS STATT PIXEL-SCHLEIFEN! 🎛️
+
+import time
+import numpy as np
+from colors import hue_lut, hue_lookup
+
+SPECTRUM_COLORS = np.array([
+    (255, 50, 50),   # Bass - Bright Red
+    (255, 150, 0),   # Low-mid - Orange
+    (50, 255, 50),   # High-mid - Bright Green
+    (100, 100, 255)  # Treble - Bright Blue
+], dtype=np.float64)
+
+BASS_PULSE_COLOR = np.array([255, 50, 150], dtype=np.float64)
+RAINBOW_BRIGHTNESS_LEVELS = 32  # Cached reactive_rainbow frames: brightness steps per 1.0
+
+
+# (attack, decay) per mode for the smoothing stage - the old set_pixel() smooth factors
+SMOOTHING = {
+    "spectrum": (0.6, 0.2),          # Bars jump up, fall slowly
+    "energy_wave": (0.7, 0.7),
+    "bass_pulse": (0.7, 0.7),
+    "reactive_rainbow": (0.8, 0.8),  # Very smooth transitions
+    "beat_flash": (0.7, 0.7),
+    "strobe": (0.7, 1.0),            # Hard cut to black between beats
+}
+
+
+class MusicVisualizers:
+    """Whole-strip renderers for music_mode.
+
+    Every renderer writes the raw target frame into out (N, 3 uint8) in one pass;
+    fades come from the TemporalSmoother after rendering (see configure_smoothing).
+    """
+
+    def __init__(self, led_count, cache=None):
+        self.led_count = led_count
+        self.cache = cache  # Optional FrameCache for the periodic renderers
+        positions = np.arange(led_count)
+        self._target = np.zeros((led_count, 3))
+
+        # Spectrum: four equal sections, brightness falling off towards the top
+        self.band_size = led_count // 4
+        band_size = max(1, self.band_size)
+        self._band_of_pixel = np.minimum(positions // band_size, 4)
+        self._band_of_pixel[4 * self.band_size:] = 4  # Leftover pixels belong to no band
+        self._pos_in_band = positions - self._band_of_pixel * self.band_size
+        intensity = 1.0 - (self._pos_in_band / band_size) * 0.7
+        colors = np.vstack((SPECTRUM_COLORS, np.zeros((1, 3))))
+        self._spectrum_colors = np.trunc(colors[self._band_of_pixel] * intensity[:, None]).astype(np.uint8)
+        self._lit_count = np.zeros(5, dtype=np.int64)
+
+        # Energy wave: history of total energy, oldest sample on the last pixel
+        self.energy_history = np.zeros(led_count)
+        self.energy_count = 0
+        self._wave_offsets = positions * 3.0
+
+        # Bass pulse: distance of every pixel from the center
+        self.center = led_count // 2
+        self._distance = np.abs(positions - self.center)
+
+        # Rainbow hue offsets per pixel
+        self._rainbow_offsets = positions * 2.0
+
+        # Both hue effects run at 90% saturation: one lookup, then scale by brightness
+        self.hue_table = hue_lut(0.9)
+        self._hue_colors = np.zeros((led_count, 3), dtype=np.uint8)
+
+    def configure_smoothing(self, smoother, mode):
+        """Set the TemporalSmoother attack / decay for a visualizer mode"""
+        attack, decay = SMOOTHING.get(mode, (1.0, 1.0))
+        smoother.set_factors(attack, decay)
+        if mode == "spectrum":
+            # Pixels past the last band only ever fade
+            smoother.set_factors(0.3, 0.3, start=4 * self.band_size)
+
+    def spectrum_analyzer(self, out, freq_bands, volume):
+        """Four bars (bass, low-mid, high-mid, treble), brightest at the bottom"""
+        band_count = min(len(freq_bands), 4)
+        energies = np.asarray(freq_bands[:band_count], dtype=np.float64)
+        lit_count = self._lit_count
+        lit_count[:] = 0
+        lit_count[:band_count] = (np.minimum(1.0, energies * 30) * self.band_size).astype(np.int64)
+
+        lit = self._pos_in_band < lit_count[self._band_of_pixel]
+        np.multiply(self._spectrum_colors, lit[:, None], out=out)
+
+    def beat_flash(self, out, color, brightness):
+        """Whole strip in one flash color"""
+        out[:] = np.trunc(np.asarray(color, dtype=np.float64) * brightness)
+
+    def energy_wave(self, out, freq_bands, volume, t=None):
+        """Scrolling energy history, rainbow colored, growing in from the strip end"""
+        t = time.time() if t is None else t
+        history = self.energy_history
+        total_energy = sum(freq_bands)
+        if self.energy_count < self.led_count:
+            history[self.energy_count] = total_energy
+            self.energy_count += 1
+        else:
+            history[:-1] = history[1:]
+            history[-1] = total_energy
+
+        count = self.energy_count
+        target = self._target
+        target[count:] = 0
+
+        intensity = np.minimum(1.0, history[:count] * 80)
+        hue = self._wave_offsets[:count] + t * 30
+        colors = hue_lookup(hue, self.hue_table, out=self._hue_colors[:count])
+        np.multiply(colors, intensity[:, None], out=target[:count])
+
+        # History index i lands on pixel N-1-i
+        np.copyto(out[::-1], target, casting="unsafe")
+
+    def bass_pulse(self, out, freq_bands, volume):
+        """Glow from the center, radius follows the bass band"""
+        bass_level = (freq_bands[0] if len(freq_bands) else 0) * 50
+        max_radius = min(self.center, int(bass_level * self.center))
+
+        if max_radius > 0:
+            intensity = 1.0 - self._distance / max_radius
+            intensity[self._distance > max_radius] = 0
+            np.multiply(intensity[:, None], BASS_PULSE_COLOR, out=self._target)
+            np.copyto(out, self._target, casting="unsafe")
+        else:
+            out.fill(0)
+
+    def reactive_rainbow(self, out, freq_bands, volume, t=None):
+        """Rainbow scrolling faster with volume, brighter with energy"""
+        t = time.time() if t is None else t
+        speed = 50 + (volume * 100)
+        total_energy = sum(freq_bands) if len(freq_bands) else 0
+        brightness = min(1.0, 0.4 + (total_energy * 15))
+
+        # hue_lookup truncates to whole degrees, so the frame only depends on (phase, brightness)
+        phase = int(t * speed) % 360
+        if self.cache is None:
+            self._render_rainbow(out, phase, brightness)
+        else:
+            level = round(brightness * RAINBOW_BRIGHTNESS_LEVELS)
+            self.cache.render(("reactive_rainbow", phase, level), self._render_rainbow, out,
+                              phase, level / RAINBOW_BRIGHTNESS_LEVELS)
+
+    def _render_rainbow(self, out, phase, brightness):
+        colors = hue_lookup(self._rainbow_offsets + phase, self.hue_table, out=self._hue_colors)
+        np.multiply(colors, brightness, out=self._target)
+        np.copyto(out, self._target, casting="unsafe")
+
+    def strobe(self, out, intensity):
+        """Whole strip white at the given 0..255 level"""
+        out.fill(max(0, min(255, intensity)))
+
+
+def benchmark(led_count, frames=500):
+    """Milliseconds per rendered frame for every visualizer"""
+    visuals = MusicVisualizers(led_count)
+    rng = np.random.default_rng(7)
+    bands = rng.uniform(0, 0.04, size=(frames, 4)).tolist()
+    out = np.zeros((led_count, 3), dtype=np.uint8)
+
+    renderers = {
+        "spectrum": lambda f, t: visuals.spectrum_analyzer(out, f, 0.3),
+        "energy_wave": lambda f, t: visuals.energy_wave(out, f, 0.3, t),
+        "bass_pulse": lambda f, t: visuals.bass_pulse(out, f, 0.3),
+        "reactive_rainbow": lambda f, t: visuals.reactive_rainbow(out, f, 0.3, t),
+        "beat_flash": lambda f, t: visuals.beat_flash(out, (255, 0, 255), 0.8),
+        "strobe": lambda f, t: visuals.strobe(out, 200),
+    }
+
+    results = {}
+    for name, render in renderers.items():
+        start = time.perf_counter()
+        for i in range(frames):
+            render(bands[i], i / 30)
+        results[name] = (time.perf_counter() - start) / frames * 1e3
+    return results
+
+
+if __name__ == "__main__":
+    print("🎛️ Visualizer Benchmark (ms pro Frame, ohne Smoothing)")
+    for count in (300, 1000, 5000):
+        print(f"   {count} LEDs:")
+        for name, ms in benchmark(count).items():
+            print(f"      {name:<17} {ms:.3f} ms")
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+# ⚡ WS2812 FRAME ENCODER - GANZER FRAME IN EINEM NUMPY-PASS! ⚡
+
+import time
+import numpy as np
+
+# Kanal-Reihenfolge auf dem Draht (WS2812B = GRB)
+COLOR_ORDERS = {
+    "RGB": (0, 1, 2),
+    "RBG": (0, 2, 1),
+    "GRB": (1, 0, 2),
+    "GBR": (1, 2, 0),
+    "BRG": (2, 0, 1),
+    "BGR": (2, 1, 0),
+}
+
+# Ein WS2812-Bit als 3 SPI-Bits bei 2.4 MHz (~417 ns pro SPI-Bit):
+# '0' = 100 (417 ns high, 833 ns low), '1' = 110 (833 ns high, 417 ns low)
+SPI_BITS_PER_SYMBOL = 3
+SPI_HZ = 2_400_000
+SYMBOL_ZERO = 0b100
+SYMBOL_ONE = 0b110
+
+
+def _build_bit_lut():
+    """256 x 8 table: color byte -> WS2812 bits, MSB first"""
+    values = np.arange(256, dtype=np.uint8)[:, None]
+    return np.unpackbits(values, axis=1)
+
+
+def _build_symbol_lut():
+    """256 x 3 table: color byte -> 24 SPI bits (3 per WS2812 bit) packed into 3 bytes"""
+    bits = _build_bit_lut().astype(np.uint32)
+    symbols = np.where(bits, SYMBOL_ONE, SYMBOL_ZERO).astype(np.uint32)
+
+    # 8 Symbole a 3 Bit zu einem 24-Bit-Wort zusammenschieben
+    shifts = np.arange(7, -1, -1, dtype=np.uint32) * SPI_BITS_PER_SYMBOL
+    words = np.bitwise_or.reduce(symbols << shifts, axis=1)
+
+    lut = np.empty((256, 3), dtype=np.uint8)
+    lut[:, 0] = (words >> 16) & 0xFF
+    lut[:, 1] = (words >> 8) & 0xFF
+    lut[:, 2] = words & 0xFF
+    return lut
+
+
+BIT_LUT = _build_bit_lut()
+SYMBOL_LUT = _build_symbol_lut()
+
+
+def build_correction_lut(brightness=1.0, gamma=1.0, white_balance=(255, 255, 255)):
+    """(3, 256) uint8 table per RGB channel: value -> gamma, then brightness * white balance.
+
+    gamma 1.0 + white balance 255 gives int(value * brightness), the old per-pixel scaling.
+    FastLED's TypicalLEDStrip correction is white_balance=(255, 176, 240).
+    """
+    values = np.arange(256, dtype=np.float64)
+    if gamma != 1.0:
+        values = 255 * (values / 255) ** gamma
+    scale = brightness * np.asarray(white_balance, dtype=np.float64)[:, None] / 255
+    return np.clip(np.trunc(values * scale), 0, 255).astype(np.uint8)
+
+
+class WS2812Encoder:
+    """Turns an (N, 3) RGB framebuffer into a ready-to-send WS2812 buffer"""
+
+    def __init__(self, led_count, color_order="GRB"):
+        if color_order not in COLOR_ORDERS:
+            raise ValueError(f"Unknown color order: {color_order}")
+
+        self.led_count = led_count
+        self.color_order = color_order
+        self._order = np.array(COLOR_ORDERS[color_order], dtype=np.intp)
+
+        # Preallocated output buffers, reused for every frame
+        self._wire = np.empty((led_count, 3), dtype=np.uint8)
+        self._symbols = np.empty(led_count * 3 * SPI_BITS_PER_SYMBOL, dtype=np.uint8)
+        self._bits = np.empty(led_count * 3 * 8, dtype=np.uint8)
+
+        # Color correction fused into the encode tables: index = channel * 256 + value
+        self.correction = None
+        self._symbol_lut = SYMBOL_LUT
+        self._bit_lut = BIT_LUT
+        self._channel_offsets = np.tile(np.arange(3, dtype=np.intp) * 256, led_count)
+        self._index = np.empty(led_count * 3, dtype=np.intp)
+
+    def set_correction(self, lut):
+        """Use a (3, 256) RGB correction table (build_correction_lut) or None for none"""
+        if lut is None:
+            self.correction = None
+            self._symbol_lut = SYMBOL_LUT
+            self._bit_lut = BIT_LUT
+            return
+
+        self.correction = np.asarray(lut, dtype=np.uint8).reshape(3, 256)
+        wire_lut = self.correction[self._order]
+        self._symbol_lut = SYMBOL_LUT[wire_lut].reshape(-1, SPI_BITS_PER_SYMBOL)
+        self._bit_lut = BIT_LUT[wire_lut].reshape(-1, 8)
+
+    def correct(self, frame, out=None):
+        """The corrected RGB frame, i.e. what the strip will actually show"""
+        frame = np.asarray(frame, dtype=np.uint8).reshape(-1, 3)
+        if out is None:
+            out = np.empty_like(frame)
+        if self.correction is None:
+            np.copyto(out, frame)
+        else:
+            for channel in range(3):
+                np.take(self.correction[channel], frame[:, channel], out=out[:, channel])
+        return out
+
+    def _lut_index(self, wire):
+        """Wire bytes -> rows of the fused tables (plain bytes without correction)"""
+        if self.correction is None:
+            return wire
+        return np.add(wire, self._channel_offsets, out=self._index)
+
+    def _wire_order(self, frame):
+        """Reorder RGB into wire order (e.g. GRB) as one flat byte array"""
+        frame = np.asarray(frame, dtype=np.uint8).reshape(-1, 3)
+        if len(frame) != self.led_count:
+            raise ValueError(f"Frame has {len(frame)} LEDs, encoder expects {self.led_count}")
+        np.take(frame, self._order, axis=1, out=self._wire)
+        return self._wire.reshape(-1)
+
+    def encode(self, frame):
+        """Encode a frame into SPI symbol bytes (9 bytes per LED)"""
+        index = self._lut_index(self._wire_order(frame))
+        np.take(self._symbol_lut, index, axis=0, out=self._symbols.reshape(-1, SPI_BITS_PER_SYMBOL))
+        return self._symbols
+
+    def encode_bits(self, frame):
+        """Encode a frame into one 0/1 value per WS2812 bit (24 per LED)"""
+        index = self._lut_index(self._wire_order(frame))
+        np.take(self._bit_lut, index, axis=0, out=self._bits.reshape(-1, 8))
+        return self._bits
+
+
+def benchmark(led_counts=(300, 1000, 10000), repeats=200):
+    """Measure encode time per frame for different strip lengths"""
+    rng = np.random.default_rng(42)
+    results = {}
+
+    for led_count in led_counts:
+        encoder = WS2812Encoder(led_count)
+        frame = rng.integers(0, 256, size=(led_count, 3), dtype=np.uint8)
+
+        # Aufwärmen
+        encoder.encode(frame)
+        encoder.encode_bits(frame)
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            encoder.encode(frame)
+        spi_us = (time.perf_counter() - start) / repeats * 1e6
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            encoder.encode_bits(frame)
+        bits_us = (time.perf_counter() - start) / repeats * 1e6
+
+        # Brightness + gamma fused into the tables
+        encoder.set_correction(build_correction_lut(0.9, 2.2))
+        start = time.perf_counter()
+        for _ in range(repeats):
+            encoder.encode(frame)
+        corrected_us = (time.perf_counter() - start) / repeats * 1e6
+
+        results[led_count] = (spi_us, bits_us, corrected_us)
+
+    return results
+
+
+if __name__ == "__main__":
+    print("⚡ WS2812 Encoder Benchmark")
+    print(f"{'LEDs':>7} | {'SPI encode':>12} | {'Bit encode':>12} | {'SPI + gamma':>12}")
+    for led_count, (spi_us, bits_us, corrected_us) in benchmark().items():
+        print(f"{led_count:>7} | {spi_us:>9.1f} µs | {bits_us:>9.1f} µs | {corrected_us:>9.1f} µs")